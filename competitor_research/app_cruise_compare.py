@@ -71,7 +71,9 @@ def index():
 def run():
     try:
         from scraper_cruise_compare import main
-        main()
+        # טעינה במקביל – סריקה מלאה ברצף ארוכה מדי לבקשת HTTP אחת.
+        # resume – אם בקשה קודמת נהרגה באמצע, ממשיכים מהיומן שלה (אחרי סיום מוצלח אין יומן)
+        main(async_crawl=True, resume=True)
         return redirect(url_for("results"))
     except Exception as e:
         return f"""
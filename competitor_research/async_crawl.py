@@ -0,0 +1,204 @@
+# competitor_research/async_crawl.py
+# מנוע סריקה אסינכרוני (Playwright async API): כמה דפים במקביל, עם מגבלה לכל host ומגבלה כללית.
+# הלולאה האסינכרונית רצה ב-thread נפרד, כך שהקוד הסינכרוני (main) שולח אליה אצוות של כתובות
+# ומקבל תוצאות (html, err) לפי סדר הכתובות – הסדר נשמר ולכן גם הפלט זהה לסריקה הרגילה.
+
+import asyncio
+import threading
+import time
+
+try:
+    from playwright.async_api import async_playwright
+    from playwright_stealth import stealth_async
+except ImportError:
+    async_playwright = None
+    stealth_async = None
+
+from browser_pool import DEFAULT_USER_AGENT, DEFAULT_VIEWPORT
+from page_readiness import wait_until_ready_async
+from politeness import host_of
+
+# ברירות מחדל: כמה דפים פתוחים בו-זמנית לכל אתר, ובסך הכל
+DEFAULT_PER_HOST_CONCURRENCY = 4
+DEFAULT_GLOBAL_CONCURRENCY = 8
+
+
+def async_playwright_available():
+    """האם Playwright async ו-stealth_async מותקנים."""
+    return bool(async_playwright and stealth_async)
+
+
+class AsyncCrawler:
+    """Chromium אסינכרוני אחד לכל הריצה. fetch_all(urls) טוען במקביל – עד per_host דפים לכל host
+    ועד global_cap בסך הכל – ומחזיר [(html, err)] באותו סדר כמו urls.
+    blocker (ResourceBlocker) – חסימת תמונות/פונטים/מעקב ברמת ה-context.
+    limiter (HostRateLimiter) – קצב בקשות לכל host (token bucket).
+    retry (RetryPolicy) – ניסיון חוזר לשגיאות זמניות (ההמתנה ביניהם משחררת את מקום הדף) ומפסק לכל host."""
+
+    def __init__(self, per_host=DEFAULT_PER_HOST_CONCURRENCY, global_cap=DEFAULT_GLOBAL_CONCURRENCY,
+                 headless=True, user_agent=DEFAULT_USER_AGENT, viewport=None, locale="he-IL", blocker=None,
+                 limiter=None, retry=None):
+        self.per_host = max(1, int(per_host))
+        self.global_cap = max(1, int(global_cap))
+        self.headless = headless
+        self.user_agent = user_agent
+        self.viewport = dict(viewport or DEFAULT_VIEWPORT)
+        self.locale = locale
+        self.blocker = blocker
+        self.limiter = limiter
+        self.retry = retry
+        self._loop = None
+        self._thread = None
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._global_sem = None
+        self._host_sems = {}
+        self._in_flight = 0
+        self._stats = {
+            "pages_fetched": 0,
+            "errors": 0,
+            "peak_in_flight": 0,
+            "fetch_seconds": 0.0,
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def start(self):
+        """מפעיל thread עם event loop, ובתוכו Playwright ו-Chromium."""
+        if not async_playwright_available():
+            raise RuntimeError("playwright or playwright_stealth not installed")
+        if self._loop is not None:
+            return
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="async-crawl", daemon=True)
+        self._thread.start()
+        try:
+            self._submit(self._astart())
+        except Exception:
+            self.close()
+            raise
+
+    def _submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    async def _astart(self):
+        self._global_sem = asyncio.Semaphore(self.global_cap)
+        self._pw = await async_playwright().start()
+        self._browser = await self._pw.chromium.launch(headless=self.headless)
+        self._context = await self._browser.new_context(
+            viewport=self.viewport,
+            user_agent=self.user_agent,
+            locale=self.locale,
+        )
+        if self.blocker is not None:
+            await self.blocker.install_async(self._context)
+
+    def _host_sem(self, url):
+        host = host_of(url)
+        sem = self._host_sems.get(host)
+        if sem is None:
+            sem = asyncio.Semaphore(self.per_host)
+            self._host_sems[host] = sem
+        return sem
+
+    async def _fetch_one(self, url, timeout, ready):
+        async with self._host_sem(url):
+            async with self._global_sem:
+                if self.limiter is not None:
+                    await self.limiter.acquire_async(url)
+                self._in_flight += 1
+                self._stats["peak_in_flight"] = max(self._stats["peak_in_flight"], self._in_flight)
+                started = time.monotonic()
+                page = None
+                try:
+                    page = await self._context.new_page()
+                    await stealth_async(page)
+                    await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+                    if ready:
+                        await wait_until_ready_async(page, ready)
+                    html = await page.content()
+                    self._stats["pages_fetched"] += 1
+                    return html, None
+                except Exception as e:
+                    self._stats["errors"] += 1
+                    return None, str(e)
+                finally:
+                    self._in_flight -= 1
+                    self._stats["fetch_seconds"] += time.monotonic() - started
+                    if page is not None:
+                        try:
+                            await page.close()
+                        except Exception:
+                            pass
+
+    async def _fetch_with_retry(self, url, timeout, ready):
+        if self.retry is None:
+            return await self._fetch_one(url, timeout, ready)
+        return await self.retry.call_async(url, lambda: self._fetch_one(url, timeout, ready))
+
+    async def _fetch_all(self, urls, timeout, ready):
+        return await asyncio.gather(*(self._fetch_with_retry(u, timeout, ready) for u in urls))
+
+    def fetch_all(self, urls, timeout=15000, ready="generic"):
+        """טעינת כל הכתובות במקביל. מחזיר רשימת (html, err) לפי סדר urls.
+        ready – סוג הדף לתנאי המוכנות (listing / inner / generic; None = בלי המתנה)."""
+        urls = list(urls)
+        if not urls:
+            return []
+        if self._loop is None:
+            try:
+                self.start()
+            except Exception as e:
+                # הפעלה עצלה (מאגר עמודים פנימיים) – דפדפן שלא עולה הוא שגיאה לכל כתובת, לא קריסה של הסריקה
+                self._stats["errors"] += len(urls)
+                return [(None, str(e))] * len(urls)
+        return list(self._submit(self._fetch_all(urls, timeout, ready)))
+
+    def fetch(self, url, timeout=30000, ready="generic"):
+        """טעינת כתובת אחת. מחזיר (html, err)."""
+        return self.fetch_all([url], timeout=timeout, ready=ready)[0]
+
+    def stats(self):
+        """מונים: דפים שנטענו, שגיאות, מקסימום דפים במקביל, מגבלות."""
+        out = dict(self._stats)
+        out["fetch_seconds"] = round(out["fetch_seconds"], 2)
+        out["per_host"] = self.per_host
+        out["global_cap"] = self.global_cap
+        return out
+
+    async def _aclose(self):
+        for obj in (self._context, self._browser):
+            try:
+                if obj is not None:
+                    await obj.close()
+            except Exception:
+                pass
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+        self._context = None
+        self._browser = None
+        self._pw = None
+
+    def close(self):
+        """סוגר את הדפדפן, את Playwright ואת ה-thread של הלולאה."""
+        if self._loop is None:
+            return
+        try:
+            self._submit(self._aclose())
+        except Exception:
+            pass
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=10)
+        self._loop.close()
+        self._loop = None
+        self._thread = None
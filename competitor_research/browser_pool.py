@@ -0,0 +1,178 @@
+# competitor_research/browser_pool.py
+# מאגר דפדפן משותף לסריקה: Chromium אחד שמופעל פעם אחת לריצה, ודפים (עם stealth) שמוחזרים למאגר ומשמשים שוב.
+#
+# שימוש:
+#   with BrowserPool() as pool:
+#       with pool.page() as page:
+#           page.goto(url)
+#   print(pool.stats())
+
+from contextlib import contextmanager
+
+try:
+    from playwright.sync_api import sync_playwright
+    from playwright_stealth import stealth_sync
+except ImportError:
+    sync_playwright = None
+    stealth_sync = None
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+DEFAULT_VIEWPORT = {"width": 1920, "height": 1080}
+# אחרי כמה ניווטים דף נסגר ומוחלף בחדש (זיכרון/מצב JS שמצטבר בדף)
+MAX_NAVIGATIONS_PER_PAGE = 25
+# כמה דפים פנויים שומרים במאגר לשימוש חוזר
+MAX_IDLE_PAGES = 4
+
+
+def playwright_available():
+    """האם Playwright ו-playwright_stealth מותקנים."""
+    return bool(sync_playwright and stealth_sync)
+
+
+class BrowserPool:
+    """Chromium יחיד + context יחיד לכל הריצה. acquire/release מחלקים דפים עם stealth;
+    דף שעבר max_navigations ניווטים נסגר במקום לחזור למאגר. hits/misses נספרים ב-stats().
+    blocker (ResourceBlocker) – חסימת תמונות/פונטים/מעקב ברמת ה-context."""
+
+    def __init__(self, max_navigations=MAX_NAVIGATIONS_PER_PAGE, max_idle=MAX_IDLE_PAGES,
+                 headless=True, user_agent=DEFAULT_USER_AGENT, viewport=None, locale="he-IL", blocker=None):
+        self.max_navigations = max(1, int(max_navigations))
+        self.max_idle = max(0, int(max_idle))
+        self.headless = headless
+        self.user_agent = user_agent
+        self.viewport = dict(viewport or DEFAULT_VIEWPORT)
+        self.locale = locale
+        self.blocker = blocker
+        self._pw = None
+        self._browser = None
+        self._context = None
+        self._idle = []
+        self._navigations = {}
+        self._stats = {
+            "browser_launches": 0,
+            "pages_created": 0,
+            "pages_recycled": 0,
+            "hits": 0,
+            "misses": 0,
+        }
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def start(self):
+        """מפעיל Playwright ו-Chromium (פעם אחת). מעלה RuntimeError אם Playwright לא מותקן."""
+        if not playwright_available():
+            raise RuntimeError("playwright or playwright_stealth not installed")
+        if self._pw is None:
+            self._pw = sync_playwright().start()
+        self._launch()
+
+    def _launch(self):
+        self._browser = self._pw.chromium.launch(headless=self.headless)
+        self._context = self._browser.new_context(
+            viewport=self.viewport,
+            user_agent=self.user_agent,
+            locale=self.locale,
+        )
+        if self.blocker is not None:
+            self.blocker.install(self._context)
+        self._idle = []
+        self._navigations = {}
+        self._stats["browser_launches"] += 1
+
+    def _ensure_browser(self):
+        """אם הדפדפן קרס – מפעיל מחדש (הדפים הישנים לא שמישים)."""
+        if self._pw is None:
+            self.start()
+            return
+        if self._browser is None or not self._browser.is_connected():
+            try:
+                if self._browser is not None:
+                    self._browser.close()
+            except Exception:
+                pass
+            self._launch()
+
+    def _new_page(self):
+        page = self._context.new_page()
+        stealth_sync(page)
+        self._navigations[id(page)] = 0
+        self._stats["pages_created"] += 1
+        return page
+
+    def acquire(self):
+        """מחזיר דף פנוי מהמאגר (hit) או דף חדש (miss)."""
+        self._ensure_browser()
+        while self._idle:
+            page = self._idle.pop()
+            if not page.is_closed():
+                self._stats["hits"] += 1
+                return page
+            self._navigations.pop(id(page), None)
+        self._stats["misses"] += 1
+        return self._new_page()
+
+    def release(self, page, discard=False):
+        """מחזיר דף למאגר. דף סגור, דף שסומן discard או דף שעבר max_navigations – נסגר."""
+        if page is None:
+            return
+        key = id(page)
+        count = self._navigations.get(key, 0) + 1
+        self._navigations[key] = count
+        if discard or page.is_closed() or count >= self.max_navigations or len(self._idle) >= self.max_idle:
+            self._navigations.pop(key, None)
+            self._stats["pages_recycled"] += 1
+            try:
+                page.close()
+            except Exception:
+                pass
+            return
+        self._idle.append(page)
+
+    @contextmanager
+    def page(self):
+        """with pool.page() as page: ... – ניווט אחד לכל שימוש; בחריגה הדף נסגר."""
+        page = self.acquire()
+        try:
+            yield page
+        except Exception:
+            self.release(page, discard=True)
+            raise
+        else:
+            self.release(page)
+
+    def stats(self):
+        """מונים: הפעלות דפדפן, דפים שנוצרו/מוחזרו, hits/misses."""
+        out = dict(self._stats)
+        total = out["hits"] + out["misses"]
+        out["hit_rate"] = round(out["hits"] / total, 3) if total else 0.0
+        return out
+
+    def close(self):
+        """סוגר דפים, context, דפדפן ו-Playwright."""
+        for page in self._idle:
+            try:
+                page.close()
+            except Exception:
+                pass
+        self._idle = []
+        self._navigations = {}
+        for obj in (self._context, self._browser):
+            try:
+                if obj is not None:
+                    obj.close()
+            except Exception:
+                pass
+        self._context = None
+        self._browser = None
+        if self._pw is not None:
+            try:
+                self._pw.stop()
+            except Exception:
+                pass
+            self._pw = None
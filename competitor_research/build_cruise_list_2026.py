@@ -42,11 +42,11 @@ def main():
         elif isinstance(dn, tuple) and len(dn) >= 1 and dn[0] == year:
             cruises_2026.append(c)
 
-    # מיון: חודש, ואז כותרת
+    # מיון: חודש, תאריך יציאה (date_start, YYYY-MM-DD – כשהיום ידוע), ואז כותרת
     def sort_key(c):
         dn = c.get("date_norm") or [0, 0]
-        month = dn[1] if len(dn) > 1 else 0
-        return (month, (c.get("title") or "")[:80])
+        month = (dn[1] if len(dn) > 1 else 0) or 0
+        return (month, c.get("date_start") or "", (c.get("title") or "")[:80])
 
     cruises_2026.sort(key=sort_key)
 
@@ -0,0 +1,106 @@
+# competitor_research/checkpoint.py
+# יומן נקודות ביקורת לסריקה ארוכה: כל דף יעד / עמוד פנימי שהסתיים נרשם מיד כשורת JSON (append + fsync).
+# אם הסריקה נפלה באמצע (קריסת Chromium, Ctrl+C, בקשת Flask שנהרגה) – הרצה עם --resume טוענת את היומן,
+# מדלגת על כל מה שכבר הושלם ובונה את המצב מחדש מהתוצאות השמורות. בסיום מוצלח היומן נמחק.
+
+import json
+import os
+from datetime import datetime, timedelta
+
+from inner_page_state import restore_row
+
+# כמה כתובות נטענות בכל אצווה לפני רישום ביומן (קריסה מאבדת לכל היותר אצווה אחת)
+DEFAULT_CHUNK_SIZE = 16
+JOURNAL_VERSION = 1
+# יומן ישן מזה לא משמש להמשך (התוצאות בו כבר לא משקפות את האתר)
+JOURNAL_MAX_AGE_HOURS = 24
+
+
+def _restore(result):
+    """מחזיר tuples (date_norm) בתוצאה שנקראה מ-JSON – רשימת קרוזים או קרוז בודד."""
+    if isinstance(result, list):
+        return [restore_row(r) if isinstance(r, dict) else r for r in result]
+    if isinstance(result, dict):
+        return restore_row(result)
+    return result
+
+
+class ScanJournal:
+    """קובץ JSONL: שורת כותרת ואחריה {"stage", "key", "result"} לכל דף שהושלם.
+    resume=True – טוען רשומות קיימות; אחרת מתחיל יומן חדש."""
+
+    def __init__(self, path, resume=False, chunk_size=DEFAULT_CHUNK_SIZE):
+        self.path = path
+        self.chunk_size = max(1, int(chunk_size))
+        self._done = {}
+        self._file = None
+        self._stats = {"resumed": 0, "recorded": 0, "loaded": 0}
+        if resume and path.exists():
+            self._load()
+        self._open(append=bool(self._done))
+
+    def _load(self):
+        done = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            header = None
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # שורה אחרונה חלקית (נפילה באמצע כתיבה)
+                    continue
+                if "stage" not in entry:
+                    header = entry
+                    continue
+                done[(entry["stage"], entry["key"])] = entry.get("result")
+        if not header or header.get("version") != JOURNAL_VERSION:
+            return
+        try:
+            started = datetime.fromisoformat(header.get("started_at"))
+        except (TypeError, ValueError):
+            return
+        if datetime.now() - started > timedelta(hours=JOURNAL_MAX_AGE_HOURS):
+            return
+        self._done = done
+        self._stats["loaded"] = len(self._done)
+
+    def _open(self, append):
+        self._file = open(self.path, "a" if append else "w", encoding="utf-8")
+        if not append:
+            self._write({"version": JOURNAL_VERSION, "started_at": datetime.now().isoformat(timespec="seconds")})
+
+    def _write(self, entry):
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def get(self, stage, key):
+        """התוצאה השמורה לדף שהושלם בריצה קודמת, או None."""
+        if (stage, key) not in self._done:
+            return None
+        self._stats["resumed"] += 1
+        return _restore(self._done[(stage, key)])
+
+    def record(self, stage, key, result):
+        """רושם דף שהושלם (ללא fsync – ראו flush)."""
+        self._write({"stage": stage, "key": key, "result": result})
+        self._stats["recorded"] += 1
+
+    def flush(self):
+        """כותב לדיסק בפועל – נקרא בסוף כל אצווה."""
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self, completed=False):
+        """סוגר את היומן; completed=True (הסריקה הסתיימה והפלט נשמר) – מוחק אותו."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if completed:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+    def stats(self):
+        return dict(self._stats)
@@ -0,0 +1,125 @@
+# competitor_research/crawl_frontier.py
+# תור עדיפויות לגילוי דפי רשימה נוספים (גיבוי לרשימת היעדים): במקום לחתוך set לא מסודר ל-50 כתובות,
+# כל כתובת מקבלת ציון לפי מקור הקישור (תפריט > כותרת > גוף הדף), כמה הפלגות חדשות היא הניבה בריצות
+# קודמות, ומתי נבדקה לאחרונה – ותקציב הדפים הולך לכתובות עם הסיכוי הגבוה ביותר להפלגות חדשות.
+# עומק מוגבל (קישורים מתוך דפים שנמצאו כך), וכתובות מנורמלות נבדקות פעם אחת.
+
+import heapq
+import json
+import time
+
+# ציון בסיס לפי מקור הקישור
+SOURCE_SCORES = {"menu": 3.0, "heading": 2.0, "body": 1.0}
+# משקלים: תפוקה היסטורית (הפלגות חדשות), זמן מאז הבדיקה האחרונה, קנס לכל רמת עומק
+YIELD_WEIGHT = 2.0
+STALENESS_WEIGHT = 1.0
+DEPTH_PENALTY = 0.5
+# כמה הפלגות חדשות נחשבות "תפוקה מלאה", ואחרי כמה ימים דף נחשב ישן לגמרי
+FULL_YIELD_CRUISES = 5
+STALE_AFTER_DAYS = 7
+# החלקה של התפוקה בין ריצות (EWMA)
+YIELD_SMOOTHING = 0.5
+DEFAULT_MAX_DEPTH = 2
+
+
+class CrawlFrontier:
+    """add(url, source, depth) / pop_batch(n) / record(url, new_cruises).
+    key(url) – נרמול כתובת; history_path – קובץ JSON עם תפוקה ותאריך בדיקה לכל כתובת (נשמר בין ריצות)."""
+
+    def __init__(self, history_path=None, max_pages=50, max_depth=DEFAULT_MAX_DEPTH, key=None):
+        self.history_path = history_path
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.key = key or (lambda u: u)
+        self._heap = []
+        self._seen = set()
+        self._seq = 0
+        self._popped = 0
+        self._history = {}
+        self._dirty = False
+        self._stats = {"queued": 0, "fetched": 0, "productive": 0, "too_deep": 0, "by_source": {}}
+        if history_path and history_path.exists():
+            try:
+                with open(history_path, "r", encoding="utf-8") as f:
+                    self._history = json.load(f) or {}
+            except Exception:
+                self._history = {}
+
+    def exclude(self, urls):
+        """כתובות שכבר מכוסות (דפי יעד, עמודי קרוז, נקודות כניסה) – לא ייכנסו לתור."""
+        for url in urls:
+            if url:
+                self._seen.add(self.key(url))
+
+    def score(self, url, source, depth):
+        k = self.key(url)
+        entry = self._history.get(k) or {}
+        score = SOURCE_SCORES.get(source, SOURCE_SCORES["body"])
+        score += YIELD_WEIGHT * min(1.0, entry.get("yield", 0.0) / FULL_YIELD_CRUISES)
+        checked_at = entry.get("checked_at")
+        if checked_at is None:
+            staleness = 1.0
+        else:
+            staleness = min(1.0, (time.time() - checked_at) / (STALE_AFTER_DAYS * 86400))
+        score += STALENESS_WEIGHT * staleness
+        score -= DEPTH_PENALTY * max(0, depth - 1)
+        return score
+
+    def add(self, url, source="body", depth=1):
+        """מוסיף כתובת לתור (אם לא נראתה ולא עמוקה מדי). מחזיר True אם נוספה."""
+        k = self.key(url)
+        if not k or k in self._seen:
+            return False
+        if depth > self.max_depth:
+            self._stats["too_deep"] += 1
+            return False
+        self._seen.add(k)
+        self._seq += 1
+        heapq.heappush(self._heap, (-self.score(url, source, depth), self._seq, k, source, depth))
+        self._stats["queued"] += 1
+        return True
+
+    def add_links(self, links, depth):
+        """links – [(url, source)] לפי סדר הופעה בדף."""
+        for url, source in links:
+            self.add(url, source, depth)
+
+    def remaining_budget(self):
+        return max(0, self.max_pages - self._popped) if self.max_pages is not None else len(self._heap)
+
+    def pop_batch(self, n):
+        """עד n כתובות עם הציון הגבוה ביותר (בתוך תקציב הדפים): [(url, source, depth)]."""
+        out = []
+        while self._heap and len(out) < min(n, self.remaining_budget()):
+            _, _, k, source, depth = heapq.heappop(self._heap)
+            out.append((k, source, depth))
+        self._popped += len(out)
+        return out
+
+    def record(self, url, source, new_cruises):
+        """תוצאת בדיקה של דף: כמה הפלגות חדשות נמצאו בו (לציון בריצות הבאות)."""
+        k = self.key(url)
+        entry = self._history.get(k) or {}
+        prev = entry.get("yield")
+        value = float(new_cruises)
+        smoothed = value if prev is None else YIELD_SMOOTHING * value + (1 - YIELD_SMOOTHING) * prev
+        self._history[k] = {"yield": round(smoothed, 3), "checked_at": time.time()}
+        self._dirty = True
+        self._stats["fetched"] += 1
+        if new_cruises:
+            self._stats["productive"] += 1
+            by_source = self._stats["by_source"]
+            by_source[source] = by_source.get(source, 0) + new_cruises
+
+    def save(self):
+        if not self.history_path or not self._dirty:
+            return
+        with open(self.history_path, "w", encoding="utf-8") as f:
+            json.dump(self._history, f, ensure_ascii=False, indent=1, sort_keys=True)
+        self._dirty = False
+
+    def stats(self):
+        out = dict(self._stats)
+        out["by_source"] = dict(out["by_source"])
+        out["left_in_queue"] = len(self._heap)
+        return out
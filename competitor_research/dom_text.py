@@ -0,0 +1,119 @@
+# competitor_research/dom_text.py
+# הטקסט של כל אלמנט בעץ – במעבר אחד. get_text על כל td/span/div מחשב שוב ושוב את אותו טקסט (אלמנטים מקוננים),
+# וזה ריבועי בעומק העץ. כאן כל מחרוזת נקראת פעם אחת: המחרוזות (אחרי strip) מחוברות לטקסט אחד של הדף, ולכל
+# אלמנט נשמר רק הטווח שלו (מחרוזת ראשונה–אחרונה). הטקסט של אלמנט זהה ל-get_text(strip=True) שלו, והחיפוש
+# בו (rx.search עם pos/endpos) לא יוצר מחרוזת חדשה.
+
+import re
+from bisect import bisect_left
+
+from bs4.element import CData, NavigableString, Tag
+
+# סוגי המחרוזות שנכנסים ל-get_text של תגית רגילה (לא script/style/template)
+TEXT_TYPES = (NavigableString, CData)
+_DEFAULT_TYPES = set(TEXT_TYPES)
+
+
+class IndexedElement:
+    """תגית בעץ עם טווח המחרוזות שלה (first–last, לא כולל last)."""
+
+    __slots__ = ("tag", "first", "last")
+
+    def __init__(self, tag, first):
+        self.tag = tag
+        self.first = first
+        self.last = first
+
+    @property
+    def name(self):
+        return self.tag.name
+
+
+def _default_text_types(tag):
+    """האם get_text של התגית לוקח את המחרוזות הרגילות (ולא רק Script / TemplateString וכו')."""
+    types = tag.interesting_string_types
+    if isinstance(types, type):
+        return False
+    return set(types) == _DEFAULT_TYPES
+
+
+class DomTextIndex:
+    """מעבר אחד על soup. elements – כל התגיות לפי סדר הפתיחה; string_nodes – כל צמתי המחרוזת (כל סוג) לפי הסדר.
+    text(el) – כמו el.tag.get_text(strip=True); spaced_text(el) – כמו get_text(separator=" ", strip=True);
+    search(rx, el) / search_nocomma(rx, el) – rx.search בטקסט של האלמנט (בלי פסיקים);
+    has_symbol(el) – האם יש בטקסט אחד מתווי symbols."""
+
+    def __init__(self, soup, symbols=""):
+        strings = []
+        self.elements = []
+        self.string_nodes = []
+        stack = []
+        for node in soup.descendants:
+            parent = node.parent
+            while stack and stack[-1].tag is not parent:
+                stack.pop().last = len(strings)
+            if isinstance(node, Tag):
+                el = IndexedElement(node, len(strings))
+                self.elements.append(el)
+                stack.append(el)
+            elif isinstance(node, NavigableString):
+                self.string_nodes.append(node)
+                if type(node) in TEXT_TYPES:
+                    s = node.strip()
+                    if s:
+                        strings.append(s)
+        while stack:
+            stack.pop().last = len(strings)
+        self._strings = strings
+        self._starts = [0]
+        self._nc_starts = [0]
+        for s in strings:
+            self._starts.append(self._starts[-1] + len(s))
+            self._nc_starts.append(self._nc_starts[-1] + len(s) - s.count(","))
+        self._joined = "".join(strings)
+        self._nocomma = self._joined.replace(",", "")
+        self.symbols = symbols
+        self._symbols = []
+        if symbols:
+            rx = re.compile("[" + re.escape(symbols) + "]")
+            self._symbols = [m.start() for m in rx.finditer(self._joined)]
+        self._native_by_name = {}
+        self._by_tag = {id(el.tag): el for el in self.elements}
+
+    def element(self, tag):
+        """ה-IndexedElement של תגית מהעץ (None אם היא לא בו)."""
+        return self._by_tag.get(id(tag))
+
+    def _native(self, el):
+        name = el.tag.name
+        native = self._native_by_name.get(name)
+        if native is None:
+            native = self._native_by_name[name] = _default_text_types(el.tag)
+        return native
+
+    def text(self, el):
+        if not self._native(el):
+            return el.tag.get_text(strip=True)
+        return self._joined[self._starts[el.first]:self._starts[el.last]]
+
+    def spaced_text(self, el):
+        if not self._native(el):
+            return el.tag.get_text(separator=" ", strip=True)
+        return " ".join(self._strings[el.first:el.last])
+
+    def search(self, rx, el):
+        if not self._native(el):
+            return rx.search(self.text(el))
+        return rx.search(self._joined, self._starts[el.first], self._starts[el.last])
+
+    def search_nocomma(self, rx, el):
+        if not self._native(el):
+            return rx.search(self.text(el).replace(",", ""))
+        return rx.search(self._nocomma, self._nc_starts[el.first], self._nc_starts[el.last])
+
+    def has_symbol(self, el):
+        if not self._native(el):
+            return any(ch in self.text(el) for ch in self.symbols)
+        start, end = self._starts[el.first], self._starts[el.last]
+        i = bisect_left(self._symbols, start)
+        return i < len(self._symbols) and self._symbols[i] < end
@@ -0,0 +1,246 @@
+# competitor_research/fetch_archive.py
+# הקלטה והשמעה של תשובות (ארכיון בסגנון HAR): במצב record כל תשובה שנטענה – בקשת HTTP (דרך ה-session
+# המשותף, כולל REST / sitemap של וורדפרס) או דף שנטען בדפדפן – נשמרת בקובץ. במצב replay אותן כתובות מוגשות
+# מהקובץ בלי רשת ובלי דפדפן, כך שכל main() רץ תוך שניות ובאופן דטרמיניסטי (השוואת ביצועים, בדיקות רגרסיה).
+# אפשר להוסיף השהיה מדומה לכל תשובה (קבועה במילישניות, או "recorded" – הזמן שנמדד בהקלטה).
+
+import gzip
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urlencode
+
+HAR_VERSION = "1.2"
+CREATOR = "competitor_research/fetch_archive"
+# כמה תשובות מושמעות במקביל בדף דפדפן (רק כשיש השהיה מדומה)
+DEFAULT_REPLAY_WORKERS = 4
+# סטטוס לכתובת שלא הוקלטה (כמו 404 – שכבת ה-HTTP לא מסלימה לדפדפן)
+MISSING_STATUS = 404
+
+
+def _request_url(url, params=None):
+    """הכתובת המלאה של בקשה (עם פרמטרים) – מפתח בארכיון."""
+    if not params:
+        return url
+    return url + ("&" if "?" in url else "?") + urlencode(params)
+
+
+def _response_text(r):
+    """תוכן התשובה כטקסט, באותו קידוד ש-http_request בוחר."""
+    enc = r.encoding
+    if not enc or enc.lower() == "iso-8859-1":
+        enc = r.apparent_encoding or "utf-8"
+    try:
+        return r.content.decode(enc, errors="replace")
+    except LookupError:
+        return r.content.decode("utf-8", errors="replace")
+
+
+class _Headers(dict):
+    """כותרות תשובה מושמעת – get לא תלוי רישיות (כמו ב-requests)."""
+
+    def get(self, name, default=None):
+        name = name.lower()
+        for k, v in self.items():
+            if k.lower() == name:
+                return v
+        return default
+
+
+class ReplayResponse:
+    """תשובה מהארכיון עם המאפיינים של requests.Response שהקוד משתמש בהם."""
+
+    def __init__(self, url, status, headers, text):
+        self.url = url
+        self.status_code = status
+        self.headers = _Headers(headers or {})
+        self.text = text or ""
+        self.content = self.text.encode("utf-8")
+        self.encoding = "utf-8"
+        self.apparent_encoding = "utf-8"
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class _RecordingSession:
+    """עוטף requests.Session: כל get נשמר בארכיון."""
+
+    def __init__(self, session, archive):
+        self._session = session
+        self._archive = archive
+
+    def get(self, url, params=None, **kwargs):
+        full_url = _request_url(url, params)
+        started = time.monotonic()
+        try:
+            r = self._session.get(url, params=params, **kwargs)
+        except Exception as e:
+            self._archive.add("http", full_url, None, None, error=str(e), elapsed=time.monotonic() - started)
+            raise
+        self._archive.add("http", full_url, r.status_code, _response_text(r), headers=dict(r.headers),
+                          elapsed=time.monotonic() - started)
+        return r
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class _ReplaySession:
+    """במקום requests.Session במצב replay: get מחזיר את התשובה שהוקלטה (שגיאה שהוקלטה נזרקת שוב)."""
+
+    def __init__(self, archive):
+        self._archive = archive
+        self.headers = {}
+
+    def get(self, url, params=None, **kwargs):
+        entry = self._archive.next_entry("http", _request_url(url, params))
+        if entry is None:
+            return ReplayResponse(url, MISSING_STATUS, {}, "")
+        if entry.get("_error"):
+            raise ConnectionError(entry["_error"])
+        response = entry["response"]
+        headers = {h["name"]: h["value"] for h in response.get("headers") or []}
+        return ReplayResponse(url, response.get("status"), headers, response.get("content", {}).get("text"))
+
+
+class FetchArchive:
+    """ארכיון תשובות. mode="record" – add() לכל תשובה ו-save() בסוף; mode="replay" – טוען את הקובץ ומגיש ממנו.
+    latency – השהיה מדומה בהשמעה: None (בלי), מספר מילישניות קבוע, או "recorded".
+    כתובת שנטענה כמה פעמים (ניסיונות חוזרים) מושמעת לפי הסדר; אחרי האחרונה – האחרונה שוב.
+    קובץ שנגמר ב-.gz נשמר דחוס."""
+
+    def __init__(self, path, mode="record", latency=None, workers=DEFAULT_REPLAY_WORKERS):
+        if mode not in ("record", "replay"):
+            raise ValueError(f"unknown archive mode: {mode}")
+        self.path = path
+        self.mode = mode
+        self.latency = latency
+        self.workers = max(1, int(workers))
+        self.browser = False
+        self._entries = []
+        self._by_key = {}
+        self._positions = {}
+        self._lock = threading.Lock()
+        self._stats = {"recorded": 0, "replayed": 0, "missing": 0, "simulated_latency_seconds": 0.0}
+        if mode == "replay":
+            self._load()
+
+    @property
+    def replaying(self):
+        return self.mode == "replay"
+
+    def _open(self, write=False):
+        if str(self.path).endswith(".gz"):
+            return gzip.open(self.path, "wt" if write else "rt", encoding="utf-8")
+        return open(self.path, "w" if write else "r", encoding="utf-8")
+
+    def _load(self):
+        with self._open() as f:
+            har = json.load(f)
+        log = har.get("log") or {}
+        self.browser = bool(log.get("_browser"))
+        for entry in log.get("entries") or []:
+            key = (entry.get("_tier", "http"), entry["request"]["url"])
+            self._by_key.setdefault(key, []).append(entry)
+        self._entries = log.get("entries") or []
+
+    def add(self, tier, url, status, text, headers=None, error=None, elapsed=0.0):
+        """רושם תשובה (tier = http / browser). error – שגיאת רשת/ניווט במקום תשובה."""
+        if self.mode != "record":
+            return
+        entry = {
+            "startedDateTime": datetime.now().astimezone().isoformat(),
+            "time": round(elapsed * 1000, 1),
+            "request": {"method": "GET", "url": url},
+            "response": {
+                "status": status or 0,
+                "headers": [{"name": k, "value": v} for k, v in (headers or {}).items()],
+                "content": {"mimeType": (headers or {}).get("Content-Type", "text/html"), "text": text or ""},
+            },
+            "_tier": tier,
+        }
+        if error:
+            entry["_error"] = error
+        with self._lock:
+            self._entries.append(entry)
+            self._stats["recorded"] += 1
+
+    def next_entry(self, tier, url):
+        """הרשומה הבאה לכתובת (אחרי השהיה מדומה), או None אם לא הוקלטה."""
+        with self._lock:
+            entries = self._by_key.get((tier, url))
+            if not entries:
+                self._stats["missing"] += 1
+                return None
+            pos = self._positions.get((tier, url), 0)
+            self._positions[(tier, url)] = pos + 1
+            entry = entries[min(pos, len(entries) - 1)]
+            self._stats["replayed"] += 1
+        self._sleep(entry)
+        return entry
+
+    def _sleep(self, entry):
+        if not self.latency:
+            return
+        if self.latency == "recorded":
+            wait = (entry.get("time") or 0) / 1000.0
+        else:
+            wait = float(self.latency) / 1000.0
+        if wait > 0:
+            with self._lock:
+                self._stats["simulated_latency_seconds"] += wait
+            time.sleep(wait)
+
+    def wrap_session(self, session):
+        """ה-session שהקוד משתמש בו: מקליט סביב session, או מחליף אותו בהשמעה (גם אם requests לא מותקן)."""
+        if self.mode == "replay":
+            return _ReplaySession(self)
+        if session is None:
+            return None
+        return _RecordingSession(session, self)
+
+    def replay_page(self, url):
+        """דף דפדפן מהארכיון -> (html, err)."""
+        entry = self.next_entry("browser", url)
+        if entry is None:
+            return None, f"not in archive: {url}"
+        if entry.get("_error"):
+            return None, entry["_error"]
+        return entry["response"]["content"].get("text"), None
+
+    def replay_pages(self, urls):
+        """כמה דפי דפדפן -> [(html, err)] לפי הסדר (במקביל כשיש השהיה מדומה, כמו דפדפן אמיתי)."""
+        urls = list(urls)
+        if not self.latency or len(urls) < 2:
+            return [self.replay_page(u) for u in urls]
+        with ThreadPoolExecutor(max_workers=min(self.workers, len(urls))) as ex:
+            return list(ex.map(self.replay_page, urls))
+
+    def record_page(self, url, html, err, elapsed=0.0):
+        """דף שנטען בדפדפן (תוצאה סופית, אחרי ניסיונות חוזרים)."""
+        self.add("browser", url, None if err else 200, html, error=err, elapsed=elapsed)
+
+    def save(self):
+        if self.mode != "record":
+            return
+        har = {
+            "log": {
+                "version": HAR_VERSION,
+                "creator": {"name": CREATOR, "version": "1"},
+                "_browser": self.browser,
+                "entries": self._entries,
+            }
+        }
+        with self._open(write=True) as f:
+            json.dump(har, f, ensure_ascii=False)
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+        out["simulated_latency_seconds"] = round(out["simulated_latency_seconds"], 2)
+        out["mode"] = self.mode
+        out["entries"] = len(self._entries)
+        return out
@@ -0,0 +1,181 @@
+# competitor_research/hebrew_dates.py
+# מנוע תאריכים: טקסט תאריך של כרטיס/שורת טבלה ("נובמבר 2026", "19 באוגוסט 2026", "14/6/26",
+# "8 ימים - 14/6/26") -> CruiseDate עם datetime.date אמיתי ורמת דיוק (יום / חודש / שנה), וכשיש משך
+# ("X ימים" / "X לילות") ותאריך יציאה מדויק – גם תאריך החזרה.
+# אותם קטעי תאריך חוזרים שוב ושוב (כרטיסים, שורות טבלת מחירים, עמודים שנסרקים מחדש), ולכן parse_date
+# שומר זיכרון LRU של התוצאות; CruiseDate הוא tuple (לא משתנה) כך שמותר להחזיר את אותו אובייקט לכל הקוראים.
+# (year, month) של התוצאה (norm) הוא date_norm שהסריקה שומרת – אותו סדר חיפוש כמו תמיד, ותאריך בנקודות
+# (14.6.2026) נבדק רק כשהסדר הזה לא מצא חודש.
+
+import re
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+
+from keyword_scanner import KeywordScanner
+
+# חודשים עבריים -> מספר
+HEBREW_MONTHS = {
+    "ינואר": 1, "פברואר": 2, "מרץ": 3, "מרס": 3, "אפריל": 4, "מאי": 5, "יוני": 6, "יולי": 7,
+    "אוגוסט": 8, "ספטמבר": 9, "אוקטובר": 10, "נובמבר": 11, "דצמבר": 12,
+}
+# מילות משך של כרטיס קרוז ("X ימים" / "X לילות")
+DURATION_WORDS = ["ימים", "לילות"]
+# אוטומטים (Aho–Corasick) שנבנים פעם אחת: כל המופעים עם המיקום במעבר אחד על הטקסט
+MONTH_SCANNER = KeywordScanner(HEBREW_MONTHS)
+DURATION_SCANNER = KeywordScanner(DURATION_WORDS)
+# כמה טקסטים שונים נשמרים בזיכרון של parse_date
+DATE_CACHE_SIZE = 8192
+# רמות דיוק של CruiseDate
+PRECISIONS = ("day", "month", "year")
+
+_YEAR4_PATTERN = re.compile(r"(\d{4})")
+_YEAR2_PATTERN = re.compile(r"[/\-](\d{2})\s*$|[/\-](\d{2})(?:\s|$)")
+_NUMERIC_DATE_PATTERN = re.compile(r"(\d{1,2})[/\-](\d{1,2})[/\-](\d{2,4})")
+_DOTTED_DATE_PATTERN = re.compile(r"(\d{1,2})\s*[./]\s*(\d{1,2})\s*[./]\s*(\d{2,4})")
+_DAY_MONTH_PATTERN = re.compile(r"(\d{1,2})\s*(?:ב-?|-)?\s*(" + "|".join(HEBREW_MONTHS) + ")")
+_DURATION_PATTERN = re.compile(r"(\d+)\s*(ימים|לילות)")
+
+
+class CruiseDate(namedtuple("CruiseDate", ("start", "precision", "end"))):
+    """start – datetime.date (בדיוק "month" – ה-1 בחודש, "year" – 1 בינואר); precision – day / month / year;
+    end – תאריך החזרה (רק כשיש יום יציאה ומשך), אחרת None.
+    norm – (year, month) או (year, None) כמו date_norm; sort_key – למיון לפי תאריך (קודם הכי מדויק)."""
+
+    __slots__ = ()
+
+    @property
+    def year(self):
+        return self.start.year
+
+    @property
+    def month(self):
+        return self.start.month if self.precision != "year" else None
+
+    @property
+    def day(self):
+        return self.start.day if self.precision == "day" else None
+
+    @property
+    def norm(self):
+        return (self.year, self.month)
+
+    @property
+    def sort_key(self):
+        return (self.start, PRECISIONS.index(self.precision))
+
+    def isoformat(self):
+        """YYYY-MM-DD כשהיום ידוע, אחרת None (לשדה date_start בקבצי התוצאה)."""
+        return self.start.isoformat() if self.precision == "day" else None
+
+
+def _full_year(y):
+    # שנה בת 2 ספרות 26 -> 2026
+    return y if y >= 100 else (2000 + y if y < 50 else 1900 + y)
+
+
+def _first_month(text):
+    """מספר החודש העברי שמופיע בטקסט (כשיש כמה – לפי סדר HEBREW_MONTHS), או None."""
+    found = MONTH_SCANNER.positions(text)
+    for heb, num in HEBREW_MONTHS.items():
+        if heb in found:
+            return num
+    return None
+
+
+def _numeric_date(text, pattern, year=None):
+    """התאמה של d/m/y עם חודש תקין (ועם השנה הנתונה, אם יש), או None."""
+    dm = pattern.search(text)
+    if not dm or not 1 <= int(dm.group(2)) <= 12:
+        return None
+    if year is not None and _full_year(int(dm.group(3))) != year:
+        return None
+    return dm
+
+
+def _year_month(text):
+    """(year, month, numeric) – numeric היא התאמת d/m/y כשהחודש בא ממנה.
+    הסדר כמו ש-date_norm חושב תמיד: שנה בת 4 ספרות, אחרת /26; חודש עברי, אחרת 14/6/26, אחרת "<מילה> <שנה>".
+    תאריך בנקודות (14.6.26) – רק כשהסדר הזה לא מצא חודש."""
+    m = _YEAR4_PATTERN.search(text)
+    if m:
+        year = int(m.group(1))
+    else:
+        m2 = _YEAR2_PATTERN.search(text)
+        if not m2:
+            dm = _numeric_date(text, _DOTTED_DATE_PATTERN)
+            if dm is None:
+                return None, None, None
+            return _full_year(int(dm.group(3))), int(dm.group(2)), dm
+        year = _full_year(int(m2.group(1) or m2.group(2)))
+    month = _first_month(text)
+    if month is not None:
+        return year, month, None
+    # תאריך מספרי 14/6/26
+    dm = _numeric_date(text, _NUMERIC_DATE_PATTERN)
+    if dm is not None:
+        return year, int(dm.group(2)), dm
+    m = re.search(r"(?:ב)?\s*(\w+)\s*" + str(year), text)
+    if m:
+        month = _first_month(m.group(0))
+        if month is not None:
+            return year, month, None
+    dm = _numeric_date(text, _DOTTED_DATE_PATTERN, year)
+    if dm is not None:
+        return year, int(dm.group(2)), dm
+    return year, None, None
+
+
+def _day(text, year, month, numeric):
+    """היום בחודש, כשהוא מופיע בטקסט ומתאים לשנה ולחודש שנמצאו; אחרת None."""
+    if numeric is not None:
+        if _full_year(int(numeric.group(3))) == year:
+            return int(numeric.group(1))
+        return None
+    for m in _DAY_MONTH_PATTERN.finditer(text):
+        if HEBREW_MONTHS[m.group(2)] == month:
+            return int(m.group(1))
+    return None
+
+
+def _end(text, start):
+    """תאריך החזרה לפי "X ימים" (היום האחרון = יציאה + X-1) או "X לילות" (יציאה + X)."""
+    m = _DURATION_PATTERN.search(text)
+    if not m:
+        return None
+    count = int(m.group(1))
+    if not 0 < count < 400:
+        return None
+    return start + timedelta(days=count - 1 if m.group(2) == "ימים" else count)
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(text):
+    """CruiseDate מטקסט תאריך, או None כשאין בו שנה. חודש עברי (גם עם ב: "באוגוסט"), 14/6/26, 14.6.2026,
+    ו-"X ימים/לילות - <תאריך>" (המשך קובע את end). התוצאה נשמרת בזיכרון LRU לפי הטקסט."""
+    if not text:
+        return None
+    year, month, numeric = _year_month(text)
+    if not year:
+        return None
+    if month is None:
+        return CruiseDate(date(year, 1, 1), "year", None)
+    day = _day(text, year, month, numeric)
+    if day is not None:
+        try:
+            start = date(year, month, day)
+        except ValueError:
+            pass
+        else:
+            return CruiseDate(start, "day", _end(text, start))
+    return CruiseDate(date(year, month, 1), "month", None)
+
+
+def date_cache_stats():
+    """מצב הזיכרון של parse_date (לסטטיסטיקת הסריקה)."""
+    info = parse_date.cache_info()
+    return {"hits": info.hits, "misses": info.misses, "size": info.currsize, "max_size": info.maxsize}
+
+
+def clear_date_cache():
+    parse_date.cache_clear()
@@ -0,0 +1,203 @@
+# competitor_research/http_cache.py
+# מטמון דיסק לדפים שנסרקו: רשומה לכל כתובת (מפתח = כתובת מנורמלת) עם ETag / Last-Modified וזמן טעינה,
+# והתוכן עצמו נשמר לפי hash של התוכן (content-addressed – דף זהה בכמה כתובות נשמר פעם אחת).
+# דף "טרי" (לפי TTL לסוג הדף) לא נטען בכלל; דף ישן נבדק בבקשה מותנית (304 = לא השתנה).
+#
+# מבנה התיקייה:
+#   entries/<sha1(key)>.json   – מטא-דאטה לכתובת
+#   bodies/<sha256(body)>.gz   – התוכן (gzip)
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+# כמה זמן דף נחשב טרי לפי סוג (שניות): דפי רשימה משתנים יותר מעמודי קרוז פנימיים
+DEFAULT_TTL_SECONDS = {
+    "listing": 6 * 3600,
+    "inner": 24 * 3600,
+}
+# מדיניות פינוי: רשומות ישנות מ-MAX_AGE נמחקות; מעל MAX_BYTES נמחקות הישנות ביותר
+DEFAULT_MAX_AGE_SECONDS = 14 * 24 * 3600
+# סוגי דפים שזמן העדכון שלהם (sitemap / REST) מכסה את כל התוכן. דף רשימה מציג הפלגות מפוסטים אחרים –
+# הפלגה חדשה או מחיר שהשתנה לא מעדכנים את modified שלו, ולכן הוא נשאר לפי TTL בלבד
+HINTED_PAGE_CLASSES = ("inner",)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def _sha1(s):
+    return hashlib.sha1(s.encode("utf-8")).hexdigest()
+
+
+class HttpCache:
+    """מטמון דיסק לפי כתובת מנורמלת. get/put/revalidated + evict() בסוף ריצה."""
+
+    def __init__(self, root, ttl_seconds=None, max_age_seconds=DEFAULT_MAX_AGE_SECONDS, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = Path(root)
+        self.ttl = dict(DEFAULT_TTL_SECONDS)
+        self.ttl.update(ttl_seconds or {})
+        self.max_age = max_age_seconds
+        self.max_bytes = max_bytes
+        self._entries_dir = self.root / "entries"
+        self._bodies_dir = self.root / "bodies"
+        self._lock = threading.Lock()
+        self._stats = {
+            "fresh_hits": 0,
+            "revalidated_304": 0,
+            "misses": 0,
+            "stored": 0,
+            "bytes_from_cache": 0,
+            "evicted_entries": 0,
+            "evicted_bodies": 0,
+        }
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _entry_path(self, key):
+        return self._entries_dir / (_sha1(key) + ".json")
+
+    def _body_path(self, body_sha):
+        return self._bodies_dir / (body_sha + ".gz")
+
+    def get(self, key):
+        """הרשומה לכתובת (dict) או None."""
+        path = self._entry_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception:
+            return None
+        if not self._body_path(entry.get("body_sha", "")).exists():
+            return None
+        return entry
+
+    def is_fresh(self, entry, page_class="listing", modified=None):
+        """טרי לפי TTL; modified (epoch, מ-sitemap / REST) – עמוד (HINTED_PAGE_CLASSES) שלא עודכן מאז שנטען
+        טרי עד max_age."""
+        if not entry:
+            return False
+        age = time.time() - entry.get("fetched_at", 0)
+        if (modified is not None and page_class in HINTED_PAGE_CLASSES and entry.get("fetched_at", 0) >= modified
+                and age < self.max_age):
+            return True
+        ttl = self.ttl.get(page_class, self.ttl.get("listing", 0))
+        return age < ttl
+
+    def load_body(self, entry):
+        """תוכן הדף מהמטמון, או None אם חסר/פגום."""
+        try:
+            with gzip.open(self._body_path(entry["body_sha"]), "rt", encoding="utf-8") as f:
+                body = f.read()
+        except Exception:
+            return None
+        self._count("bytes_from_cache", len(body.encode("utf-8")))
+        return body
+
+    def conditional_headers(self, entry):
+        """כותרות לבקשה מותנית (If-None-Match / If-Modified-Since)."""
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def fresh_hit(self):
+        self._count("fresh_hits")
+
+    def miss(self):
+        self._count("misses")
+
+    def put(self, key, url, body, page_class="listing", etag=None, last_modified=None, source="http"):
+        """שומר תוכן ומטא-דאטה. source: http / browser (לדף מדפדפן אין ETag – רק TTL)."""
+        if body is None:
+            return
+        data = body.encode("utf-8")
+        body_sha = hashlib.sha256(data).hexdigest()
+        self._entries_dir.mkdir(parents=True, exist_ok=True)
+        self._bodies_dir.mkdir(parents=True, exist_ok=True)
+        body_path = self._body_path(body_sha)
+        if not body_path.exists():
+            tmp = body_path.with_suffix(".tmp%d" % threading.get_ident())
+            with gzip.open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, body_path)
+        entry = {
+            "key": key,
+            "url": url,
+            "page_class": page_class,
+            "source": source,
+            "etag": etag,
+            "last_modified": last_modified,
+            "fetched_at": time.time(),
+            "body_sha": body_sha,
+            "size": len(data),
+        }
+        self._write_entry(key, entry)
+        self._count("stored")
+
+    def revalidated(self, key, entry):
+        """תשובת 304 – התוכן לא השתנה; מעדכנים רק את זמן הטעינה."""
+        entry = dict(entry)
+        entry["fetched_at"] = time.time()
+        self._write_entry(key, entry)
+        self._count("revalidated_304")
+
+    def _write_entry(self, key, entry):
+        path = self._entry_path(key)
+        tmp = path.with_suffix(".tmp%d" % threading.get_ident())
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    def evict(self):
+        """מוחק רשומות ישנות מ-max_age, ואז את הישנות ביותר עד שהגודל הכולל קטן מ-max_bytes.
+        תוכן שאף רשומה לא מצביעה עליו נמחק."""
+        if not self._entries_dir.exists():
+            return
+        now = time.time()
+        entries = []
+        for path in self._entries_dir.glob("*.json"):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    entry = json.load(f)
+            except Exception:
+                path.unlink(missing_ok=True)
+                self._count("evicted_entries")
+                continue
+            if now - entry.get("fetched_at", 0) > self.max_age:
+                path.unlink(missing_ok=True)
+                self._count("evicted_entries")
+                continue
+            entries.append((entry.get("fetched_at", 0), path, entry))
+        # גודל לפי תוכן ייחודי (כמה רשומות יכולות להצביע על אותו תוכן)
+        entries.sort(key=lambda x: x[0], reverse=True)
+        kept_bodies = set()
+        total = 0
+        for fetched_at, path, entry in entries:
+            sha = entry.get("body_sha")
+            if sha in kept_bodies:
+                continue
+            body_path = self._body_path(sha)
+            size = body_path.stat().st_size if body_path.exists() else 0
+            if total + size > self.max_bytes:
+                path.unlink(missing_ok=True)
+                self._count("evicted_entries")
+                continue
+            total += size
+            kept_bodies.add(sha)
+        if self._bodies_dir.exists():
+            for body_path in self._bodies_dir.glob("*.gz"):
+                if body_path.name[:-3] not in kept_bodies:
+                    body_path.unlink(missing_ok=True)
+                    self._count("evicted_bodies")
+
+    def stats(self):
+        return dict(self._stats)
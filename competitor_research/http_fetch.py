@@ -0,0 +1,355 @@
+# competitor_research/http_fetch.py
+# טעינה מדורגת: (מטמון דיסק) ואז בקשת HTTP רגילה (requests.Session משותף – keep-alive, gzip), ודפדפן רק כשצריך:
+# הדף לא שלם (לא נמצאו בו הפלגות/מחירים), נראה כמו חסימת בוטים, או שנכשל ברשת.
+# כתובות שנזקקו לדפדפן נשמרות בקובץ, כך שבריצה הבאה הן נטענות ישר בדפדפן.
+
+import json
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None
+    HTTPAdapter = None
+
+from browser_pool import DEFAULT_USER_AGENT
+
+DEFAULT_HEADERS = {
+    "User-Agent": DEFAULT_USER_AGENT,
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "he-IL,he;q=0.9,en;q=0.8",
+    "Accept-Encoding": "gzip, deflate",
+}
+# כמה בקשות HTTP במקביל
+DEFAULT_HTTP_WORKERS = 4
+# אחרי כמה ימים בודקים שוב אם כתובת שסומנה "צריכה דפדפן" עדיין צריכה
+ESCALATION_MAX_AGE_DAYS = 7
+# כמה דפים (האחרונים שנטענו) נשמרים בזיכרון לבקשה חוזרת באותה ריצה – לא כל ה-HTML של הסריקה
+MEMO_MAX_PAGES = 64
+# סטטוסים שדפדפן לא ישנה – לא מסלימים
+FINAL_HTTP_STATUSES = (404, 410)
+
+# סימנים של דף חסימה/אתגר (Cloudflare, Sucuri, Incapsula, captcha)
+BOT_CHALLENGE_MARKERS = [
+    "cf-browser-verification",
+    "challenge-platform",
+    "cf_chl_",
+    "just a moment...",
+    "attention required! | cloudflare",
+    "checking your browser",
+    "sucuri website firewall",
+    "_incapsula_resource",
+    "g-recaptcha",
+    "h-captcha",
+    "enable javascript and cookies to continue",
+]
+
+_session = None
+_session_lock = threading.Lock()
+# ארכיון הקלטה/השמעה (FetchArchive) – כשמוגדר, כל הבקשות עוברות דרכו
+_archive = None
+
+
+def set_archive(archive):
+    """archive (FetchArchive) – הקלטה או השמעה של כל בקשות ה-session; None – בקשות רגילות."""
+    global _archive
+    _archive = archive
+
+
+def get_session():
+    """requests.Session משותף לכל הריצה (חיבורים נשמרים פתוחים בין בקשות).
+    עם ארכיון – session שמקליט, או session שמגיש מהארכיון בלי רשת."""
+    if _archive is not None:
+        return _archive.wrap_session(_base_session())
+    return _base_session()
+
+
+def _base_session():
+    global _session
+    if requests is None:
+        return None
+    with _session_lock:
+        if _session is None:
+            s = requests.Session()
+            s.headers.update(DEFAULT_HEADERS)
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=max(8, DEFAULT_HTTP_WORKERS * 2))
+            s.mount("https://", adapter)
+            s.mount("http://", adapter)
+            _session = s
+        return _session
+
+
+def http_request(url, timeout=15000, headers=None):
+    """GET (אפשר עם כותרות מותנות). מחזיר (html, err, status, validators);
+    validators = {"etag", "last_modified"} מהתשובה. ב-304 אין html. timeout במילישניות כמו ב-Playwright."""
+    session = get_session()
+    if session is None:
+        return None, "requests not installed", None, {}
+    try:
+        r = session.get(url, timeout=max(1, timeout // 1000), headers=headers or None)
+    except Exception as e:
+        return None, str(e), None, {}
+    validators = {"etag": r.headers.get("ETag"), "last_modified": r.headers.get("Last-Modified")}
+    if r.status_code == 304:
+        return None, None, 304, validators
+    if r.status_code >= 400:
+        return r.text, f"HTTP {r.status_code}", r.status_code, validators
+    if not r.encoding or r.encoding.lower() == "iso-8859-1":
+        r.encoding = r.apparent_encoding or "utf-8"
+    return r.text, None, r.status_code, validators
+
+
+def http_get(url, timeout=15000):
+    """GET רגיל. מחזיר (html, err, status)."""
+    html, err, status, _ = http_request(url, timeout)
+    return html, err, status
+
+
+def looks_like_bot_challenge(status, html):
+    """האם התשובה נראית כמו דף חסימה/אתגר ולא כמו התוכן עצמו."""
+    if status in (403, 429, 503) and html:
+        return True
+    if not html:
+        return False
+    head = html[:20000].lower()
+    return any(marker in head for marker in BOT_CHALLENGE_MARKERS)
+
+
+class EscalationMemory:
+    """קובץ JSON: כתובת (מנורמלת) -> האם נזקקה לדפדפן ומתי נבדק. רשומות ישנות מ-max_age_days נבדקות מחדש."""
+
+    def __init__(self, path, max_age_days=ESCALATION_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age = timedelta(days=max_age_days)
+        self._data = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if path and path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f) or {}
+            except Exception:
+                self._data = {}
+
+    def needs_browser(self, key):
+        """True/False לפי הריצות הקודמות, או None אם לא ידוע (או שהרשומה ישנה)."""
+        entry = self._data.get(key)
+        if not entry:
+            return None
+        try:
+            checked = datetime.fromisoformat(entry.get("checked_at"))
+        except (TypeError, ValueError):
+            return None
+        if datetime.now() - checked > self.max_age:
+            return None
+        return bool(entry.get("needs_browser"))
+
+    def record(self, key, needs_browser, reason=""):
+        with self._lock:
+            self._data[key] = {
+                "needs_browser": bool(needs_browser),
+                "reason": reason,
+                "checked_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2, sort_keys=True)
+        self._dirty = False
+
+    def browser_urls(self):
+        return sorted(k for k, v in self._data.items() if v.get("needs_browser"))
+
+
+class TieredFetcher:
+    """HTTP קודם, דפדפן כגיבוי. browser_fetch_all(urls) -> [(html, err)] הוא שכבת הדפדפן (מאגר/אסינכרוני);
+    None – אין דפדפן, מחזירים את מה ש-HTTP החזיר. key(url) – נרמול כתובת לזיכרון ההסלמות ולמטמון.
+    cache (HttpCache) – דף טרי מוגש מהדיסק; דף ישן נבדק בבקשה מותנית (304).
+    http_first=False – כל דף שלא במטמון הולך ישר לדפדפן (כשיש).
+    limiter (HostRateLimiter) – קצב בקשות HTTP לכל host.
+    retry (RetryPolicy) – ניסיונות חוזרים לשגיאות זמניות ומפסק לכל host.
+    modified_hints – key(url) -> זמן עדכון (epoch) מ-sitemap / REST; עמוד פנימי במטמון שלא עודכן מאז לא נטען.
+    בקשה חוזרת לכתובת – מאותו שלב או משלב אחר – מקבלת את אותה תוצאה מהזיכרון (LRU של memo_size הדפים
+    האחרונים; כתובת שנדחקה ממנו נטענת שוב, בדרך כלל מהמטמון)."""
+
+    def __init__(self, memory=None, key=None, http_workers=DEFAULT_HTTP_WORKERS, cache=None, http_first=True,
+                 limiter=None, retry=None, memo_size=MEMO_MAX_PAGES):
+        self.memory = memory
+        self.key = key or (lambda u: u)
+        self.http_workers = max(1, int(http_workers))
+        self.cache = cache
+        self.http_first = http_first
+        self.limiter = limiter
+        self.retry = retry
+        self.modified_hints = {}
+        self.memo_size = max(0, int(memo_size))
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "http_ok": 0,
+            "http_not_modified": 0,
+            "escalated_incomplete": 0,
+            "escalated_challenge": 0,
+            "escalated_error": 0,
+            "browser_remembered": 0,
+            "browser_helped": 0,
+            "http_final_errors": 0,
+            "memo_hits": 0,
+        }
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _request(self, url, timeout, headers=None):
+        """בקשת HTTP אחת (אסימון קצב לכל ניסיון), עם ניסיונות חוזרים אם הוגדרו."""
+        def attempt():
+            if self.limiter is not None:
+                self.limiter.acquire(url)
+            return http_request(url, timeout, headers)
+        if self.retry is None:
+            return attempt()
+        return self.retry.call(url, attempt, size=4)
+
+    def _http_tier(self, url, timeout, complete, entry=None, page_class="listing"):
+        """מחזיר (html, err, escalate_reason). escalate_reason None = התוצאה סופית."""
+        headers = None
+        if self.cache is not None and entry and entry.get("source") == "http":
+            headers = self.cache.conditional_headers(entry)
+        html, err, status, validators = self._request(url, timeout, headers)
+        if status == 304 and entry:
+            body = self.cache.load_body(entry)
+            if body is not None:
+                self.cache.revalidated(self.key(url), entry)
+                self._count("http_not_modified")
+                return body, None, None
+            html, err, status, validators = self._request(url, timeout)
+        if status in FINAL_HTTP_STATUSES:
+            self._count("http_final_errors")
+            return None, err, None
+        if looks_like_bot_challenge(status, html):
+            self._count("escalated_challenge")
+            return None, err or "bot challenge", "challenge"
+        if err:
+            self._count("escalated_error")
+            return None, err, "error"
+        if complete is not None and not complete(html):
+            self._count("escalated_incomplete")
+            return html, None, "incomplete"
+        self._count("http_ok")
+        if self.cache is not None:
+            self.cache.put(self.key(url), url, html, page_class=page_class, source="http", **validators)
+        return html, None, None
+
+    def fetch_all(self, urls, timeout=15000, complete=None, browser_fetch_all=None, page_class="listing"):
+        """טעינה מדורגת של רשימת כתובות. מחזיר [(html, err)] לפי הסדר.
+        complete(html) -> bool: האם הדף שהגיע ב-HTTP מכיל את מה שמחפשים (אחרת – דפדפן).
+        page_class – listing / inner, קובע את ה-TTL במטמון.
+        כתובת שכבר נטענה בריצה (ועדיין בזיכרון) או שמופיעה כמה פעמים ב-urls לא נטענת שוב."""
+        urls = list(urls)
+        results = {}
+        pending = {}
+        for url in urls:
+            k = self.key(url)
+            if k in results or k in pending:
+                continue
+            if k in self._memo:
+                self._memo.move_to_end(k)
+                results[k] = self._memo[k]
+            else:
+                pending[k] = url
+        if pending:
+            fetched = self._fetch_unique(list(pending.values()), timeout, complete, browser_fetch_all, page_class)
+            results.update(zip(pending, fetched))
+            self._remember(zip(pending, fetched))
+        self._count("memo_hits", len(urls) - len(pending))
+        return [results[self.key(url)] for url in urls]
+
+    def _remember(self, items):
+        if not self.memo_size:
+            return
+        for k, result in items:
+            self._memo[k] = result
+            self._memo.move_to_end(k)
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def _fetch_unique(self, urls, timeout, complete, browser_fetch_all, page_class):
+        urls = list(urls)
+        results = [None] * len(urls)
+        entries = {}
+        http_idx = []
+        browser_idx = []
+        reasons = {}
+        for i, url in enumerate(urls):
+            if self.cache is not None:
+                entry = self.cache.get(self.key(url))
+                if self.cache.is_fresh(entry, page_class, self.modified_hints.get(self.key(url))):
+                    body = self.cache.load_body(entry)
+                    if body is not None:
+                        self.cache.fresh_hit()
+                        results[i] = (body, None)
+                        continue
+                self.cache.miss()
+                entries[i] = entry
+            if browser_fetch_all is not None and not self.http_first:
+                browser_idx.append(i)
+                reasons[i] = "browser_only"
+            elif browser_fetch_all is not None and self.memory is not None and self.memory.needs_browser(self.key(url)):
+                self._count("browser_remembered")
+                browser_idx.append(i)
+                reasons[i] = "remembered"
+            else:
+                http_idx.append(i)
+        if http_idx:
+            with ThreadPoolExecutor(max_workers=min(self.http_workers, len(http_idx))) as ex:
+                tiers = list(ex.map(
+                    lambda i: self._http_tier(urls[i], timeout, complete, entries.get(i), page_class), http_idx))
+            for i, (html, err, reason) in zip(http_idx, tiers):
+                results[i] = (html, err)
+                if reason and browser_fetch_all is not None:
+                    browser_idx.append(i)
+                    reasons[i] = reason
+                elif reason == "incomplete":
+                    # אין דפדפן – מחזירים את מה שיש
+                    results[i] = (html, None)
+                    if self.cache is not None:
+                        self.cache.put(self.key(urls[i]), urls[i], html, page_class=page_class, source="http")
+        if browser_idx:
+            browser_idx.sort()
+            fetched = browser_fetch_all([urls[i] for i in browser_idx])
+            for i, (bhtml, berr) in zip(browser_idx, fetched):
+                http_html = results[i][0] if results[i] else None
+                if berr:
+                    # הדפדפן נכשל – אם ב-HTTP הגיע דף (לא שלם) עדיף אותו משגיאה
+                    results[i] = (http_html, None) if http_html else (None, berr)
+                    continue
+                results[i] = (bhtml, None)
+                if self.cache is not None:
+                    self.cache.put(self.key(urls[i]), urls[i], bhtml, page_class=page_class, source="browser")
+                if reasons[i] == "browser_only":
+                    continue
+                helped = complete is None or complete(bhtml)
+                if helped and reasons[i] != "remembered":
+                    self._count("browser_helped")
+                # כתובת שנטענה ישר בדפדפן לא מתעדכנת – כך היא נבדקת שוב ב-HTTP אחרי max_age_days
+                if self.memory is not None and (reasons[i] != "remembered" or not helped):
+                    self.memory.record(self.key(urls[i]), helped, reasons[i])
+        return results
+
+    def fetch(self, url, timeout=15000, complete=None, browser_fetch_all=None, page_class="listing"):
+        return self.fetch_all([url], timeout=timeout, complete=complete, browser_fetch_all=browser_fetch_all,
+                              page_class=page_class)[0]
+
+    def stats(self):
+        out = dict(self._stats)
+        if self.memory is not None:
+            out["remembered_browser_urls"] = len(self.memory.browser_urls())
+        return out
@@ -0,0 +1,89 @@
+# competitor_research/inner_page_state.py
+# סריקה פנימית מצטברת: לכל עמוד קרוז שומרים את טביעת האצבע של הכרטיס שלו בדף היעד ואת השורות שיצאו
+# מהעמוד (טבלת מחירים / העשרה). בריצה הבאה, אם הכרטיס לא השתנה והרשומה לא ישנה מ-max_age – לא נכנסים
+# לעמוד בכלל ומשתמשים בשורות השמורות.
+
+import copy
+import hashlib
+import json
+import re
+from datetime import datetime, timedelta
+
+# אחרי כמה ימים נכנסים לעמוד שוב גם אם הכרטיס לא השתנה (מחירים בעמוד יכולים להשתנות בלי הכרטיס)
+INNER_PAGE_MAX_AGE_DAYS = 3
+
+
+def card_fingerprint(text):
+    """טביעת אצבע לטקסט כרטיס (רווחים מנורמלים) – sha1 hex."""
+    if not text:
+        return None
+    norm = re.sub(r"\s+", " ", text).strip()
+    return hashlib.sha1(norm.encode("utf-8")).hexdigest()
+
+
+def restore_row(row):
+    """JSON מחזיר רשימות – date_norm חוזר ל-tuple כמו בפרסור (ההתאמה משווה tuples)."""
+    row = copy.deepcopy(row)
+    if isinstance(row.get("date_norm"), list):
+        row["date_norm"] = tuple(row["date_norm"])
+    return row
+
+
+class InnerPageState:
+    """קובץ JSON: כתובת מנורמלת -> {fingerprint, fetched_at, rows}."""
+
+    def __init__(self, path, max_age_days=INNER_PAGE_MAX_AGE_DAYS):
+        self.path = path
+        self.max_age = timedelta(days=max_age_days)
+        self._data = {}
+        self._dirty = False
+        self._stats = {"reused": 0, "new": 0, "changed": 0, "expired": 0, "no_fingerprint": 0}
+        if path and path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f) or {}
+            except Exception:
+                self._data = {}
+
+    def lookup(self, key, fingerprint):
+        """השורות השמורות לעמוד אם הכרטיס לא השתנה והרשומה טרייה; אחרת None (צריך להיכנס לעמוד)."""
+        if not fingerprint:
+            self._stats["no_fingerprint"] += 1
+            return None
+        entry = self._data.get(key)
+        if not entry:
+            self._stats["new"] += 1
+            return None
+        if entry.get("fingerprint") != fingerprint:
+            self._stats["changed"] += 1
+            return None
+        try:
+            fetched = datetime.fromisoformat(entry.get("fetched_at"))
+        except (TypeError, ValueError):
+            fetched = None
+        if fetched is None or datetime.now() - fetched > self.max_age:
+            self._stats["expired"] += 1
+            return None
+        self._stats["reused"] += 1
+        return [restore_row(r) for r in entry.get("rows") or []]
+
+    def store(self, key, fingerprint, rows):
+        """שומר את השורות שיצאו מהעמוד (רק כשיש טביעת אצבע לכרטיס)."""
+        if not fingerprint:
+            return
+        self._data[key] = {
+            "fingerprint": fingerprint,
+            "fetched_at": datetime.now().isoformat(timespec="seconds"),
+            "rows": copy.deepcopy(rows),
+        }
+        self._dirty = True
+
+    def save(self):
+        if not self.path or not self._dirty:
+            return
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=1)
+        self._dirty = False
+
+    def stats(self):
+        return dict(self._stats)
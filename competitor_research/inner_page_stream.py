@@ -0,0 +1,89 @@
+# competitor_research/inner_page_stream.py
+# פרסור זורם (בסגנון SAX) של עמוד קרוז פנימי: ה-HTML נשלח לפרסר בחתיכות (lxml HTMLPullParser), וכל <table>
+# נמסר ברגע שהוא נסגר – בלי לחכות לסוף הדף ובלי לבנות עץ BeautifulSoup; כל אלמנט שנקרא מתרוקן, כך שהעץ לא
+# נשאר בזיכרון. מי שקורא עוצר בסוף האזור של טבלאות המחירים (SECTION_END), וכל מה שאחרי – פוטר, קרוסלת
+# "טיולים נוספים", תגובות – לא מפורסר בכלל.
+# הטבלה נמסרת כשורות של טקסט (כמו get_text של BeautifulSoup על אותו עץ lxml), כך שהלוגיקה של טבלת
+# המחירים זהה בשני המסלולים. בלי lxml – stream_available() מחזיר False והקורא מפרסר את כל הדף.
+
+try:
+    from lxml import etree
+except ImportError:
+    etree = None
+
+# כמה תווים נשלחים לפרסר בכל פעם
+STREAM_CHUNK_SIZE = 16384
+# אזור התוכן של עמוד (WordPress וכו'): טבלאות היציאות בתוכו, הפוטר והקרוסלות אחריו
+CONTENT_TAGS = ("main", "article")
+# נמסר כשאזור התוכן (CONTENT_TAGS) של הטבלה האחרונה שנמסרה נסגר
+SECTION_END = None
+# תגיות שהטקסט שלהן לא נכנס ל-get_text (המחרוזות שבהן מסוג אחר ב-BeautifulSoup)
+_SKIP_TEXT_TAGS = ("script", "style", "template", "rt", "rp")
+
+
+def stream_available():
+    return etree is not None
+
+
+def _strings(el, top=True):
+    """מחרוזות הטקסט של אלמנט לפי הסדר (בלי הערות ובלי script/style), כמו המחרוזות ש-get_text מחבר."""
+    if isinstance(el.tag, str) and el.tag not in _SKIP_TEXT_TAGS:
+        if el.text:
+            yield el.text
+        for child in el:
+            yield from _strings(child, top=False)
+    if not top and el.tail:
+        yield el.tail
+
+
+def _text(el, separator=""):
+    return separator.join(s.strip() for s in _strings(el) if s.strip())
+
+
+class TableRow:
+    """שורת טבלה: text – הטקסט המלא (רווח בין מחרוזות); cells – הטקסט של כל th/td בשורה (כולל מקוננים)."""
+
+    __slots__ = ("text", "cells")
+
+    def __init__(self, text, cells):
+        self.text = text
+        self.cells = cells
+
+
+def _rows(table):
+    return [TableRow(_text(tr, " "), [_text(cell) for cell in tr.iter("th", "td")]) for tr in table.iter("tr")]
+
+
+def stream_tables(html, chunk_size=STREAM_CHUNK_SIZE):
+    """גנרטור: לכל <table> בדף (לפי סדר הפתיחה, כמו find_all("table")) – רשימת TableRow, ו-SECTION_END כשנסגר
+    אזור התוכן (<main> / <article>) של הטבלה האחרונה שנמסרה – כל הטבלאות שבו (למשל טבלת יציאות לכל שנה) כבר
+    נמסרו. טבלה שאינה בתוך אזור כזה – אין SECTION_END, והפרסור ממשיך עד סוף הדף.
+    טבלה חיצונית נמסרת כשהיא נסגרת, ואחריה הטבלאות שבתוכה. הפסקת הגנרטור = הפסקת הפרסור.
+    אלמנט שנסגר ואינו בתוך טבלה פתוחה מתרוקן (clear) – העץ לא גדל עם הדף."""
+    if not html:
+        return
+    parser = etree.HTMLPullParser(events=("end",))
+    pos = 0
+    done = False
+    section = None
+    while not done:
+        if pos < len(html):
+            parser.feed(html[pos:pos + chunk_size])
+            pos += chunk_size
+        else:
+            parser.close()
+            done = True
+        for _, el in parser.read_events():
+            if not isinstance(el.tag, str):
+                continue
+            # אלמנט בתוך טבלה שעוד פתוחה – נמסר (ומתרוקן) יחד עם הטבלה החיצונית
+            if next(el.iterancestors("table"), None) is not None:
+                continue
+            if el.tag == "table":
+                for t in el.iter("table"):
+                    yield _rows(t)
+                section = next(el.iterancestors(*CONTENT_TAGS), None)
+            elif el is section:
+                section = None
+                yield SECTION_END
+            el.clear(keep_tail=True)
@@ -0,0 +1,66 @@
+# competitor_research/keyword_scanner.py
+# סורק מילות מפתח: אוטומט Aho–Corasick שנבנה פעם אחת (בטעינת המודול) לכל אוצר מילים – דגלים (טיול מובטח,
+# הרשמה מוקדמת, כשר, טיפים, מדריך דובר עברית), חודשים עבריים, "ימים"/"לילות" – ומחזיר את כל המופעים של כל
+# המילים עם המיקום שלהם במעבר אחד על הטקסט, גם כשמילים חופפות. כך הוספת מילים (מתחרים חדשים, אוצר מילים)
+# לא מוסיפה מעברים על הטקסט.
+# האוטומט הוא של pyahocorasick (C, ב-requirements.txt); בלי החבילה – חיפוש str.find לכל מילה (גם הוא ב-C),
+# עם אותה תוצאה.
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordScanner:
+    """keywords – רשימת מילים (הסדר נשמר). ignore_case=True – בלי הבחנה בין אותיות גדולות/קטנות (אנגלית).
+    hits(text) -> [(offset, keyword)] לפי המיקום (ובאותו מיקום – לפי סדר המילים);
+    positions(text) -> {keyword: [offsets]} רק למילים שנמצאו."""
+
+    def __init__(self, keywords, ignore_case=False):
+        self.ignore_case = ignore_case
+        self.keywords = list(dict.fromkeys(k for k in keywords if k))
+        self._order = {k: i for i, k in enumerate(self.keywords)}
+        self._automaton = None
+        if ahocorasick is not None and self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for k in self.keywords:
+                self._automaton.add_word(self._fold(k), k)
+            self._automaton.make_automaton()
+
+    def _fold(self, text):
+        """lower() כשצריך. אות ש-lower() משנה את האורך שלה (İ וכו') נשארת כמו שהיא – כך המיקומים בטקסט
+        המקופל הם המיקומים בטקסט המקורי (ומילה עם אות כזו מקופלת באותה דרך)."""
+        if not self.ignore_case:
+            return text
+        folded = text.lower()
+        if len(folded) == len(text):
+            return folded
+        return "".join(low if len(low) == 1 else c for c, low in ((c, c.lower()) for c in text))
+
+    def _iter(self, text):
+        """(offset, keyword) בלי מיון: לכל מילה המופעים שלה בסדר עולה."""
+        haystack = self._fold(text)
+        if self._automaton is not None:
+            for end, k in self._automaton.iter(haystack):
+                yield end - len(k) + 1, k
+            return
+        for k in self.keywords:
+            needle = self._fold(k)
+            idx = haystack.find(needle)
+            while idx >= 0:
+                yield idx, k
+                idx = haystack.find(needle, idx + 1)
+
+    def hits(self, text):
+        if not text or not self.keywords:
+            return []
+        return sorted(self._iter(text), key=lambda hit: (hit[0], self._order[hit[1]]))
+
+    def positions(self, text):
+        out = {}
+        if not text or not self.keywords:
+            return out
+        for offset, k in self._iter(text):
+            out.setdefault(k, []).append(offset)
+        return out
@@ -0,0 +1,255 @@
+# competitor_research/load_test.py
+# בדיקת עומס לסורק מול האתרים המדומים (synthetic_sites.py) – בלי לגעת באתרים האמיתיים.
+# מפעיל את השרת בתהליך נפרד (כדי שלא יתחרה בסורק על ה-GIL), מפנה את main() של scraper_cruise_compare
+# לכתובות המקומיות (פלט וקבצי מצב בתיקייה זמנית) ומדווח: דפים לשנייה, p50/p99 של זמן טעינה לדף,
+# זיכרון שיא (RSS) של תהליך הסורק, וכמה הפלגות נמצאו מול כמה שיש באתר.
+#
+# הרצה:
+#   python load_test.py                         # קטלוג בגודל הנוכחי (~24 יעדים)
+#   python load_test.py --scale 10 --latency-ms 80 --jitter-ms 40 --error-rate 0.01 --js-fraction 0.1
+#   python load_test.py --scale 10 --async --per-host 8 --json load_test_result.json
+
+import contextlib
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import http_fetch
+import scraper_cruise_compare as scraper
+from site_adapters import register_adapter
+from synthetic_sites import DEFAULT_CRUISES_PER_DESTINATION, DEFAULT_DESTINATIONS, MASSAOT_SELECTORS
+
+BASE_DIR = Path(__file__).resolve().parent
+SYNTHETIC_SITES = BASE_DIR / "synthetic_sites.py"
+# כמה שניות מחכים לשרת שיעלה
+SERVER_START_TIMEOUT = 30
+
+
+def percentile(values, p):
+    """אחוזון (nearest rank) מרשימת מספרים; None לרשימה ריקה."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = max(0, min(len(ordered) - 1, int(round(p / 100.0 * len(ordered) + 0.5)) - 1))
+    return ordered[k]
+
+
+def peak_rss_mb():
+    """זיכרון שיא של התהליך הנוכחי (ru_maxrss: KB בלינוקס, בתים ב-macOS)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        rss /= 1024
+    return round(rss / 1024, 1)
+
+
+class _TimingSession:
+    """עוטף את ה-session המשותף ומודד כל בקשה (כמו ההקלטה ב-fetch_archive, בלי לשמור תוכן)."""
+
+    def __init__(self, session, timer):
+        self._session = session
+        self._timer = timer
+
+    def get(self, url, **kwargs):
+        started = time.monotonic()
+        try:
+            return self._session.get(url, **kwargs)
+        finally:
+            self._timer.add("http", time.monotonic() - started)
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+
+class FetchTimer:
+    """זמני טעינה לכל דף (HTTP ודפדפן). מתחבר לאותה נקודה כמו ארכיון ההקלטה (http_fetch.set_archive)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.samples = {"http": [], "browser": []}
+
+    def add(self, tier, seconds, n=1):
+        with self._lock:
+            self.samples[tier].extend([seconds] * n)
+
+    def wrap_session(self, session):
+        return _TimingSession(session, self) if session is not None else None
+
+    def wrap_browser(self, fetch_batch):
+        """עוטף את _browser_fetch_batch – באצווה מקבילית נרשם הזמן הממוצע לדף."""
+        def timed(urls, *args, **kwargs):
+            urls = list(urls)
+            started = time.monotonic()
+            out = fetch_batch(urls, *args, **kwargs)
+            if urls:
+                self.add("browser", (time.monotonic() - started) / len(urls), n=len(urls))
+            return out
+        return timed
+
+    def summary(self, wall_seconds):
+        with self._lock:
+            all_samples = self.samples["http"] + self.samples["browser"]
+            pages = len(all_samples)
+            out = {
+                "pages": pages,
+                "http_pages": len(self.samples["http"]),
+                "browser_pages": len(self.samples["browser"]),
+                "pages_per_second": round(pages / wall_seconds, 2) if wall_seconds > 0 else None,
+            }
+            for name, p in (("p50_ms", 50), ("p99_ms", 99), ("max_ms", 100)):
+                value = percentile(all_samples, p)
+                out[name] = round(value * 1000, 1) if value is not None else None
+        return out
+
+
+def start_server(destinations, cruises, latency_ms=0, jitter_ms=0, error_rate=0.0, js_fraction=0.0, wp_api=True,
+                 seed=1):
+    """מפעיל את synthetic_sites.py בתהליך נפרד. מחזיר (process, urls)."""
+    cmd = [sys.executable, str(SYNTHETIC_SITES), "--destinations", str(destinations), "--cruises", str(cruises),
+           "--latency-ms", str(latency_ms), "--jitter-ms", str(jitter_ms), "--error-rate", str(error_rate),
+           "--js-fraction", str(js_fraction), "--seed", str(seed)]
+    if not wp_api:
+        cmd.append("--no-wp-api")
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True, encoding="utf-8")
+    result = {}
+    reader = threading.Thread(target=lambda: result.update(line=proc.stdout.readline()), daemon=True)
+    reader.start()
+    reader.join(SERVER_START_TIMEOUT)
+    if not result.get("line"):
+        proc.kill()
+        raise RuntimeError("synthetic sites server did not start")
+    return proc, json.loads(result["line"])
+
+
+def server_stats(urls):
+    session = http_fetch.get_session()
+    if session is None:
+        return None
+    try:
+        return session.get(urls["tarbutu_base"].split("/tarbutu/")[0] + "/__stats", timeout=5).json()
+    except Exception:
+        return None
+
+
+def point_scraper_at(urls, work_dir):
+    """מפנה את הסורק לאתרים המדומים; הפלט וקבצי המצב נכתבים לתיקייה הזמנית (לא דורסים את התוצאות האמיתיות)."""
+    scraper.TARBUTU_BASE = urls["tarbutu_base"]
+    scraper.TARBUTU_CRUISES_URL = urls["tarbutu_cruises"]
+    scraper.TARBUTU_RIVER_CRUISES_URL = urls["tarbutu_river"]
+    scraper.MASSAOT_URL = urls["massaot"]
+    scraper.TARBUTU_EXTRA_LIST_URLS = []
+    scraper.ALL_CRUISE_DESTINATION_NAMES = list(urls["destination_names"])
+    scraper.OUTPUT_JSON = work_dir / "cruise_compare_results.json"
+    scraper.OUTPUT_HTML = work_dir / "cruise_price_comparison.html"
+    scraper.OUTPUT_MD = work_dir / "cruise_price_comparison.md"
+    scraper.ESCALATIONS_JSON = work_dir / "fetch_escalations.json"
+    scraper.HTTP_CACHE_DIR = work_dir / ".http_cache"
+    scraper.INNER_STATE_JSON = work_dir / "inner_page_state.json"
+    scraper.JOURNAL_PATH = work_dir / "scan_journal.jsonl"
+    scraper.FRONTIER_JSON = work_dir / "crawl_frontier.json"
+    # הכרטיסים של "מסעות" המדומה – כמו "selectors" ב-targets.json לאתר אמיתי
+    register_adapter(scraper.MASSAOT_COMPANY, **MASSAOT_SELECTORS)
+
+
+def run_load_test(scale=1, destinations=None, cruises=DEFAULT_CRUISES_PER_DESTINATION, latency_ms=0, jitter_ms=0,
+                  error_rate=0.0, js_fraction=0.0, wp_api=True, seed=1, quiet=True, **main_kwargs):
+    """סריקה מלאה מול האתרים המדומים. main_kwargs עוברים ל-main() (async_crawl, per_host, rate_per_host...).
+    מחזיר dict עם מדדי הריצה."""
+    destinations = destinations or DEFAULT_DESTINATIONS * max(1, int(scale))
+    main_kwargs.setdefault("rate_per_host", 0)
+    main_kwargs.setdefault("use_cache", False)
+    main_kwargs.setdefault("incremental", False)
+    proc, urls = start_server(destinations, cruises, latency_ms, jitter_ms, error_rate, js_fraction, wp_api, seed)
+    timer = FetchTimer()
+    original_browser_batch = scraper._browser_fetch_batch
+    try:
+        with tempfile.TemporaryDirectory(prefix="load_test_") as tmp:
+            point_scraper_at(urls, Path(tmp))
+            http_fetch.set_archive(timer)
+            scraper._browser_fetch_batch = timer.wrap_browser(original_browser_batch)
+            started = time.monotonic()
+            if quiet:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    data = scraper.main(**main_kwargs)
+            else:
+                data = scraper.main(**main_kwargs)
+            wall = time.monotonic() - started
+        served = server_stats(urls)
+    finally:
+        http_fetch.set_archive(None)
+        scraper._browser_fetch_batch = original_browser_batch
+        proc.terminate()
+        proc.wait(timeout=10)
+    expected = urls["expected"]
+    listing_cruises = {scraper._normalize_url_for_dedup(c.get("url")) for c in data["tarbutu_cruises"]}
+    result = {
+        "catalog": expected,
+        "settings": {"latency_ms": latency_ms, "jitter_ms": jitter_ms, "error_rate": error_rate,
+                     "js_fraction": js_fraction, "wp_api": wp_api,
+                     **{k: v for k, v in main_kwargs.items() if isinstance(v, (int, float, str, bool, type(None)))}},
+        "wall_seconds": round(wall, 2),
+        "fetch": timer.summary(wall),
+        "peak_rss_mb": peak_rss_mb(),
+        "found": {
+            "tarbutu_cruise_pages": len(listing_cruises),
+            "tarbutu_rows": len(data["tarbutu_cruises"]),
+            "massaot_cruises": len(data["massaot_cruises"]),
+            "matches": len(data["matches"]),
+        },
+        "server": served,
+    }
+    return result
+
+
+def print_report(result):
+    f = result["fetch"]
+    cat = result["catalog"]
+    found = result["found"]
+    print(f"קטלוג: {cat['destinations']} יעדים, {cat['cruises']} הפלגות ({cat['js_destinations']} יעדים ב-JS), "
+          f"{cat['massaot_cruises']} במסעות.")
+    print(f"זמן: {result['wall_seconds']} שניות, {f['pages']} דפים ({f['http_pages']} HTTP, {f['browser_pages']} דפדפן), "
+          f"{f['pages_per_second']} דפים לשנייה.")
+    print(f"זמן טעינה לדף: p50 {f['p50_ms']} ms, p99 {f['p99_ms']} ms, מקסימום {f['max_ms']} ms.")
+    print(f"זיכרון שיא (תהליך הסורק): {result['peak_rss_mb']} MB.")
+    print(f"נמצאו: {found['tarbutu_cruise_pages']} מתוך {cat['cruises']} הפלגות בתרבותו ({found['tarbutu_rows']} שורות), "
+          f"{found['massaot_cruises']} במסעות, {found['matches']} התאמות.")
+    if result["server"]:
+        print(f"שרת: {result['server']['requests']} בקשות, {result['server']['errors_injected']} שגיאות 503 מוזרקות.")
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="בדיקת עומס לסורק מול אתרים מדומים מקומיים")
+    parser.add_argument("--scale", type=int, default=1, help=f"פי כמה מהקטלוג הנוכחי ({DEFAULT_DESTINATIONS} יעדים)")
+    parser.add_argument("--destinations", type=int, help="מספר יעדים (דורס את --scale)")
+    parser.add_argument("--cruises", type=int, default=DEFAULT_CRUISES_PER_DESTINATION, help="הפלגות לכל יעד")
+    parser.add_argument("--latency-ms", type=float, default=0, help="השהיה לכל בקשה בשרת")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="השהיה אקראית נוספת עד")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="חלק הבקשות שמחזירות 503")
+    parser.add_argument("--js-fraction", type=float, default=0.0, help="חלק דפי היעד שנבנים ב-JavaScript")
+    parser.add_argument("--no-wp-api", action="store_true", help="בלי REST API (גילוי יעדים מהתפריטים)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--async", dest="async_crawl", action="store_true", help="טעינה אסינכרונית (כמו בסורק)")
+    parser.add_argument("--per-host", type=int, default=scraper.DEFAULT_PER_HOST_CONCURRENCY)
+    parser.add_argument("--max-concurrency", type=int, default=scraper.DEFAULT_GLOBAL_CONCURRENCY)
+    parser.add_argument("--rate", type=float, default=0, help="בקשות לשנייה לכל אתר (0 = בלי הגבלה)")
+    parser.add_argument("--browser-only", action="store_true", help="כל דף בדפדפן")
+    parser.add_argument("--verbose", action="store_true", help="להציג את הפלט של הסורק")
+    parser.add_argument("--json", metavar="PATH", help="שמירת התוצאה כ-JSON")
+    args = parser.parse_args()
+    result = run_load_test(
+        scale=args.scale, destinations=args.destinations, cruises=args.cruises, latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms, error_rate=args.error_rate, js_fraction=args.js_fraction,
+        wp_api=not args.no_wp_api, seed=args.seed, quiet=not args.verbose,
+        async_crawl=args.async_crawl, per_host=args.per_host, max_concurrency=args.max_concurrency,
+        rate_per_host=args.rate, http_first=not args.browser_only,
+    )
+    print_report(result)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
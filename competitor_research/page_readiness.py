@@ -0,0 +1,84 @@
+# competitor_research/page_readiness.py
+# המתנה לדף "מוכן" לפי סוג הדף במקום time.sleep קבוע: ממשיכים ברגע שהתוכן שמחפשים הופיע
+# (כרטיסי תאריכים / תפריט יעדים בדף רשימה, טבלת מחירים או מחיר בעמוד קרוז), ועד תקרת זמן לכל סוג.
+
+import threading
+import time
+
+# תנאי מוכנות (JS שרץ בדף) לכל סוג דף
+READY_CONDITIONS = {
+    # דף רשימה/יעד: יש כרטיס "X ימים – תאריך", או שתפריט היעדים נטען והדף סיים להיטען
+    "listing": """() => {
+        const t = document.body ? document.body.innerText : "";
+        if (/\\d+\\s*(?:ימים|לילות)\\s*[-–]/.test(t)) return true;
+        const menuLinks = document.querySelectorAll(
+            "nav a[href*='tarbutu'], [class*='menu'] a[href*='tarbutu'], [role='navigation'] a[href*='tarbutu']");
+        return menuLinks.length > 3 && document.readyState === "complete";
+    }""",
+    # עמוד קרוז פנימי: טבלה עם שורת נתונים, או סימן מחיר בטקסט
+    "inner": """() => {
+        if (document.readyState === "loading") return false;
+        if (document.querySelector("table tr + tr")) return true;
+        const t = document.body ? document.body.innerText : "";
+        return /[$₪]\\s*\\d|\\d\\s*[$₪]/.test(t);
+    }""",
+    # כל דף אחר: סיום טעינת המסמך
+    "generic": '() => document.readyState === "complete"',
+}
+# תקרת המתנה (מילישניות) – אחריה ממשיכים עם מה שנטען
+READY_TIMEOUT_MS = {
+    "listing": 11000,
+    "inner": 6000,
+    "generic": 3000,
+}
+READY_POLL_MS = 200
+
+_stats_lock = threading.Lock()
+_stats = {"ready": 0, "timed_out": 0, "wait_seconds": 0.0}
+
+
+def _record(ready, waited):
+    with _stats_lock:
+        _stats["ready" if ready else "timed_out"] += 1
+        _stats["wait_seconds"] += waited
+
+
+def wait_until_ready(page, kind="generic", timeout=None):
+    """מחכה (sync) עד שתנאי המוכנות של kind מתקיים או עד התקרה. מחזיר True אם הדף מוכן."""
+    condition = READY_CONDITIONS.get(kind, READY_CONDITIONS["generic"])
+    timeout = READY_TIMEOUT_MS.get(kind, READY_TIMEOUT_MS["generic"]) if timeout is None else timeout
+    started = time.monotonic()
+    try:
+        page.wait_for_function(condition, timeout=timeout, polling=READY_POLL_MS)
+        ready = True
+    except Exception:
+        ready = False
+    _record(ready, time.monotonic() - started)
+    return ready
+
+
+async def wait_until_ready_async(page, kind="generic", timeout=None):
+    """כמו wait_until_ready – ל-Playwright async."""
+    condition = READY_CONDITIONS.get(kind, READY_CONDITIONS["generic"])
+    timeout = READY_TIMEOUT_MS.get(kind, READY_TIMEOUT_MS["generic"]) if timeout is None else timeout
+    started = time.monotonic()
+    try:
+        await page.wait_for_function(condition, timeout=timeout, polling=READY_POLL_MS)
+        ready = True
+    except Exception:
+        ready = False
+    _record(ready, time.monotonic() - started)
+    return ready
+
+
+def readiness_stats():
+    """כמה דפים היו מוכנים מוקדם / הגיעו לתקרה, וכמה שניות חיכינו בסך הכל."""
+    with _stats_lock:
+        out = dict(_stats)
+    out["wait_seconds"] = round(out["wait_seconds"], 2)
+    return out
+
+
+def reset_readiness_stats():
+    with _stats_lock:
+        _stats.update({"ready": 0, "timed_out": 0, "wait_seconds": 0.0})
@@ -0,0 +1,140 @@
+# competitor_research/parsed_page.py
+# פרסור אחד לכל מסמך: אותו HTML (דף הקרוזים, דף יעד, עמוד קרוז) עובר אצל כמה מחלצים – תפריט, כותרות,
+# כרטיסים, קישורים, טבלת מחירים, העשרה. במקום BeautifulSoup נפרד בכל אחד מהם, parsed_page(html) מחזיר
+# אובייקט אחד (ממוטמן לפי התוכן) עם תצוגות שנבנות רק כשמבקשים אותן: העץ בלי script/style, הטקסט המלא,
+# רשימת הקישורים והטבלאות. המחלצים רק קוראים מהעץ – אסור לשנות אותו (decompose וכו').
+#
+# מנוע הפרסור ניתן לבחירה (set_parser_backend): selectolax (lexbor) לטקסט ולכתובות הקישורים – פי כמה מהיר
+# יותר, ו-lxml לעץ של BeautifulSoup; מה שלא מותקן נופל ל-html.parser. הפלט זהה בכל המנועים.
+
+from functools import cached_property, lru_cache
+
+from bs4 import BeautifulSoup
+from bs4.element import Tag
+
+from source_index import SourceIndex
+
+try:
+    import lxml  # noqa: F401 – רק לבדיקה שמותקן (BeautifulSoup טוען אותו לבד)
+except ImportError:
+    lxml = None
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+# כמה מסמכים מפורסרים נשמרים בזיכרון (דף הקרוזים נקרא שוב אחרי כמה דפי יעד)
+PARSED_PAGE_CACHE_SIZE = 16
+# auto – הכי מהיר שמותקן: selectolax (טקסט/קישורים) + lxml (עץ), אחרת html.parser
+PARSER_BACKENDS = ("auto", "selectolax", "lxml", "html.parser")
+DEFAULT_PARSER_BACKEND = "auto"
+_STRIP_TAGS = ["script", "style"]
+
+_backend = DEFAULT_PARSER_BACKEND
+
+
+def set_parser_backend(name):
+    """בוחר מנוע פרסור (אחד מ-PARSER_BACKENDS). מנוע שלא מותקן נופל ל-html.parser."""
+    global _backend
+    if name not in PARSER_BACKENDS:
+        raise ValueError(f"unknown parser backend: {name}")
+    _backend = name
+
+
+def parser_backend():
+    """המנועים בפועל: {"tree": lxml / html.parser, "text": selectolax / soup}."""
+    use_selectolax = _backend in ("auto", "selectolax") and LexborHTMLParser is not None
+    use_lxml = _backend in ("auto", "selectolax", "lxml") and lxml is not None
+    return {"tree": "lxml" if use_lxml else "html.parser", "text": "selectolax" if use_selectolax else "soup"}
+
+
+class ParsedPage:
+    """מסמך HTML מפורסר. soup – העץ בלי script/style; text – הטקסט המלא (רווח בין אלמנטים);
+    lexbor – עץ selectolax (בלי script/style); links – תגיות <a> עם href לפי סדר ההופעה;
+    hrefs – ערכי ה-href שלהן; tables – תגיות <table>;
+    source – אינדקס מיקומים ב-HTML הגולמי (טקסט וקישורים של חלון, בלי לפרסר אותו שוב)."""
+
+    def __init__(self, html, backend=None):
+        self.html = html or ""
+        self.backend = backend or parser_backend()
+
+    @cached_property
+    def soup(self):
+        soup = BeautifulSoup(self.html, self.backend["tree"])
+        for tag in soup(_STRIP_TAGS):
+            tag.decompose()
+        return soup
+
+    @cached_property
+    def lexbor(self):
+        tree = LexborHTMLParser(self.html)
+        tree.strip_tags(_STRIP_TAGS)
+        return tree
+
+    @cached_property
+    def text(self):
+        if self.backend["text"] != "selectolax":
+            return self.soup.get_text(separator=" ", strip=True)
+        root = self.lexbor.root
+        if root is None:
+            return ""
+        return element_text(root)
+
+    @cached_property
+    def links(self):
+        return self.soup.find_all("a", href=True)
+
+    @cached_property
+    def hrefs(self):
+        if self.backend["text"] != "selectolax":
+            return [a.get("href", "") for a in self.links]
+        return [node.attributes.get("href") or "" for node in self.lexbor.css("a[href]")]
+
+    @cached_property
+    def tables(self):
+        return self.soup.find_all("table")
+
+    @cached_property
+    def source(self):
+        return SourceIndex(self.html)
+
+
+def element_text(el):
+    """הטקסט של אלמנט (BeautifulSoup או selectolax) כמו get_text(separator=" ", strip=True):
+    כל קטע טקסט בלי רווחים בקצוות, קטעים ריקים מושמטים."""
+    if isinstance(el, Tag):
+        return el.get_text(separator=" ", strip=True)
+    parts = []
+    for node in el.traverse(include_text=True):
+        if node.tag == "-text":
+            s = (node.text_content or "").strip()
+            if s:
+                parts.append(s)
+    return " ".join(parts)
+
+
+def element_attr(el, name):
+    """ערך מאפיין של אלמנט (BeautifulSoup או selectolax), או None."""
+    attrs = el.attrs if isinstance(el, Tag) else el.attributes
+    value = attrs.get(name)
+    # ב-BeautifulSoup class וכו' הם רשימות
+    return " ".join(value) if isinstance(value, list) else value
+
+
+@lru_cache(maxsize=PARSED_PAGE_CACHE_SIZE)
+def _parse(html, tree, text):
+    return ParsedPage(html, {"tree": tree, "text": text})
+
+
+def parsed_page(html):
+    """ParsedPage למסמך (html או ParsedPage קיים). אותו תוכן מפורסר פעם אחת לכל מי שמבקש אותו."""
+    if isinstance(html, ParsedPage):
+        return html
+    backend = parser_backend()
+    return _parse(html or "", backend["tree"], backend["text"])
+
+
+def clear_parsed_pages():
+    """משחרר את המסמכים השמורים (בסוף ריצה)."""
+    _parse.cache_clear()
@@ -0,0 +1,86 @@
+# competitor_research/politeness.py
+# נימוס כלפי האתרים הנסרקים: token bucket לכל host במקום time.sleep קבוע בין דפים.
+# כל בקשה "לוקחת" אסימון; האסימונים מתמלאים בקצב rate לשנייה עד burst. אם אין אסימון – מחכים בדיוק
+# כמה שצריך (ולא יותר), כך שסריקה של כמה אתרים במקביל לא מאטה סתם.
+
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+
+# ברירת מחדל: 2 בקשות לשנייה לכל אתר, עם פרץ של עד 4
+DEFAULT_RATE_PER_HOST = 2.0
+DEFAULT_BURST = 4
+
+
+def host_of(url):
+    """host ללא www. – מפתח להגבלות לפי אתר."""
+    netloc = (urlparse(url).netloc or "").lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+class TokenBucket:
+    """דלי אסימונים יחיד. reserve() מחזיר כמה שניות לחכות עד שהאסימון שהוזמן זמין (0 = מיד)."""
+
+    def __init__(self, rate=DEFAULT_RATE_PER_HOST, burst=DEFAULT_BURST):
+        self.rate = float(rate)
+        self.burst = max(1.0, float(burst))
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self):
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens >= 0 or self.rate <= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class HostRateLimiter:
+    """דלי נפרד לכל host. acquire(url) חוסם (sync); acquire_async(url) ממתין בלולאה האסינכרונית.
+    rate<=0 – בלי הגבלה."""
+
+    def __init__(self, rate=DEFAULT_RATE_PER_HOST, burst=DEFAULT_BURST):
+        self.rate = float(rate)
+        self.burst = burst
+        self._buckets = {}
+        self._lock = threading.Lock()
+        self._stats = {"acquired": 0, "throttled": 0, "wait_seconds": 0.0}
+
+    def _reserve(self, url):
+        if self.rate <= 0:
+            return 0.0
+        host = host_of(url)
+        with self._lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+        wait = bucket.reserve()
+        with self._lock:
+            self._stats["acquired"] += 1
+            if wait > 0:
+                self._stats["throttled"] += 1
+                self._stats["wait_seconds"] += wait
+        return wait
+
+    def acquire(self, url):
+        wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url):
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def stats(self):
+        out = dict(self._stats)
+        out["wait_seconds"] = round(out["wait_seconds"], 2)
+        out["rate_per_host"] = self.rate
+        out["burst"] = self.burst
+        return out
@@ -0,0 +1,127 @@
+# competitor_research/resource_blocking.py
+# חסימת משאבים בדפדפן (page.route / context.route): תמונות, פונטים, וידאו ומעקב צד-שלישי לא נטענים –
+# אנחנו קוראים רק את page.content(). רשימות allow/deny לפי סוג משאב ולפי דומיין, ומונים של מה שנחסם.
+
+from urllib.parse import urlparse
+
+# סוגי משאבים של Playwright (request.resource_type) שנחסמים כברירת מחדל
+DEFAULT_BLOCKED_TYPES = ("image", "media", "font")
+# דומיינים של מעקב/פרסום/צ'אטים – נחסמים בכל סוג משאב
+DEFAULT_BLOCKED_DOMAINS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "facebook.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "clarity.ms",
+    "tiktok.com",
+    "analytics.tiktok.com",
+    "bing.com",
+    "taboola.com",
+    "outbrain.com",
+    "yandex.ru",
+    "linkedin.com",
+    "snap.licdn.com",
+    "tawk.to",
+    "zopim.com",
+    "youtube.com",
+    "ytimg.com",
+    "vimeo.com",
+)
+# הערכת גודל ממוצע למשאב שנחסם (בתים) – לחישוב "כמה חסכנו"; הבקשה לא נשלחת ולכן הגודל האמיתי לא ידוע
+ESTIMATED_BYTES_BY_TYPE = {
+    "image": 80_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 50_000,
+    "xhr": 5_000,
+    "fetch": 5_000,
+    "other": 10_000,
+}
+
+
+def _host_matches(host, domains):
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+class ResourceBlocker:
+    """כללי חסימה. סדר עדיפויות: allow_domains > block_domains > allow_types > block_types > מעבר.
+    install(target) מתקין על page או context (sync); install_async – ל-Playwright async."""
+
+    def __init__(self, block_types=DEFAULT_BLOCKED_TYPES, block_domains=DEFAULT_BLOCKED_DOMAINS,
+                 allow_types=(), allow_domains=()):
+        self.block_types = set(block_types or ())
+        self.block_domains = tuple(d.lower() for d in (block_domains or ()))
+        self.allow_types = set(allow_types or ())
+        self.allow_domains = tuple(d.lower() for d in (allow_domains or ()))
+        self._stats = {
+            "requests_seen": 0,
+            "blocked": 0,
+            "blocked_by_type": {},
+            "blocked_by_domain": 0,
+            "estimated_bytes_saved": 0,
+        }
+
+    def should_block(self, resource_type, url):
+        """האם לחסום בקשה לפי סוג המשאב והדומיין."""
+        if resource_type == "document":
+            return False
+        host = (urlparse(url).hostname or "").lower()
+        if self.allow_domains and _host_matches(host, self.allow_domains):
+            return False
+        if self.block_domains and _host_matches(host, self.block_domains):
+            return True
+        if resource_type in self.allow_types:
+            return False
+        return resource_type in self.block_types
+
+    def _decide(self, request):
+        resource_type = request.resource_type
+        url = request.url
+        self._stats["requests_seen"] += 1
+        if not self.should_block(resource_type, url):
+            return False
+        host = (urlparse(url).hostname or "").lower()
+        self._stats["blocked"] += 1
+        by_type = self._stats["blocked_by_type"]
+        by_type[resource_type] = by_type.get(resource_type, 0) + 1
+        if self.block_domains and _host_matches(host, self.block_domains):
+            self._stats["blocked_by_domain"] += 1
+        self._stats["estimated_bytes_saved"] += ESTIMATED_BYTES_BY_TYPE.get(resource_type, ESTIMATED_BYTES_BY_TYPE["other"])
+        return True
+
+    def _handle(self, route):
+        try:
+            if self._decide(route.request):
+                route.abort()
+            else:
+                route.continue_()
+        except Exception:
+            pass
+
+    async def _handle_async(self, route):
+        try:
+            if self._decide(route.request):
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception:
+            pass
+
+    def install(self, target):
+        """מתקין את החסימה על page או context של Playwright sync."""
+        target.route("**/*", self._handle)
+
+    async def install_async(self, target):
+        """מתקין את החסימה על page או context של Playwright async."""
+        await target.route("**/*", self._handle_async)
+
+    def stats(self):
+        out = dict(self._stats)
+        out["blocked_by_type"] = dict(self._stats["blocked_by_type"])
+        return out
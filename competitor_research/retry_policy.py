@@ -0,0 +1,221 @@
+# competitor_research/retry_policy.py
+# ניסיונות חוזרים לטעינת דפים: כל שגיאה מסווגת (timeout, 5xx, שגיאת ניווט, חיבור, DNS) ורק שגיאות זמניות
+# נטענות שוב – עם המתנה שמכפילה את עצמה (עד תקרה) ורעש אקראי, כדי שכמה דפים לא ינסו שוב באותו רגע.
+# מפסק (circuit breaker) לכל host: אחרי כמה כישלונות רצופים האתר נחשב "למטה" והבקשות אליו נכשלות מיד
+# (בלי לשרוף timeout מלא לכל כתובת) – עד שעובר זמן הקירור ובקשת ניסיון אחת מצליחה.
+
+import asyncio
+import random
+import threading
+import time
+
+from politeness import host_of
+
+# ניסיונות לכל כתובת (כולל הראשון), המתנה בסיסית ותקרת המתנה בשניות
+DEFAULT_MAX_ATTEMPTS = 3
+DEFAULT_BASE_DELAY = 1.0
+DEFAULT_MAX_DELAY = 15.0
+# סוגי שגיאות שכדאי לנסות שוב (DNS ו-4xx לא ישתנו בעוד שנייה)
+RETRYABLE_KINDS = ("timeout", "server_error", "navigation", "connection")
+# סטטוסים זמניים שכדאי לנסות שוב. 503 עם גוף הוא בדרך כלל דף אתגר (Cloudflare וכו') – סופי, כדי שיעבור
+# מיד לדפדפן; 503 בלי גוף נחשב עומס זמני
+RETRYABLE_STATUSES = (500, 502, 504)
+CHALLENGE_STATUS = 503
+# מפסק: כמה כישלונות רצופים פותחים אותו, וכמה שניות הוא פתוח עד בקשת ניסיון
+BREAKER_FAILURE_THRESHOLD = 5
+BREAKER_COOLDOWN_SECONDS = 60.0
+# שגיאות שמעידות על בעיה באתר עצמו (נספרות במפסק)
+BREAKER_KINDS = ("timeout", "server_error", "navigation", "connection", "dns")
+
+_DNS_MARKERS = ("name_not_resolved", "name or service not known", "nameresolutionerror", "getaddrinfo failed",
+                "nodename nor servname")
+_TIMEOUT_MARKERS = ("timeout", "timed out")
+_CONNECTION_MARKERS = ("connectionerror", "connection aborted", "connection refused", "connection reset",
+                       "max retries exceeded", "failed to establish a new connection", "remotedisconnected")
+_NAVIGATION_MARKERS = ("net::err_", "navigation", "navigating", "page crashed", "target closed",
+                       "frame was detached")
+
+
+def classify_error(err, status=None, body=None):
+    """סוג השגיאה: timeout / server_error / challenge / navigation / connection / dns / other; None – אין שגיאה.
+    body – גוף התשובה (503 עם גוף = challenge)."""
+    if status is not None and status >= 500:
+        if status in RETRYABLE_STATUSES:
+            return "server_error"
+        if status == CHALLENGE_STATUS:
+            return "challenge" if body else "server_error"
+        return "other"
+    if not err:
+        return None
+    e = str(err).lower()
+    if any(m in e for m in _DNS_MARKERS):
+        return "dns"
+    if any(m in e for m in _TIMEOUT_MARKERS):
+        return "timeout"
+    if any(m in e for m in _CONNECTION_MARKERS):
+        return "connection"
+    if any(m in e for m in _NAVIGATION_MARKERS):
+        return "navigation"
+    if e.startswith("http 5"):
+        return "server_error"
+    return "other"
+
+
+class CircuitBreaker:
+    """מפסק לכל host: סגור (בקשות עוברות) -> פתוח אחרי threshold כישלונות רצופים (בקשות נכשלות מיד)
+    -> אחרי cooldown שניות בקשת ניסיון אחת; הצלחה סוגרת, כישלון פותח שוב."""
+
+    def __init__(self, threshold=BREAKER_FAILURE_THRESHOLD, cooldown=BREAKER_COOLDOWN_SECONDS):
+        self.threshold = max(1, int(threshold))
+        self.cooldown = float(cooldown)
+        self._hosts = {}
+        self._lock = threading.Lock()
+        self._stats = {"opened": 0, "short_circuited": 0, "probes": 0}
+
+    def _state(self, host):
+        state = self._hosts.get(host)
+        if state is None:
+            state = {"failures": 0, "opened_at": None, "probing": False}
+            self._hosts[host] = state
+        return state
+
+    def allow(self, url):
+        """האם מותר לשלוח בקשה ל-host של url עכשיו."""
+        with self._lock:
+            state = self._state(host_of(url))
+            if state["opened_at"] is None:
+                return True
+            if time.monotonic() - state["opened_at"] >= self.cooldown and not state["probing"]:
+                state["probing"] = True
+                self._stats["probes"] += 1
+                return True
+            self._stats["short_circuited"] += 1
+            return False
+
+    def record(self, url, ok):
+        with self._lock:
+            state = self._state(host_of(url))
+            state["probing"] = False
+            if ok:
+                state["failures"] = 0
+                state["opened_at"] = None
+                return
+            state["failures"] += 1
+            if state["failures"] >= self.threshold:
+                if state["opened_at"] is None:
+                    self._stats["opened"] += 1
+                state["opened_at"] = time.monotonic()
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+            out["open_hosts"] = sorted(h for h, s in self._hosts.items() if s["opened_at"] is not None)
+        return out
+
+
+class RetryPolicy:
+    """call(url, fn) מריץ fn() -> (html, err[, status, ...]) עם ניסיונות חוזרים לפי סוג השגיאה.
+    breaker (CircuitBreaker) – host שנפל נכשל מיד. call_async – אותו דבר ל-coroutine."""
+
+    def __init__(self, max_attempts=DEFAULT_MAX_ATTEMPTS, base_delay=DEFAULT_BASE_DELAY, max_delay=DEFAULT_MAX_DELAY,
+                 retry_on=RETRYABLE_KINDS, breaker=None):
+        self.max_attempts = max(1, int(max_attempts))
+        self.base_delay = float(base_delay)
+        self.max_delay = float(max_delay)
+        self.retry_on = tuple(retry_on)
+        self.breaker = breaker
+        self._lock = threading.Lock()
+        self._stats = {
+            "calls": 0,
+            "attempts": 0,
+            "retries": 0,
+            "recovered": 0,
+            "gave_up": 0,
+            "backoff_seconds": 0.0,
+            "errors_by_kind": {},
+        }
+
+    def delay(self, attempt):
+        """המתנה לפני ניסיון מספר attempt+1: base * 2^(attempt-1) עד max_delay, עם רעש (חצי עד מלא)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(cap / 2, cap)
+
+    def _outcome(self, url, result):
+        """סיווג תוצאה של ניסיון. מחזיר את סוג השגיאה (None = הצלחה/שגיאה סופית של הדף)."""
+        err = result[1] if len(result) > 1 else None
+        status = result[2] if len(result) > 2 else None
+        if status is not None and status < 500:
+            kind = None
+        else:
+            kind = classify_error(err, status, result[0])
+        with self._lock:
+            self._stats["attempts"] += 1
+            if kind:
+                by_kind = self._stats["errors_by_kind"]
+                by_kind[kind] = by_kind.get(kind, 0) + 1
+        if self.breaker is not None:
+            self.breaker.record(url, kind not in BREAKER_KINDS)
+        return kind
+
+    def _next_delay(self, kind, attempt):
+        """כמה לחכות לפני ניסיון נוסף, או None אם לא מנסים שוב."""
+        if kind not in self.retry_on or attempt >= self.max_attempts:
+            return None
+        wait = self.delay(attempt)
+        with self._lock:
+            self._stats["retries"] += 1
+            self._stats["backoff_seconds"] += wait
+        return wait
+
+    def _finish(self, kind, attempt):
+        with self._lock:
+            if kind in self.retry_on:
+                self._stats["gave_up"] += 1
+            elif attempt > 1 and kind is None:
+                self._stats["recovered"] += 1
+
+    def _short_circuit(self, url, size):
+        err = f"circuit open: {host_of(url)}"
+        return (None, err) + (None,) * (size - 2)
+
+    def call(self, url, fn, size=2):
+        """size – אורך ה-tuple ש-fn מחזיר (לתשובת מפסק פתוח באותו מבנה)."""
+        with self._lock:
+            self._stats["calls"] += 1
+        attempt = 0
+        while True:
+            if self.breaker is not None and not self.breaker.allow(url):
+                return self._short_circuit(url, size)
+            attempt += 1
+            result = fn()
+            kind = self._outcome(url, result)
+            wait = self._next_delay(kind, attempt)
+            if wait is None:
+                self._finish(kind, attempt)
+                return result
+            time.sleep(wait)
+
+    async def call_async(self, url, coro_fn, size=2):
+        with self._lock:
+            self._stats["calls"] += 1
+        attempt = 0
+        while True:
+            if self.breaker is not None and not self.breaker.allow(url):
+                return self._short_circuit(url, size)
+            attempt += 1
+            result = await coro_fn()
+            kind = self._outcome(url, result)
+            wait = self._next_delay(kind, attempt)
+            if wait is None:
+                self._finish(kind, attempt)
+                return result
+            await asyncio.sleep(wait)
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+            out["errors_by_kind"] = dict(out["errors_by_kind"])
+        out["backoff_seconds"] = round(out["backoff_seconds"], 2)
+        out["max_attempts"] = self.max_attempts
+        out["circuit_breaker"] = self.breaker.stats() if self.breaker is not None else None
+        return out
@@ -4,9 +4,7 @@
 # Sends results by email after each run; can be scheduled daily at 8:00.
 
 import json
-import re
 import smtplib
-import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 from email.mime.base import MIMEBase
@@ -22,7 +20,11 @@ except ImportError:
     sync_playwright = None
     stealth_sync = None
 
-from bs4 import BeautifulSoup
+from page_readiness import wait_until_ready
+from parsed_page import parsed_page
+from resource_blocking import ResourceBlocker
+from site_adapters import adapter_for
+from text_rules import TextRules
 
 BASE_DIR = Path(__file__).resolve().parent
 TARGETS_PATH = BASE_DIR / "targets.json"
@@ -100,6 +102,27 @@ def load_targets():
     return [s for s in data["sources"] if s["company"] in COMPANY_KEYS]
 
 
+# How the first hit of each PATTERNS field lands in the result: (path in the result, value).
+# A list at the end of the path is appended to; a callable value gets the match.
+FIELD_RULES = {
+    "guaranteed_departure": (("guaranteed_departure",), True),
+    "early_bird": (("discounts",), "early bird"),
+    "last_minute": (("discounts",), "last minute"),
+    "tips": (("inclusions", "tips"), True),
+    "shore_excursions": (("inclusions", "shore_excursions"), True),
+    "israeli_guide": (("inclusions", "israeli_guide"), True),
+    "kosher": (("inclusions", "kosher_food"), True),
+    "duration_days": (("duration_days",), lambda m: int(m.group(1))),
+    "price_double": (("price_double",), lambda m: m.group(1).replace(",", "").strip()),
+    "price_balcony": (("price_balcony",), lambda m: m.group(1).replace(",", "").strip()),
+}
+# Fields that also log which pattern fired
+SNIPPET_FIELDS = ("guaranteed_departure",)
+
+# PATTERNS compiled once at import
+_TEXT_RULES = TextRules(PATTERNS)
+
+
 def extract_from_text(text: str, company: str) -> dict:
     """Extract structured fields from page text using regex patterns."""
     text_lower = text.replace("\n", " ").replace("\r", " ")
@@ -119,59 +142,33 @@ def extract_from_text(text: str, company: str) -> dict:
         },
         "raw_snippets": [],
     }
-    for key, patterns in PATTERNS.items():
-        if key == "guaranteed_departure":
-            for p in patterns:
-                if re.search(p, text_lower, re.IGNORECASE):
-                    out["guaranteed_departure"] = True
-                    out["raw_snippets"].append(f"guaranteed_departure: {p}")
-                    break
-        elif key == "early_bird" or key == "last_minute":
-            for p in patterns:
-                if re.search(p, text_lower, re.IGNORECASE):
-                    out["discounts"].append(key.replace("_", " "))
-                    break
-        elif key == "tips":
-            for p in patterns:
-                if re.search(p, text_lower, re.IGNORECASE):
-                    out["inclusions"]["tips"] = True
-                    break
-        elif key == "shore_excursions":
-            for p in patterns:
-                if re.search(p, text_lower, re.IGNORECASE):
-                    out["inclusions"]["shore_excursions"] = True
-                    break
-        elif key == "israeli_guide":
-            for p in patterns:
-                if re.search(p, text_lower, re.IGNORECASE):
-                    out["inclusions"]["israeli_guide"] = True
-                    break
-        elif key == "kosher":
-            for p in patterns:
-                if re.search(p, text_lower, re.IGNORECASE):
-                    out["inclusions"]["kosher_food"] = True
-                    break
-        elif key == "duration_days":
-            for p in patterns:
-                m = re.search(p, text_lower, re.IGNORECASE)
-                if m:
-                    out["duration_days"] = int(m.group(1))
-                    break
-        elif key == "price_double":
-            for p in patterns:
-                m = re.search(p, text_lower, re.IGNORECASE)
-                if m:
-                    out["price_double"] = m.group(1).replace(",", "").strip()
-                    break
-        elif key == "price_balcony":
-            for p in patterns:
-                m = re.search(p, text_lower, re.IGNORECASE)
-                if m:
-                    out["price_balcony"] = m.group(1).replace(",", "").strip()
-                    break
+    for key, m in _TEXT_RULES.first(text_lower).items():
+        if not m or key not in FIELD_RULES:
+            continue
+        path, value = FIELD_RULES[key]
+        if callable(value):
+            value = value(m)
+        target = out
+        for part in path[:-1]:
+            target = target[part]
+        if isinstance(target[path[-1]], list):
+            target[path[-1]].append(value)
+        else:
+            target[path[-1]] = value
+        if key in SNIPPET_FIELDS:
+            out["raw_snippets"].append(f"{key}: {m.re.pattern}")
     return out
 
 
+def extract_cruises(page, url: str, company: str) -> list:
+    """One record per cruise card via the company's site adapter (CSS selectors); [] when there is
+    no adapter or it finds no cards, leaving the page-level regex fields as the only data."""
+    adapter = adapter_for(company)
+    if adapter is None:
+        return []
+    return [card.record() for card in adapter.cards(page, url)]
+
+
 def scrape_with_playwright(url: str, company: str) -> dict:
     """Fetch page with Playwright + stealth and return extracted data + raw text."""
     if not sync_playwright or not stealth_sync:
@@ -189,11 +186,13 @@ def scrape_with_playwright(url: str, company: str) -> dict:
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
             locale="he-IL",
         )
+        # בלי תמונות/פונטים/וידאו/מעקב – קוראים רק את ה-HTML
+        ResourceBlocker().install(context)
         page = context.new_page()
         stealth_sync(page)
         try:
             page.goto(url, wait_until="networkidle", timeout=25000)
-            time.sleep(2)
+            wait_until_ready(page, "generic")
             content = page.content()
         except Exception as e:
             browser.close()
@@ -205,13 +204,11 @@ def scrape_with_playwright(url: str, company: str) -> dict:
                 "raw_text_preview": "",
             }
         browser.close()
-    soup = BeautifulSoup(content, "html.parser")
-    for tag in soup(["script", "style"]):
-        tag.decompose()
-    raw_text = soup.get_text(separator=" ", strip=True)
+    page = parsed_page(content)
+    raw_text = page.text
     extracted = extract_from_text(raw_text, company)
     # Try to get a route from title or h1
-    title = soup.find("title")
+    title = page.soup.find("title")
     if title and title.get_text(strip=True):
         extracted["route"] = title.get_text(strip=True)[:200]
     return {
@@ -219,6 +216,7 @@ def scrape_with_playwright(url: str, company: str) -> dict:
         "url": url,
         "error": None,
         "extracted": extracted,
+        "cruises": extract_cruises(page, url, company),
         "raw_text_preview": raw_text[:8000],
     }
 
@@ -257,6 +255,7 @@ def build_comparison(results: list) -> str:
         lines.append(f"### {r['company']}")
         lines.append(f"- **קישור:** {r.get('url', '')}")
         lines.append(f"- **מסלול/כותרת:** {ex.get('route') or '—'}")
+        lines.append(f"- **הפלגות שנמצאו:** {len(r.get('cruises') or []) or '—'}")
         lines.append(f"- **משך (ימים):** {ex.get('duration_days') or '—'}")
         lines.append(f"- **מחיר זוגי:** {ex.get('price_double') or '—'}")
         lines.append(f"- **מחיר מרפסת:** {ex.get('price_balcony') or '—'}")
@@ -5,6 +5,9 @@
 #   pip install playwright playwright-stealth beautifulsoup4 requests
 #   playwright install chromium   # פעם אחת
 #   python scraper_cruise_compare.py
+#   python scraper_cruise_compare.py --async --per-host 4 --max-concurrency 8   # טעינה במקביל
+#   python scraper_cruise_compare.py --record scan.har.gz   # שמירת כל התשובות לארכיון
+#   python scraper_cruise_compare.py --replay scan.har.gz --replay-latency 50   # ריצה מהארכיון, בלי רשת
 #
 # פלט: cruise_compare_results.json, cruise_price_comparison.html, cruise_price_comparison.md
 
@@ -12,28 +15,47 @@ import json
 import re
 import time
 import unicodedata
+from bisect import bisect_right
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
-from urllib.parse import urljoin, urlparse, quote
-
-try:
-    from playwright.sync_api import sync_playwright
-    from playwright_stealth import stealth_sync
-except ImportError:
-    sync_playwright = None
-    stealth_sync = None
-
-from bs4 import BeautifulSoup
-
-try:
-    import requests
-except ImportError:
-    requests = None
+from urllib.parse import urljoin, urlparse, quote, unquote
+
+from async_crawl import AsyncCrawler, async_playwright_available, DEFAULT_PER_HOST_CONCURRENCY, DEFAULT_GLOBAL_CONCURRENCY
+from browser_pool import BrowserPool, playwright_available
+from checkpoint import ScanJournal, DEFAULT_CHUNK_SIZE
+from crawl_frontier import CrawlFrontier
+from dom_text import DomTextIndex
+from fetch_archive import FetchArchive
+from hebrew_dates import DURATION_SCANNER, parse_date, date_cache_stats
+from http_cache import HttpCache
+from http_fetch import EscalationMemory, TieredFetcher, http_get, set_archive, DEFAULT_HTTP_WORKERS
+from inner_page_state import InnerPageState, card_fingerprint, restore_row, INNER_PAGE_MAX_AGE_DAYS
+from inner_page_stream import SECTION_END, TableRow, stream_available, stream_tables
+from parsed_page import parsed_page, clear_parsed_pages, set_parser_backend, parser_backend as parser_backend_info, PARSER_BACKENDS, DEFAULT_PARSER_BACKEND
+from page_readiness import wait_until_ready, readiness_stats, reset_readiness_stats
+from politeness import HostRateLimiter, DEFAULT_RATE_PER_HOST
+from resource_blocking import ResourceBlocker
+from retry_policy import CircuitBreaker, RetryPolicy, DEFAULT_MAX_ATTEMPTS
+from site_adapters import adapter_for, adapter_stats
+from structured_data import structured_records, structured_data_stats
+from text_rules import TextRules
+from wp_discovery import WpDiscovery, modified_hints
 
 BASE_DIR = Path(__file__).resolve().parent
 OUTPUT_JSON = BASE_DIR / "cruise_compare_results.json"
 OUTPUT_HTML = BASE_DIR / "cruise_price_comparison.html"
 OUTPUT_MD = BASE_DIR / "cruise_price_comparison.md"
+# כתובות שנזקקו לדפדפן (HTTP רגיל לא הספיק) – נשמר בין ריצות
+ESCALATIONS_JSON = BASE_DIR / "fetch_escalations.json"
+# מטמון דיסק לדפים (ETag / Last-Modified, TTL לפי סוג דף)
+HTTP_CACHE_DIR = BASE_DIR / ".http_cache"
+# טביעות אצבע של כרטיסי קרוז + השורות מהעמודים הפנימיים (סריקה פנימית מצטברת)
+INNER_STATE_JSON = BASE_DIR / "inner_page_state.json"
+# יומן נקודות ביקורת של הריצה הנוכחית (--resume ממשיך ממנו אחרי נפילה; נמחק בסיום מוצלח)
+JOURNAL_PATH = BASE_DIR / "scan_journal.jsonl"
+# תפוקה וזמן בדיקה לכל דף שנבדק בגילוי הגיבוי (ציון בתור העדיפויות בריצה הבאה)
+FRONTIER_JSON = BASE_DIR / "crawl_frontier.json"
 
 # דפים לסריקה (נקודות כניסה – דפי רשימה נוספים מתגלים אוטומטית מקישורים)
 TARBUTU_CRUISES_URL = "https://www.tarbutu.co.il/%D7%A7%D7%A8%D7%95%D7%96%D7%99%D7%9D/"
@@ -67,13 +89,36 @@ TARBUTU_EXTRA_LIST_URLS = [
     ("https://www.tarbutu.co.il/%d7%99%d7%9d-%d7%94%d7%91%d7%9c%d7%98%d7%99/", "הים הבלטי"),
 ]
 MASSAOT_URL = "https://www.massaot.co.il/"
+# המפתח של מסעות ב-targets.json (מתאם הסלקטורים שלה ב-site_adapters)
+MASSAOT_COMPANY = "Massaot"
 MAX_LIST_PAGE_CANDIDATES = 50
-
-# חודשים עבריים -> מספר
-HEBREW_MONTHS = {
-    "ינואר": 1, "פברואר": 2, "מרץ": 3, "מרס": 3, "אפריל": 4, "מאי": 5, "יוני": 6, "יולי": 7,
-    "אוגוסט": 8, "ספטמבר": 9, "אוקטובר": 10, "נובמבר": 11, "דצמבר": 12,
-}
+# גילוי גיבוי: עומק מקסימלי (1 = קישורים מדפי הכניסה) וכמה דפים בכל אצווה לפני עדכון התור
+MAX_LIST_DEPTH = 2
+FRONTIER_BATCH_SIZE = 10
+# עמודי קרוז פנימיים: תקציב זמן לכל שלב (במקום תקרה קבועה של 60 עמודים), וכמה דפי דפדפן טוענים במקביל
+DEFAULT_INNER_BUDGET_SECONDS = 20 * 60
+DEFAULT_INNER_WORKERS = 4
+INNER_BUDGET_ERROR = "inner-page budget exhausted"
+
+# מאגר הדפדפן של הריצה הנוכחית (נקבע ב-main; מחוץ ל-main כל טעינה פותחת מאגר חד-פעמי)
+_BROWSER_POOL = None
+# מנוע אסינכרוני של הריצה הנוכחית (רק ב-main(async_crawl=True)); כשקיים – כל הטעינות בדפדפן עוברות דרכו
+_ASYNC_CRAWLER = None
+# טעינה מדורגת (מטמון, HTTP, ורק אז דפדפן) של הריצה הנוכחית; None = ישר לדפדפן
+_TIERED_FETCHER = None
+# קצב בקשות לכל host (token bucket) של הריצה הנוכחית; None = בלי הגבלה
+_RATE_LIMITER = None
+# ניסיונות חוזרים + מפסק לכל host של הריצה הנוכחית; None = ניסיון אחד
+_RETRY_POLICY = None
+# מאגר N דפי דפדפן (async) לעמודים פנימיים כשהסריקה עצמה סינכרונית; None = אחד אחרי השני במאגר הרגיל
+_INNER_CRAWLER = None
+# ארכיון הקלטה/השמעה של תשובות (FetchArchive); None = ריצה רגילה
+_ARCHIVE = None
+# טבלת המחירים בעמודים פנימיים בפרסור זורם (עוצר בסוף אזור התוכן של טבלת המחירים); False = עץ מלא של כל הדף
+_STREAM_INNER_PAGES = True
+INNER_PARSE_MODES = ("stream", "full")
+# תווים שנשארים כמו שהם כשנתיב מקודד מחדש לנרמול (כל השאר – %XX באותיות גדולות)
+_PATH_SAFE_CHARS = "/:@!$&'()*+,;=~"
 
 # תבניות לחילוץ אונייה (סוף כותרת או ביטויים נפוצים)
 SHIP_PATTERNS = [
@@ -100,6 +145,29 @@ DATE_LINE_PATTERN = re.compile(
     re.IGNORECASE
 )
 
+# תבניות מחיר בטקסט לפי עדיפות (מקומפלות פעם אחת)
+PRICE_TEXT_PATTERNS = [
+    r"מחירים\s*ב-\s*\$\s*לאדם[^\d]*(\d[\d,.]*)",
+    r"חדר\s*פנימי[^\d]*(\d[\d,.]*)\s*\$",
+    r"החל\s*מ[-\s]*(\d[\d,.]*)\s*[₪\$€]",
+    r"מחיר[^\d]*(\d[\d,.]*)\s*[₪\$€]",
+    r"מחיר[^\d]{0,30}(\d[\d,.]*)\s*(?:₪|\$|שקל)",
+    r"(\d[\d,.]*)\s*[₪\$€]\s*לאדם",
+    r"(\d[\d,.]*)\s*[₪\$€]\s*לזוג",
+    r"(\d[\d,.]*)\s*[₪\$€]\s*לחדר",
+    r"(\d[\d,.]*)\s*\$",  # 4,125 $
+    r"(\d[\d,.]*)\s*[₪\$€]",
+    r"[₪\$€]\s*(\d[\d,.]*)",
+    r"(?:מ|מ-)\s*(\d[\d,.]*)\s*(?:₪|\$|שקל)",
+]
+_PRICE_RULES = TextRules({"price": PRICE_TEXT_PATTERNS})
+# מחיר ב-HTML: תגיות של תאי מחיר, מחיר ליד מטבע, class/id של מחיר, מספר, תווית מחיר
+PRICE_CELL_TAGS = ("td", "th", "span", "div")
+_PRICE_CELL_PATTERN = re.compile(r"(\d[\d,.]*)\s*[₪\$]|[₪\$]\s*(\d[\d,.]*)")
+_PRICE_ATTR_PATTERN = re.compile(r"price|מחיר|amount|תמחור", re.I)
+_PRICE_NUMBER_PATTERN = re.compile(r"(\d[\d,.]*)")
+_PRICE_LABEL_PATTERN = re.compile(r"מחיר|החל\s*מ|₪|\$\s*\d")
+
 
 def normalize_ship(name):
     """נרמול שם אונייה להשוואה."""
@@ -115,43 +183,19 @@ def normalize_ship(name):
 
 
 def parse_hebrew_date(date_text):
-    """מחזיר (year, month) או None. תאריך מהטקסט כמו 'נובמבר 2026', '19 באוגוסט 2026', '14/6/26'."""
-    if not date_text:
-        return None
-    # שנה בת 4 ספרות
-    m = re.search(r"(\d{4})", date_text)
-    if m:
-        year = int(m.group(1))
-    else:
-        # שנה בת 2 ספרות 26 -> 2026
-        m2 = re.search(r"[/\-](\d{2})\s*$|[/\-](\d{2})(?:\s|$)", date_text)
-        if m2:
-            y = int(m2.group(1) or m2.group(2))
-            year = 2000 + y if y < 50 else 1900 + y
-        else:
-            return None
-    month = None
-    for heb, num in HEBREW_MONTHS.items():
-        if heb in date_text:
-            month = num
-            break
-    if month is None:
-        # תאריך מספרי 14/6/26
-        dm = re.search(r"(\d{1,2})[/\-](\d{1,2})[/\-](\d{2,4})", date_text)
-        if dm:
-            month = int(dm.group(2))
-            if month < 1 or month > 12:
-                month = None
-    if month is None:
-        m = re.search(r"(?:ב)?\s*(\w+)\s*" + str(year), date_text)
-        if m:
-            for heb, num in HEBREW_MONTHS.items():
-                if heb in m.group(0):
-                    month = num
-                    break
-    if month is None and year:
-        return (year, None)
-    return (year, month) if month else None
+    """מחזיר (year, month) או None. תאריך מהטקסט כמו 'נובמבר 2026', '19 באוגוסט 2026', '14/6/26'.
+    התאריך המלא (יום, רמת דיוק, תאריך חזרה) – parse_date של hebrew_dates."""
+    parsed = parse_date(date_text)
+    return parsed.norm if parsed else None
+
+
+def _date_fields(parsed):
+    """שדות התאריך של קרוז: date_norm – (year, month); date_start / date_end – YYYY-MM-DD כשהיום ידוע."""
+    return {
+        "date_norm": parsed.norm,
+        "date_start": parsed.isoformat(),
+        "date_end": parsed.end.isoformat() if parsed.end else None,
+    }
 
 
 def extract_ship_from_title(title):
@@ -177,22 +221,8 @@ def extract_price_from_text(text):
     """חילוץ מחיר מהטקסט (₪ או $ או מספר אחרי מחיר)."""
     if not text:
         return None
-    patterns = [
-        r"מחירים\s*ב-\s*\$\s*לאדם[^\d]*(\d[\d,.]*)",
-        r"חדר\s*פנימי[^\d]*(\d[\d,.]*)\s*\$",
-        r"החל\s*מ[-\s]*(\d[\d,.]*)\s*[₪\$€]",
-        r"מחיר[^\d]*(\d[\d,.]*)\s*[₪\$€]",
-        r"מחיר[^\d]{0,30}(\d[\d,.]*)\s*(?:₪|\$|שקל)",
-        r"(\d[\d,.]*)\s*[₪\$€]\s*לאדם",
-        r"(\d[\d,.]*)\s*[₪\$€]\s*לזוג",
-        r"(\d[\d,.]*)\s*[₪\$€]\s*לחדר",
-        r"(\d[\d,.]*)\s*\$",  # 4,125 $
-        r"(\d[\d,.]*)\s*[₪\$€]",
-        r"[₪\$€]\s*(\d[\d,.]*)",
-        r"(?:מ|מ-)\s*(\d[\d,.]*)\s*(?:₪|\$|שקל)",
-    ]
-    for p in patterns:
-        m = re.search(p, text.replace(",", ""), re.IGNORECASE)
+    # התאמה ראשונה של כל תבנית לפי סדר העדיפות; הראשונה שבטווח סביר נבחרת
+    for m in _PRICE_RULES.matches(text.replace(",", ""), "price"):
         if m:
             try:
                 num = float(m.group(1).replace(",", "").replace(" ", ""))
@@ -203,98 +233,235 @@ def extract_price_from_text(text):
     return None
 
 
-def extract_price_from_html(soup):
-    """חילוץ מחיר מאלמנטים ב-HTML (טבלאות מחירים, class מחיר)."""
-    if not soup:
+def _plausible_price(raw):
+    """מחיר בטווח סביר (100–500,000) כמחרוזת של מספר שלם, או None."""
+    try:
+        num = float(raw)
+    except ValueError:
         return None
+    if 100 < num < 500000:
+        return str(int(num))
+    return None
+
+
+def price_candidates_from_html(soup):
+    """מועמדי מחיר מה-HTML לפי עוצמת הראיה – (price, evidence), הכי חזק ראשון (גנרטור):
+    "currency" – תא/אלמנט (td/th/span/div) שהטקסט שלו מכיל $ או ₪ ומספר (טבלת מחירים, "4,125 $");
+    "price_class" / "price_id" – אלמנט שה-class / id שלו מצביע על מחיר (price, מחיר, amount, תמחור);
+    "price_label" – הטקסט סביב "מחיר" / "החל מ" / מטבע.
+    באותה דרגה – לפי סדר ההופעה בדף (אלמנט חיצוני לפני הפנימיים שבו). העץ נסרק פעם אחת (DomTextIndex)."""
+    if not soup:
+        return
+    index = DomTextIndex(soup, symbols="$₪")
     # טבלת מחירים: תא שמכיל $ ומספר (למשל "4,125 $")
-    for cell in soup.find_all(["td", "th", "span", "div"]):
-        t = cell.get_text(strip=True)
-        if "$" in t or "₪" in t:
-            m = re.search(r"(\d[\d,.]*)\s*[₪\$]|[₪\$]\s*(\d[\d,.]*)", t)
+    for el in index.elements:
+        if el.name in PRICE_CELL_TAGS and index.has_symbol(el):
+            m = index.search(_PRICE_CELL_PATTERN, el)
             if m:
-                raw = (m.group(1) or m.group(2) or "").replace(",", "")
-                try:
-                    num = float(raw)
-                    if 100 < num < 500000:
-                        return str(int(num))
-                except ValueError:
-                    pass
+                price = _plausible_price((m.group(1) or m.group(2) or "").replace(",", ""))
+                if price:
+                    yield price, "currency"
     for attr in ["class", "id"]:
-        for tag in soup.find_all(attrs={attr: re.compile(r"price|מחיר|amount|תמחור", re.I)}):
-            t = tag.get_text(strip=True)
-            m = re.search(r"(\d[\d,.]*)", t.replace(",", ""))
+        for el in index.elements:
+            value = el.tag.get(attr)
+            if isinstance(value, list):
+                value = " ".join(value)
+            if not value or not _PRICE_ATTR_PATTERN.search(value):
+                continue
+            m = index.search_nocomma(_PRICE_NUMBER_PATTERN, el)
             if m:
-                try:
-                    num = float(m.group(1).replace(",", ""))
-                    if 100 < num < 500000:
-                        return str(int(num))
-                except ValueError:
-                    pass
-    for tag in soup.find_all(string=re.compile(r"מחיר|החל\s*מ|₪|\$\s*\d")):
-        parent = tag.parent
-        if parent:
-            t = parent.get_text(separator=" ", strip=True)
-            price = extract_price_from_text(t)
-            if price:
-                return price
+                price = _plausible_price(m.group(1))
+                if price:
+                    yield price, f"price_{attr}"
+    labels = {}
+    for node in index.string_nodes:
+        parent = node.parent
+        if parent is None or not _PRICE_LABEL_PATTERN.search(node):
+            continue
+        if id(parent) not in labels:
+            el = index.element(parent)
+            text = index.spaced_text(el) if el is not None else parent.get_text(separator=" ", strip=True)
+            labels[id(parent)] = extract_price_from_text(text)
+        if labels[id(parent)]:
+            yield labels[id(parent)], "price_label"
+
+
+def extract_price_from_html(soup):
+    """חילוץ מחיר מאלמנטים ב-HTML (טבלאות מחירים, class מחיר) – המועמד החזק ביותר."""
+    for price, _ in price_candidates_from_html(soup):
+        return price
     return None
 
 
 def fetch_page_playwright(url, timeout=30000):
     """טעינת דף עם Playwright (או requests כגיבוי) והחזרת HTML."""
-    if sync_playwright and stealth_sync:
+    if _ASYNC_CRAWLER is not None:
+        return _ASYNC_CRAWLER.fetch(url, timeout=timeout, ready="listing")
+    if playwright_available():
         return _fetch_playwright(url, timeout)
-    if requests:
-        try:
-            r = requests.get(url, timeout=timeout // 1000, headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0"})
-            r.raise_for_status()
-            return r.text, None
-        except Exception as e:
-            return None, str(e)
-    return None, "playwright or requests not installed"
+    html, err, _ = http_get(url, timeout)
+    if err:
+        return None, err
+    return html, None
 
 
 def _fetch_playwright(url, timeout=30000):
-    """טעינת דף עם Playwright."""
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context(
-            viewport={"width": 1920, "height": 1080},
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-            locale="he-IL",
-        )
-        page = context.new_page()
-        stealth_sync(page)
-        try:
-            page.goto(url, wait_until="domcontentloaded", timeout=timeout)
-            # המתנה לתפריט/ניווט (רשימת היעדים) שיטען
-            time.sleep(5)
-            try:
-                page.wait_for_selector("a[href*='tarbutu']", timeout=6000)
-            except Exception:
-                pass
-            content = page.content()
-            browser.close()
-            return content, None
-        except Exception as e:
-            try:
-                browser.close()
-            except Exception:
-                pass
-            return None, str(e)
+    """טעינת דף עם Playwright – דף מהמאגר המשותף של הריצה (בלי הפעלת Chromium חדש לכל דף)."""
+    if _BROWSER_POOL is not None:
+        return _fetch_from_pool(_BROWSER_POOL, url, timeout)
+    try:
+        with BrowserPool(max_idle=0, blocker=ResourceBlocker()) as pool:
+            return _fetch_from_pool(pool, url, timeout)
+    except Exception as e:
+        return None, str(e)
+
+
+def _fetch_from_pool(pool, url, timeout=30000):
+    """טעינת דף בדף שמושאל מהמאגר."""
+    try:
+        with pool.page() as page:
+            # המתנה לכרטיסי ההפלגות/תפריט היעדים (עד התקרה של דף רשימה)
+            return _fetch_with_page(page, url, timeout=timeout, ready="listing")
+    except Exception as e:
+        return None, str(e)
+
+
+def _throttle(url):
+    """ממתין לאסימון של ה-host (token bucket) לפני בקשה."""
+    if _RATE_LIMITER is not None:
+        _RATE_LIMITER.acquire(url)
 
 
-def _fetch_with_page(page, url, timeout=20000):
-    """טעינת דף עם דף Playwright קיים (לסריקה פנימית)."""
+def _fetch_with_page(page, url, timeout=20000, ready="inner"):
+    """טעינת דף עם דף Playwright קיים (לסריקה פנימית). ממשיכים ברגע שהדף מוכן (ready – סוג הדף)."""
+    _throttle(url)
     try:
         page.goto(url, wait_until="domcontentloaded", timeout=timeout)
-        time.sleep(1.5)
+    except Exception as e:
+        # שגיאת ניווט (timeout וכו') – הדף עצמו תקין וחוזר למאגר
+        return None, str(e)
+    try:
+        wait_until_ready(page, ready)
         return page.content(), None
     except Exception as e:
         return None, str(e)
 
 
+def _browser_available():
+    """האם יש דפדפן לריצה הנוכחית (מאגר סינכרוני או מנוע אסינכרוני)."""
+    if _ARCHIVE is not None and _ARCHIVE.replaying:
+        # בהשמעה – אם בריצה המוקלטת היה דפדפן
+        return _ARCHIVE.browser
+    return _BROWSER_POOL is not None or _ASYNC_CRAWLER is not None
+
+
+def _fetch_batch(urls, timeout=15000, inner=False, complete=None):
+    """טעינת רשימת דפים; מחזיר [(html, err)] לפי סדר urls.
+    עם טעינה מדורגת – קודם HTTP, ורק דפים ש-complete(html) שלילי עבורם (או חסימה/שגיאה) עוברים לדפדפן.
+    inner=True – עמודי קרוז פנימיים (המתנה קצרה, בלי המתנה לתפריט)."""
+    if _TIERED_FETCHER is not None:
+        browser_fetch_all = None
+        if _browser_available():
+            browser_fetch_all = lambda us: _browser_fetch_batch(us, timeout=timeout, inner=inner)
+        return _TIERED_FETCHER.fetch_all(urls, timeout=timeout, complete=complete, browser_fetch_all=browser_fetch_all,
+                                         page_class="inner" if inner else "listing")
+    return _browser_fetch_batch(urls, timeout=timeout, inner=inner)
+
+
+def _fetch_one(url, timeout=30000, complete=None):
+    """טעינת דף רשימה אחד (מדורגת, כמו _fetch_batch). מחזיר (html, err)."""
+    return _fetch_batch([url], timeout=timeout, complete=complete)[0]
+
+
+def _parse_listing_page(url, html):
+    """דף רשימה/יעד -> רשימת הכרטיסים שבו (לשלבים עם יומן נקודות ביקורת)."""
+    return parse_tarbutu_cruises(html, url)
+
+
+def _parse_frontier_page(url, html):
+    """דף מהגילוי הגיבוי -> הכרטיסים שבו והקישורים ממנו (לרמת העומק הבאה)."""
+    return {
+        "cruises": parse_tarbutu_cruises(html, url),
+        "links": extract_tarbutu_links_by_source(html, url),
+    }
+
+
+def _fetch_stage(journal, stage, urls, parse, keys=None, timeout=15000, inner=False, complete=None, deadline=None):
+    """טעינה + פרסור של שלב שלם, עם יומן נקודות ביקורת. מחזיר [(result, err)] לפי סדר urls,
+    כאשר result = parse(key, html) (ברירת מחדל key = url; חייב להיות ניתן לשמירה כ-JSON).
+    כתובת שכבר הושלמה ביומן (--resume) לא נטענת שוב; השאר נטענות באצוות, וכל אצווה נרשמת מיד בסיומה.
+    deadline (time.monotonic) – אחריו לא מתחילים אצווה חדשה; מה שנשאר מקבל (None, INNER_BUDGET_ERROR)."""
+    urls = list(urls)
+    keys = list(keys) if keys is not None else urls
+    results = [None] * len(urls)
+    todo = []
+    for i, (url, key) in enumerate(zip(urls, keys)):
+        done = journal.get(stage, key) if journal is not None else None
+        if done is not None:
+            results[i] = (done, None)
+        else:
+            todo.append(i)
+    chunk_size = journal.chunk_size if journal is not None else DEFAULT_CHUNK_SIZE
+    for start in range(0, len(todo), chunk_size):
+        chunk = todo[start:start + chunk_size]
+        if deadline is not None and time.monotonic() >= deadline:
+            for i in todo[start:]:
+                results[i] = (None, INNER_BUDGET_ERROR)
+            break
+        pages = _fetch_batch([urls[i] for i in chunk], timeout=timeout, inner=inner, complete=complete)
+        for i, (html, err) in zip(chunk, pages):
+            if err:
+                results[i] = (None, err)
+                continue
+            result = parse(keys[i], html)
+            results[i] = (result, None)
+            if journal is not None:
+                journal.record(stage, keys[i], result)
+        if journal is not None:
+            journal.flush()
+    return results
+
+
+def _browser_fetch_batch(urls, timeout=15000, inner=False):
+    """טעינת רשימת דפים בדפדפן; מחזיר [(html, err)] לפי סדר urls.
+    במצב async – במקביל דרך המנוע (מגבלה לכל host); אחרת אחד אחרי השני.
+    הקצב נקבע ב-token bucket לכל host (לא בהשהיה קבועה בין דפים)."""
+    urls = list(urls)
+    if _ARCHIVE is not None and _ARCHIVE.replaying:
+        return _ARCHIVE.replay_pages(urls)
+    started = time.monotonic()
+    if _ASYNC_CRAWLER is not None:
+        out = _ASYNC_CRAWLER.fetch_all(urls, timeout=timeout, ready="inner" if inner else "listing")
+    elif inner and _INNER_CRAWLER is not None:
+        out = _INNER_CRAWLER.fetch_all(urls, timeout=timeout, ready="inner")
+    else:
+        out = []
+        for url in urls:
+            page_started = time.monotonic()
+            if _RETRY_POLICY is not None:
+                result = _RETRY_POLICY.call(url, lambda: _browser_fetch_one(url, timeout=timeout, inner=inner))
+            else:
+                result = _browser_fetch_one(url, timeout=timeout, inner=inner)
+            out.append(result)
+            if _ARCHIVE is not None:
+                _ARCHIVE.record_page(url, result[0], result[1], elapsed=time.monotonic() - page_started)
+        return out
+    if _ARCHIVE is not None and urls:
+        # אצווה מקבילית – נרשם הזמן הממוצע לדף
+        elapsed = (time.monotonic() - started) / len(urls)
+        for url, (html, err) in zip(urls, out):
+            _ARCHIVE.record_page(url, html, err, elapsed=elapsed)
+    return out
+
+
+def _browser_fetch_one(url, timeout=15000, inner=False):
+    """ניסיון טעינה אחד בדפדפן (סינכרוני). מחזיר (html, err)."""
+    if inner and _BROWSER_POOL is not None:
+        with _BROWSER_POOL.page() as page:
+            return _fetch_with_page(page, url, timeout=timeout)
+    return fetch_page_playwright(url, timeout=timeout)
+
+
 def extract_dates_from_text(text):
     """מחלץ מהטקסט כל תאריכי יציאה/הפלגה (עברית ומספרים)."""
     if not text:
@@ -319,104 +486,139 @@ def extract_dates_from_text(text):
     return unique[:15]
 
 
-def parse_price_table_from_inner_page(html, base_cruise):
+def _soup_table_rows(table):
+    """שורות טבלת BeautifulSoup כ-TableRow (כמו בפרסור הזורם)."""
+    return [TableRow(tr.get_text(separator=" ", strip=True), [cell.get_text(strip=True) for cell in tr.find_all(["th", "td"])])
+            for tr in table.find_all("tr")]
+
+
+def _price_table_cruises(rows, base_cruise):
+    """קרוז לכל שורה בטבלת מחירים/יציאות (רשימה ריקה אם הטבלה לא כזו)."""
+    cruises = []
+    if len(rows) < 2:
+        return cruises
+    header_text = rows[0].text
+    if "מחיר" not in header_text and "יציאה" not in header_text and "חדר" not in header_text and "$" not in header_text:
+        return cruises
+    header_cells = rows[0].cells
+    date_col = None
+    price_col = None
+    for i, t in enumerate(header_cells):
+        if "יציאה" in t or "תאריך" in t:
+            date_col = i
+        if "חדר" in t and "פנימי" in t:
+            price_col = i
+        if "$" in t or "מחיר" in t:
+            if price_col is None:
+                price_col = i
+    if date_col is None:
+        date_col = 0
+    if price_col is None:
+        for i, t in enumerate(header_cells):
+            if "$" in t:
+                price_col = i
+                break
+    for row in rows[1:]:
+        cells = row.cells
+        if len(cells) <= max(date_col or 0, price_col or 0):
+            continue
+        date_display = cells[date_col] if date_col is not None else ""
+        price_raw = cells[price_col] if price_col is not None else ""
+        price = None
+        m = re.search(r"(\d[\d,.]*)\s*\$|\$\s*(\d[\d,.]*)", price_raw)
+        if m:
+            raw = (m.group(1) or m.group(2) or "").replace(",", "")
+            try:
+                num = float(raw)
+                if 100 < num < 500000:
+                    price = str(int(num))
+            except ValueError:
+                pass
+        # גם 14.6.26 (נקודות) – parse_date מזהה אותו כשאין חודש בצורה אחרת
+        parsed = parse_date(date_display) if date_display else None
+        if not date_display and not price:
+            continue
+        c = {
+            "source": base_cruise.get("source", "תרבותו"),
+            "title": (base_cruise.get("title") or "")[:300],
+            "ship": base_cruise.get("ship"),
+            "ship_normalized": base_cruise.get("ship_normalized") or "",
+            "date_display": (date_display[:80] if date_display else base_cruise.get("date_display") or ""),
+            "date_norm": parsed.norm if parsed else base_cruise.get("date_norm"),
+            "date_start": parsed.isoformat() if parsed else base_cruise.get("date_start"),
+            "date_end": parsed.end.isoformat() if parsed and parsed.end else None,
+            "price": price or base_cruise.get("price"),
+            "url": base_cruise.get("url"),
+        }
+        cruises.append(c)
+    return cruises
+
+
+def parse_price_table_from_inner_page(html, base_cruise, stream=None):
     """מפרסר טבלת מחירים ותאריכים בעמוד קרוז. כל שורה = קרוז (הפלגה) נפרד.
-    מחזיר רשימת קרוזים: אם נמצאה טבלה עם כמה שורות – קרוז לכל שורה; אחרת רשימה ריקה."""
+    מחזיר רשימת קרוזים: אם נמצאה טבלה עם כמה שורות – קרוז לכל שורה; אחרת רשימה ריקה.
+    stream=True (ברירת המחדל כש-lxml מותקן, ראו main(inner_parse=...)) – פרסור זורם, בלי עץ BeautifulSoup:
+    השורות מכל טבלאות המחירים באזור התוכן (<main> / <article>) של טבלת המחירים הראשונה (טבלת יציאות לכל
+    שנה / סוג חדר), והפרסור נעצר כשהאזור נסגר; stream=False – כל הטבלאות בדף, מעץ BeautifulSoup מלא."""
     if not html or not base_cruise:
         return []
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style"]):
-        tag.decompose()
+    if stream is None:
+        stream = _STREAM_INNER_PAGES
+    # הזרימה היא של lxml – רק כשגם העץ המלא נבנה ב-lxml, כך ששני המסלולים רואים אותו מבנה
     cruises = []
-    for table in soup.find_all("table"):
-        rows = table.find_all("tr")
-        if len(rows) < 2:
-            continue
-        header_text = rows[0].get_text(separator=" ", strip=True)
-        if "מחיר" not in header_text and "יציאה" not in header_text and "חדר" not in header_text and "$" not in header_text:
-            continue
-        header_cells = rows[0].find_all(["th", "td"])
-        date_col = None
-        price_col = None
-        for i, cell in enumerate(header_cells):
-            t = cell.get_text(strip=True)
-            if "יציאה" in t or "תאריך" in t:
-                date_col = i
-            if "חדר" in t and "פנימי" in t:
-                price_col = i
-            if "$" in t or "מחיר" in t:
-                if price_col is None:
-                    price_col = i
-        if date_col is None:
-            date_col = 0
-        if price_col is None:
-            for i, cell in enumerate(header_cells):
-                if "$" in cell.get_text():
-                    price_col = i
+    if isinstance(html, str) and stream and stream_available() and parser_backend_info()["tree"] == "lxml":
+        for rows in stream_tables(html):
+            if rows is SECTION_END:
+                if cruises:
                     break
-        for tr in rows[1:]:
-            cells = tr.find_all(["td", "th"])
-            if len(cells) <= max(date_col or 0, price_col or 0):
                 continue
-            date_display = cells[date_col].get_text(strip=True) if date_col is not None else ""
-            price_raw = cells[price_col].get_text(strip=True) if price_col is not None else ""
-            price = None
-            m = re.search(r"(\d[\d,.]*)\s*\$|\$\s*(\d[\d,.]*)", price_raw)
-            if m:
-                raw = (m.group(1) or m.group(2) or "").replace(",", "")
-                try:
-                    num = float(raw)
-                    if 100 < num < 500000:
-                        price = str(int(num))
-                except ValueError:
-                    pass
-            date_norm = parse_hebrew_date(date_display) if date_display else None
-            if not date_norm and date_display and re.search(r"\d{1,2}\s*[./]\s*\d{1,2}\s*[./]\s*\d{2,4}", date_display):
-                dm = re.search(r"(\d{1,2})\s*[./]\s*(\d{1,2})\s*[./]\s*(\d{2,4})", date_display)
-                if dm:
-                    d, mo, y = int(dm.group(1)), int(dm.group(2)), int(dm.group(3))
-                    if y < 100:
-                        y = 2000 + y if y < 50 else 1900 + y
-                    if 1 <= mo <= 12:
-                        date_norm = (y, mo)
-            if not date_display and not price:
-                continue
-            c = {
-                "source": base_cruise.get("source", "תרבותו"),
-                "title": (base_cruise.get("title") or "")[:300],
-                "ship": base_cruise.get("ship"),
-                "ship_normalized": base_cruise.get("ship_normalized") or "",
-                "date_display": (date_display[:80] if date_display else base_cruise.get("date_display") or ""),
-                "date_norm": date_norm or base_cruise.get("date_norm"),
-                "price": price or base_cruise.get("price"),
-                "url": base_cruise.get("url"),
-            }
-            cruises.append(c)
+            cruises.extend(_price_table_cruises(rows, base_cruise))
+        return cruises
+    for table in parsed_page(html).tables:
+        cruises.extend(_price_table_cruises(_soup_table_rows(table), base_cruise))
     return cruises
 
 
+@lru_cache(maxsize=16)
+def _inner_page_facts(html):
+    """מחיר / אונייה / תאריכים מעמוד פנימי – מחושב פעם אחת לכל תוכן דף (מסעות: אותו דף לכל הקרוזים)."""
+    page = parsed_page(html)
+    text = page.text
+    # מחיר מהנתונים המובנים (JSON-LD / OpenGraph) לפני החיפוש בטקסט ובעץ
+    price = next((r.price for r in structured_records(page) if r.price), None)
+    if not price:
+        price = extract_price_from_text(text)
+    if not price:
+        price = extract_price_from_html(page.soup)
+    return {
+        "price": price,
+        "ship": extract_ship_from_title(text[:4000]),
+        "dates": tuple(extract_dates_from_text(text)),
+    }
+
+
+def inner_page_enrichment(html):
+    """שדות ההעשרה מעמוד פנימי (price, ship, dates_from_page) – dict שאפשר לשמור ביומן."""
+    if not html:
+        return {}
+    facts = _inner_page_facts(parsed_page(html).html)
+    return {"price": facts["price"], "ship": facts["ship"], "dates_from_page": list(facts["dates"])}
+
+
+def apply_inner_enrichment(cruise, enrichment):
+    """מעדכן קרוז משדות ההעשרה: מחיר ואונייה רק כשחסרים בכרטיס, תאריכי העמוד כשנמצאו. שאר השדות לא נוגעים."""
+    if not cruise.get("price") and enrichment.get("price"):
+        cruise["price"] = enrichment["price"]
+    if not cruise.get("ship") and enrichment.get("ship"):
+        cruise["ship"] = enrichment["ship"]
+        cruise["ship_normalized"] = normalize_ship(enrichment["ship"])
+    if enrichment.get("dates_from_page"):
+        cruise["dates_from_page"] = list(enrichment["dates_from_page"])
+
+
 def enrich_cruise_from_inner_page(html, cruise):
     """מעדכן קרוז עם מחיר/אונייה/תאריכים מעמוד הפנימי."""
-    if not html:
-        return
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style"]):
-        tag.decompose()
-    text = soup.get_text(separator=" ", strip=True)
-    if not cruise.get("price"):
-        price = extract_price_from_text(text)
-        if not price:
-            price = extract_price_from_html(soup)
-        if price:
-            cruise["price"] = price
-    if not cruise.get("ship"):
-        ship = extract_ship_from_title(text[:4000])
-        if ship:
-            cruise["ship"] = ship
-            cruise["ship_normalized"] = normalize_ship(ship)
-    dates = extract_dates_from_text(text)
-    if dates:
-        cruise["dates_from_page"] = dates
+    apply_inner_enrichment(cruise, inner_page_enrichment(html))
 
 
 def _is_cruise_link(href):
@@ -438,7 +640,8 @@ def _is_cruise_link(href):
 
 
 def _normalize_url_for_dedup(url):
-    """נרמול URL להשוואה (ללא סלאש בסוף)."""
+    """נרמול URL להשוואה (ללא סלאש בסוף). הנתיב מקודד מחדש בצורה אחת – %d7%a7 של וורדפרס, %D7%A7 של quote
+    ועברית לא מקודדת הם אותו מפתח (גם למטמון ולזיכרון של הטעינה)."""
     if not url:
         return ""
     u = url.strip().rstrip("/")
@@ -447,7 +650,7 @@ def _normalize_url_for_dedup(url):
         netloc = parsed.netloc.lower()
         if netloc.startswith("www."):
             netloc = netloc[4:]
-        path = (parsed.path or "/").rstrip("/") or "/"
+        path = quote(unquote(parsed.path or "/"), safe=_PATH_SAFE_CHARS).rstrip("/") or "/"
         return (parsed.scheme or "https") + "://" + netloc + path
     except Exception:
         return u.rstrip("/")
@@ -461,31 +664,28 @@ def build_destination_url(name):
     return (TARBUTU_BASE.rstrip("/") + "/" + quote(slug, safe="") + "/").replace("%2F", "/")
 
 
-def count_date_blocks(html):
-    """מחזיר כמה מופעי תאריך (X ימים/לילות) – לזיהוי דף רשימה."""
-    if not html:
-        return 0
+def _date_block_positions(page):
+    """מיקומי כרטיסי הקרוזים ב-HTML: כל מופע "ימים"/"לילות" שבהקשר שלו (60 תווים לפני, 50 אחרי) יש תבנית
+    תאריך, ממוזגים כשהם קרובים (עד 100 תווים). הטקסט של ההקשר נשלף מאינדקס הדף – בלי לפרסר כל חלון מחדש."""
+    index = page.source
     date_positions = []
-    for needle in ["ימים", "לילות"]:
-        idx = 0
-        while True:
-            idx = html.find(needle, idx)
-            if idx < 0:
-                break
-            chunk = html[max(0, idx - 60):idx + 50]
-            try:
-                chunk_text = BeautifulSoup(chunk, "html.parser").get_text(separator=" ", strip=True)
-            except Exception:
-                chunk_text = ""
-            if DATE_LINE_PATTERN.search(chunk_text):
-                date_positions.append(max(0, idx - 60))
-            idx += 1
+    for idx, _ in DURATION_SCANNER.hits(page.html):
+        start = max(0, idx - 60)
+        if DATE_LINE_PATTERN.search(index.text(start, idx + 50)):
+            date_positions.append(start)
     date_positions.sort()
     merged = []
     for p in date_positions:
         if not merged or p - merged[-1] > 100:
             merged.append(p)
-    return len(merged)
+    return merged
+
+
+def count_date_blocks(html):
+    """מחזיר כמה מופעי תאריך (X ימים/לילות) – לזיהוי דף רשימה."""
+    if not html:
+        return 0
+    return len(_date_block_positions(parsed_page(html)))
 
 
 def extract_all_tarbutu_links(html, base_url):
@@ -493,9 +693,8 @@ def extract_all_tarbutu_links(html, base_url):
     out = set()
     if not html:
         return out
-    soup = BeautifulSoup(html, "html.parser")
-    for a in soup.find_all("a", href=True):
-        href = a.get("href", "").strip()
+    for href in parsed_page(html).hrefs:
+        href = href.strip()
         if not _is_cruise_link(href):
             continue
         if not href.startswith("http"):
@@ -510,7 +709,7 @@ def extract_tarbutu_category_links(html, base_url):
     out = set()
     if not html:
         return out
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parsed_page(html).soup
     # אלמנטים שבדרך כלל מכילים תפריט קטגוריות
     menu_roots = []
     menu_roots.extend(soup.find_all("nav"))
@@ -534,13 +733,40 @@ def extract_tarbutu_category_links(html, base_url):
     return out
 
 
+def extract_tarbutu_links_by_source(html, base_url):
+    """כל הקישורים לתרבותו בדף, עם מקור: menu (תפריט/ניווט), heading (בתוך כותרת), body (שאר הדף).
+    מחזיר [(כתובת מנורמלת, source)] לפי סדר ההופעה; קישור שמופיע בכמה מקומות – המקור החזק ביותר."""
+    if not html:
+        return []
+    page = parsed_page(html)
+    menu_links = extract_tarbutu_category_links(page, base_url)
+    rank = {"menu": 0, "heading": 1, "body": 2}
+    found = {}
+    for a in page.links:
+        href = a.get("href", "").strip()
+        if not _is_cruise_link(href):
+            continue
+        if not href.startswith("http"):
+            href = urljoin(base_url, href)
+        n = _normalize_url_for_dedup(href)
+        if n in menu_links:
+            source = "menu"
+        elif a.find_parent(["h1", "h2", "h3", "h4"]):
+            source = "heading"
+        else:
+            source = "body"
+        if n not in found or rank[source] < rank[found[n]]:
+            found[n] = source
+    return list(found.items())
+
+
 def extract_tarbutu_destination_links(html, base_url):
     """מחלץ את רשימת היעדים הרשמית – קישורים שמובילים לדף יעד (כל לחיצה = דף עם רשימת תאריכי הפלגות).
     מחזיר רשימה של (url_normalized, title) – רק קישורים עם טקסט קצר (שם יעד, לא כותרת קרוז)."""
     out = []
     if not html:
         return out
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parsed_page(html).soup
     menu_roots = []
     menu_roots.extend(soup.find_all("nav"))
     menu_roots.extend(soup.find_all(attrs={"role": "navigation"}))
@@ -573,9 +799,7 @@ def extract_destination_links_from_cruises_page(html, base_url):
     out = []
     if not html:
         return out
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style"]):
-        tag.decompose()
+    soup = parsed_page(html).soup
     # מצא כל כותרות h2/h3 בתוכן הראשי
     main = soup.find("main") or soup.find(attrs={"class": re.compile(r"content|main|entry", re.I)}) or soup.body
     if not main:
@@ -621,61 +845,151 @@ def extract_destination_links_from_cruises_page(html, base_url):
     return out
 
 
+def _wp_match_key(url):
+    """מפתח להשוואת כתובות מוורדפרס לכתובות שלנו (וורדפרס מקודד %d7 באותיות קטנות, quote – בגדולות)."""
+    return unquote(_normalize_url_for_dedup(url)).lower()
+
+
+def select_wp_destinations(pages):
+    """מתוך דפי וורדפרס (REST / sitemap) – דפי היעד של קרוזים ושל שייט נהרות: [(url, title)], [(url, title)].
+    יעד = דף-בן של דף הקרוזים / שייט הנהרות (REST), או דף שהכתובת או הכותרת שלו היא שם יעד מהרשימה."""
+    by_key = {_wp_match_key(p["url"]): p for p in pages}
+    cruises_page = by_key.get(_wp_match_key(TARBUTU_CRUISES_URL)) or {}
+    river_page = by_key.get(_wp_match_key(TARBUTU_RIVER_CRUISES_URL)) or {}
+    names_by_key = {_wp_match_key(build_destination_url(n)): n for n in ALL_CRUISE_DESTINATION_NAMES}
+    names = set(ALL_CRUISE_DESTINATION_NAMES)
+    seen = {_wp_match_key(TARBUTU_CRUISES_URL), _wp_match_key(TARBUTU_RIVER_CRUISES_URL)}
+    destinations = []
+    river = []
+    for p in pages:
+        k = _wp_match_key(p["url"])
+        if k in seen or not _is_cruise_link(p["url"]):
+            continue
+        parent = p.get("parent")
+        title = names_by_key.get(k) or p.get("title") or k.rsplit("/", 1)[-1].replace("-", " ")
+        if parent and parent == river_page.get("id"):
+            river.append((_normalize_url_for_dedup(p["url"]), title))
+        elif (parent and parent == cruises_page.get("id")) or k in names_by_key or p.get("title") in names:
+            destinations.append((_normalize_url_for_dedup(p["url"]), title))
+        else:
+            continue
+        seen.add(k)
+    return destinations, river
+
+
+def _unique(cruises, key):
+    """הקרוזים בלי כפילויות לפי key(cruise), לפי סדר ההופעה."""
+    seen = set()
+    unique = []
+    for c in cruises:
+        k = key(c)
+        if k in seen:
+            continue
+        seen.add(k)
+        unique.append(c)
+    return unique
+
+
+def _structured_cruises(page, base_url, source, link_ok=None):
+    """קרוזים מהנתונים המובנים של הדף (JSON-LD, microdata, JSON מוטמע, OpenGraph) – רק רשומות עם תאריך וקישור
+    משלהן (רשומה בלי קישור הייתה מקבלת את כתובת דף הרשימה עצמו). link_ok(url) – רק קישורים שעוברים אותו."""
+    cruises = []
+    for r in structured_records(page):
+        if r.date is None or not r.url:
+            continue
+        url = urljoin(base_url, r.url)
+        if link_ok is not None and not link_ok(url):
+            continue
+        title = r.title or ""
+        ship = r.ship or extract_ship_from_title(title)
+        cruises.append({
+            "source": source,
+            "title": title[:300],
+            "ship": ship,
+            "ship_normalized": normalize_ship(ship) if ship else "",
+            "date_display": (r.date_text or "")[:80],
+            **_date_fields(r.date),
+            "price": r.price,
+            "currency": r.currency,
+            "url": url,
+        })
+    return cruises
+
+
+def _card_spans(index, date_positions, length):
+    """פונקציה: מיקום קישור -> (start, end) של הכרטיס שלו בלבד, לטביעת האצבע. החלון של החילוץ רחב ונכנס
+    לכרטיסים השכנים – שינוי בשכן לא צריך לחייב סריקה מחדש של העמוד הפנימי. כל כרטיס מתחיל בבלוק התאריך, או –
+    כשהכותרת מעל התאריך (קישור קרוז לפני התאריך הראשון) – בקישור הקרוז שלפני התאריך, ונגמר בתחילת הכרטיס הבא;
+    הכרטיס האחרון – באורך של זה שלפניו."""
+    links = [(link.tag_start, link.href) for link in index.links(0, length) if _is_cruise_link(link.href)]
+    starts = list(date_positions)
+    if links and date_positions and links[0][0] < date_positions[0]:
+        offsets = [offset for offset, _ in links]
+        starts = []
+        for prev, pos in zip([-1] + date_positions, date_positions):
+            # הקישור האחרון לפני התאריך (ותמונה + כותרת לאותה כתובת – מהראשון שבהם), לא התפריט שמעל
+            i = bisect_right(offsets, pos) - 1
+            if i < 0 or offsets[i] <= prev:
+                continue
+            while i > 0 and offsets[i - 1] > prev and links[i - 1][1] == links[i][1]:
+                i -= 1
+            starts.append(offsets[i])
+
+    def span(offset):
+        # קישור שאינו בתוך כרטיס (תפריט מעל, פוטר מתחת) – הטקסט שלו עד הכרטיס הראשון / סוף הדף
+        i = bisect_right(starts, offset) - 1
+        if i < 0:
+            return offset, starts[0] if starts else min(length, offset + 3000)
+        if i + 1 < len(starts):
+            return starts[i], starts[i + 1]
+        end = min(length, starts[i] + (starts[i] - starts[i - 1] if i > 0 else 3000))
+        return (starts[i], end) if offset < end else (offset, length)
+    return span
+
+
 def parse_tarbutu_cruises(html, base_url):
     """מפרסר דף רשימת קרוזים של תרבותו ומחזיר רשימת קרוזים.
-    מחפשים כל מופע של תבנית תאריך ב-HTML, ולוקחים קישורים רק באזור שבין תאריך לתאריך."""
-    cruises = []
+    קודם נתונים מובנים (JSON-LD וכו'); כשיש בדף יותר כרטיסי תאריך מרשומות מובנות (או אין כאלה) – גם
+    מחפשים כל מופע של תבנית תאריך ב-HTML, ולוקחים קישורים רק באזור שבין תאריך לתאריך; הרשומות המובנות קודמות."""
     if not html:
-        return cruises
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style"]):
-        tag.decompose()
-    text = soup.get_text(separator=" ", strip=True)
+        return []
+    page = parsed_page(html)
+    html = page.html
 
-    # מוצאים כל מופעי "X ימים" או "X לילות" ב-HTML (חיפוש "ימים"/"לילות" ואז בדיקה שההקשר תאריך)
-    date_positions = []
-    for needle in ["ימים", "לילות"]:
-        idx = 0
-        while True:
-            idx = html.find(needle, idx)
-            if idx < 0:
-                break
-            chunk = html[max(0, idx - 60):idx + 50]
-            chunk_text = BeautifulSoup(chunk, "html.parser").get_text(separator=" ", strip=True)
-            if DATE_LINE_PATTERN.search(chunk_text):
-                date_positions.append(max(0, idx - 60))
-            idx += 1
-    date_positions.sort()
-    merged = []
-    for p in date_positions:
-        if not merged or p - merged[-1] > 100:
-            merged.append(p)
-    date_positions = merged
+    cruises = _structured_cruises(page, base_url, "תרבותו", link_ok=_is_cruise_link)
+    for c in cruises:
+        c["card_fingerprint"] = card_fingerprint(f"{c['url']} {c['title']} {c['date_display']} {c['price']}")
+
+    # מוצאים כל מופעי "X ימים" או "X לילות" ב-HTML (מופעי "ימים"/"לילות" ואז בדיקה שההקשר תאריך)
+    date_positions = _date_block_positions(page)
+    if cruises and len(cruises) >= len(date_positions):
+        return _unique(cruises, lambda c: (c.get("date_norm"), c.get("url")))
+    structured_count = len(cruises)
+    index = page.source
+    card_span = _card_spans(index, date_positions, len(html))
 
     # כרטיסים: התאריך יכול להיות מעל או מתחת לקישור – לוקחים חלון רחב כדי לתפוס את הקישור
     for i, pos in enumerate(date_positions):
         next_pos = date_positions[i + 1] if i + 1 < len(date_positions) else pos + 3000
         start = max(0, pos - 700)
         end = min(len(html), min(next_pos, pos + 2200) + 400)
-        fragment = html[start:end]
-        frag_soup = BeautifulSoup(fragment, "html.parser")
-        frag_text = frag_soup.get_text(separator=" ", strip=True)
+        frag_text = index.text(start, end)
         m = DATE_LINE_PATTERN.search(frag_text)
         if not m:
             continue
         date_snippet = m.group(0)
-        date_norm = parse_hebrew_date(date_snippet)
-        if not date_norm:
+        parsed = parse_date(date_snippet)
+        if not parsed:
             continue
-        for a in frag_soup.find_all("a", href=True):
-            href = a.get("href", "")
+        for link in index.links(start, end):
+            href = link.href
             if not _is_cruise_link(href):
                 continue
             if not href.startswith("http"):
                 href = urljoin(base_url, href)
             if not _is_cruise_link(href):
                 continue
-            title = a.get_text(strip=True)
+            title = index.link_text(link, end)
             if len(title) < 4:
                 continue
             ship = extract_ship_from_title(title)
@@ -686,13 +1000,14 @@ def parse_tarbutu_cruises(html, base_url):
                 "ship": ship,
                 "ship_normalized": normalize_ship(ship) if ship else "",
                 "date_display": date_snippet[:80],
-                "date_norm": date_norm,
+                **_date_fields(parsed),
                 "price": price,
                 "url": href,
+                "card_fingerprint": card_fingerprint(f"{href} {index.text(*card_span(link.tag_start))}"),
             })
 
-    if not cruises:
-        for a in soup.find_all("a", href=True):
+    if len(cruises) == structured_count:
+        for a in page.links:
             href = a.get("href", "")
             if not _is_cruise_link(href):
                 continue
@@ -711,8 +1026,8 @@ def parse_tarbutu_cruises(html, base_url):
                 m = DATE_LINE_PATTERN.search(block_text)
                 if m and len(block_text) > 80:
                     date_snippet = m.group(0)
-                    date_norm = parse_hebrew_date(date_snippet)
-                    if date_norm:
+                    parsed = parse_date(date_snippet)
+                    if parsed:
                         ship = extract_ship_from_title(title or block_text)
                         price = extract_price_from_text(block_text)
                         cruises.append({
@@ -721,39 +1036,58 @@ def parse_tarbutu_cruises(html, base_url):
                             "ship": ship,
                             "ship_normalized": normalize_ship(ship) if ship else "",
                             "date_display": date_snippet[:80],
-                            "date_norm": date_norm,
+                            **_date_fields(parsed),
                             "price": price,
                             "url": href,
+                            "card_fingerprint": card_fingerprint(f"{href} {block_text}"),
                         })
                     break
                 block = block.parent
 
-    seen = set()
-    unique = []
-    for c in cruises:
-        key = (c.get("date_norm"), c.get("url"))
-        if key in seen:
-            continue
-        seen.add(key)
-        unique.append(c)
-    return unique
+    return _unique(cruises, lambda c: (c.get("date_norm"), c.get("url")))
 
 
-def parse_massaot_cruises(html, base_url):
-    """מפרסר דף מסעות ומחלץ קרוזים (אונייה, תאריך, מחיר)."""
+def _massaot_adapter_cruises(page, base_url):
+    """קרוזים מכרטיסי מסעות לפי הסלקטורים של המתאם; שדה שהסלקטור לא מצא – regex על הטקסט של הכרטיס בלבד."""
+    adapter = adapter_for(MASSAOT_COMPANY)
+    if adapter is None:
+        return []
+    cruises = []
+    for card in adapter.cards(page, base_url):
+        date_snippet = card.date_text
+        parsed = card.date
+        if not parsed:
+            m = DATE_LINE_PATTERN.search(card.text)
+            if not m:
+                continue
+            date_snippet = m.group(0)
+            parsed = parse_date(date_snippet)
+            if not parsed:
+                continue
+        title = card.title or card.text
+        ship = card.ship or extract_ship_from_title(title) or extract_ship_from_title(card.text)
+        cruises.append({
+            "source": "מסעות",
+            "title": title[:200],
+            "ship": ship,
+            "ship_normalized": normalize_ship(ship) if ship else "",
+            "date_display": date_snippet[:80],
+            **_date_fields(parsed),
+            "price": card.price or extract_price_from_text(card.text),
+            "url": card.url or base_url,
+        })
+    return cruises
+
+
+def _massaot_text_cruises(raw, base_url):
+    """קרוזים מהטקסט של כל הדף: כל מופע של תבנית תאריך, והטקסט סביבו כבלוק (אונייה, מחיר)."""
     cruises = []
-    if not html:
-        return cruises
-    soup = BeautifulSoup(html, "html.parser")
-    for tag in soup(["script", "style"]):
-        tag.decompose()
-    raw = soup.get_text(separator=" ", strip=True)
 
     # תבנית סטנדרטית
     for m in DATE_LINE_PATTERN.finditer(raw):
         date_snippet = m.group(0)
-        date_norm = parse_hebrew_date(date_snippet)
-        if not date_norm:
+        parsed = parse_date(date_snippet)
+        if not parsed:
             continue
         start = max(0, m.start() - 400)
         end = min(len(raw), m.end() + 600)
@@ -766,7 +1100,7 @@ def parse_massaot_cruises(html, base_url):
             "ship": ship,
             "ship_normalized": normalize_ship(ship) if ship else "",
             "date_display": date_snippet[:80],
-            "date_norm": date_norm,
+            **_date_fields(parsed),
             "price": price,
             "url": base_url,
         })
@@ -776,8 +1110,8 @@ def parse_massaot_cruises(html, base_url):
         flex = re.compile(r"(\d+)\s*(?:ימים|לילות)\s*[-–]?\s*([^\d]{2,30}?\d{4})")
         for m in flex.finditer(raw):
             date_snippet = m.group(0)
-            date_norm = parse_hebrew_date(date_snippet)
-            if not date_norm:
+            parsed = parse_date(date_snippet)
+            if not parsed:
                 continue
             start = max(0, m.start() - 300)
             end = min(len(raw), m.end() + 500)
@@ -790,35 +1124,73 @@ def parse_massaot_cruises(html, base_url):
                 "ship": ship,
                 "ship_normalized": normalize_ship(ship) if ship else "",
                 "date_display": date_snippet[:80],
-                "date_norm": date_norm,
+                **_date_fields(parsed),
                 "price": price,
                 "url": base_url,
             })
+    return cruises
 
-    seen = set()
-    unique = []
-    for c in cruises:
-        key = (c.get("date_norm"), c.get("ship_normalized") or c.get("title", "")[:50])
-        if key in seen:
-            continue
-        seen.add(key)
-        unique.append(c)
-    return unique
+
+def parse_massaot_cruises(html, base_url):
+    """מפרסר דף מסעות ומחלץ קרוזים (אונייה, תאריך, מחיר).
+    תבניות תאריך על כל הטקסט של הדף – תמיד; נתונים מובנים (structured_data) או כרטיסים לפי מתאם הסלקטורים
+    (site_adapters, כשהוגדר) – מה שמוצא יותר הפלגות – מחליפים אותן רק כשהם מוצאים לפחות אותו מספר הפלגות
+    עם תאריך (סלקטור שתפס כמה אלמנטים אקראיים לא מחליף את מה שמסלול הטקסט מוצא)."""
+    if not html:
+        return []
+    page = parsed_page(html)
+
+    def departures(cruises):
+        # כרטיס = הפלגה: שתי יציאות באותו חודש ובאותה אונייה (משך / מחיר שונים) הן שתי הפלגות
+        return _unique(cruises, lambda c: (c.get("date_norm"), c.get("ship_normalized"), c.get("date_display"),
+                                           c.get("price"), c.get("url")))
+
+    # בחיתוך טקסט אותה הפלגה נתפסת בכמה חלונות – מפתח גס (חודש + אונייה)
+    text = _unique(_massaot_text_cruises(page.text, base_url),
+                   lambda c: (c.get("date_norm"), c.get("ship_normalized") or c.get("title", "")[:50]))
+    structured = departures(_structured_cruises(page, base_url, "מסעות"))
+    cards = departures(_massaot_adapter_cruises(page, base_url))
+    best = structured if len(structured) >= len(cards) else cards
+    return best if best and len(best) >= len(text) else text
+
+
+def _has_date_blocks(html):
+    """דף רשימה שלם – יש בו לפחות כרטיס הפלגה אחד (X ימים – תאריך), או הפלגה עם תאריך בנתונים המובנים."""
+    return count_date_blocks(html) > 0 or any(r.date is not None for r in structured_records(html))
+
+
+def _cruises_page_complete(html):
+    """דף הקרוזים/שייט נהרות הראשי שלם – יש בו הפלגות או תפריט יעדים."""
+    return _has_date_blocks(html) or bool(extract_tarbutu_destination_links(html, TARBUTU_BASE))
+
+
+def _massaot_page_complete(html):
+    return bool(parse_massaot_cruises(html, MASSAOT_URL))
+
+
+def _inner_page_complete(html):
+    """עמוד קרוז פנימי שלם – יש בו טבלה או סימן מחיר (התוכן שמחלצים ממנו)."""
+    if not html:
+        return False
+    return "<table" in html or "$" in html or "₪" in html
 
 
 def match_cruises(tarbutu_list, massaot_list):
-    """מתאים הפלגות עם אותה אונייה ואותו תאריך."""
+    """מתאים הפלגות עם אותה אונייה ואותו תאריך.
+    הפלגות מסעות מאונדקסות לפי date_norm, כך שכל הפלגה של תרבותו נבדקת רק מול אלה שבאותו חודש."""
     matches = []
+    by_date = {}
+    for m in massaot_list:
+        md = m.get("date_norm")
+        if md:
+            by_date.setdefault(tuple(md), []).append(m)
     for t in tarbutu_list:
         tn = (t.get("ship_normalized") or "").strip()
         td = t.get("date_norm")
         if not td:
             continue
-        for m in massaot_list:
+        for m in by_date.get(tuple(td), ()):
             mn = (m.get("ship_normalized") or "").strip()
-            md = m.get("date_norm")
-            if md != td:
-                continue
             # התאמת אונייה (זהה או דומה) – רק כששניהם קיימים או אחד מכיל את השני
             if tn and mn and (tn == mn or tn in mn or mn in tn):
                 matches.append({
@@ -996,45 +1368,175 @@ def build_table_md(matches, tarbutu_cruises, massaot_cruises):
     return "\n".join(lines)
 
 
-def main():
+def main(async_crawl=False, per_host=DEFAULT_PER_HOST_CONCURRENCY, max_concurrency=DEFAULT_GLOBAL_CONCURRENCY,
+         http_first=True, use_cache=True, cache_ttl=None, block_resources=True, rate_per_host=DEFAULT_RATE_PER_HOST,
+         incremental=True, inner_max_age_days=INNER_PAGE_MAX_AGE_DAYS, resume=False,
+         max_attempts=DEFAULT_MAX_ATTEMPTS, discovery="wp", inner_workers=DEFAULT_INNER_WORKERS,
+         inner_budget_seconds=DEFAULT_INNER_BUDGET_SECONDS, max_inner_pages=None, record=None, replay=None,
+         replay_latency=None, parser_backend=DEFAULT_PARSER_BACKEND, inner_parse="stream"):
+    """סריקה מלאה. Chromium מופעל פעם אחת (במאגר משותף) ומשמש את כל השלבים.
+    async_crawl=True – דפי יעד ועמודים פנימיים נטענים במקביל (per_host לכל אתר, max_concurrency בסך הכל).
+    http_first=True – כל דף נטען קודם ב-HTTP רגיל; דפדפן רק לדפים שזה לא הספיק להם.
+    use_cache=True – מטמון דיסק; cache_ttl = {"listing": שניות, "inner": שניות} דורס את ברירות המחדל.
+    block_resources=True – הדפדפן לא טוען תמונות, פונטים, וידאו ומעקב צד-שלישי.
+    rate_per_host – כמה בקשות לשנייה לכל אתר (token bucket; 0 = בלי הגבלה).
+    incremental=True – נכנסים לעמוד קרוז של תרבותו רק אם הכרטיס שלו בדף היעד השתנה, הוא חדש,
+    או שעברו inner_max_age_days ימים מהכניסה האחרונה; אחרת משתמשים בשורות מהריצה הקודמת.
+    resume=True – ממשיכים מיומן נקודות הביקורת של ריצה שנפלה: דפי יעד ועמודים פנימיים שהושלמו לא נטענים שוב.
+    max_attempts – ניסיונות לכל דף בשגיאה זמנית (timeout, 5xx, ניווט); אתר שנפל נכשל מיד (מפסק לכל host).
+    discovery="wp" – רשימת היעדים מה-REST API / sitemap של וורדפרס (ותפריטים רק אם לא נמצא שם כלום);
+    "menu" – רק מהתפריטים ומרשימת השמות, כמו פעם.
+    inner_workers – כמה עמודים פנימיים נטענים במקביל בדפדפן גם בסריקה סינכרונית (1 = אחד אחרי השני).
+    inner_budget_seconds / max_inner_pages – תקציב זמן ותקרת עמודים לכל שלב עמודים פנימיים (None = בלי).
+    record=path – כל תשובה (HTTP ודפדפן) נשמרת לארכיון; replay=path – הכל מוגש מהארכיון בלי רשת ובלי דפדפן,
+    עם replay_latency (מילישניות לכל תשובה, או "recorded"). בשני המצבים אין מטמון, סריקה מצטברת או המשך מיומן,
+    כך שההקלטה וההשמעה עוברות באותו מסלול.
+    parser_backend – מנוע פרסור ה-HTML (auto / selectolax / lxml / html.parser); הפלט זהה, רק המהירות שונה.
+    inner_parse="stream" – טבלאות המחירים בעמוד פנימי נקראות בפרסור זורם שעוצר בסוף אזור התוכן שלהן;
+    "full" – עץ מלא של כל הדף וכל הטבלאות בו."""
+    global _BROWSER_POOL, _ASYNC_CRAWLER, _TIERED_FETCHER, _RATE_LIMITER, _RETRY_POLICY, _INNER_CRAWLER, _ARCHIVE
+    global _STREAM_INNER_PAGES
+    if inner_parse not in INNER_PARSE_MODES:
+        raise ValueError(f"unknown inner_parse mode: {inner_parse}")
+    set_parser_backend(parser_backend)
+    _STREAM_INNER_PAGES = inner_parse == "stream"
+    archive = None
+    if replay:
+        archive = FetchArchive(Path(replay), mode="replay", latency=replay_latency)
+        # אין רשת – אין צורך בהגבלת קצב
+        rate_per_host = 0
+    elif record:
+        archive = FetchArchive(Path(record), mode="record")
+    if archive is not None:
+        use_cache = False
+        incremental = False
+        resume = False
+    pool = None
+    crawler = None
+    inner_crawler = None
+    cache = HttpCache(HTTP_CACHE_DIR, ttl_seconds=cache_ttl) if use_cache else None
+    blocker = ResourceBlocker() if block_resources else None
+    limiter = HostRateLimiter(rate=rate_per_host)
+    retry = RetryPolicy(max_attempts=max_attempts, breaker=CircuitBreaker())
+    inner_state = InnerPageState(INNER_STATE_JSON, max_age_days=inner_max_age_days) if incremental else None
+    journal = ScanJournal(JOURNAL_PATH, resume=resume)
+    if journal.stats()["loaded"]:
+        print(f"ממשיך מריצה קודמת: {journal.stats()['loaded']} דפים כבר הושלמו ביומן.")
+    reset_readiness_stats()
+    tiered = TieredFetcher(
+        memory=EscalationMemory(ESCALATIONS_JSON if archive is None else None),
+        key=_normalize_url_for_dedup,
+        http_workers=per_host if async_crawl else DEFAULT_HTTP_WORKERS,
+        cache=cache,
+        http_first=http_first,
+        limiter=limiter,
+        retry=retry,
+    )
+    replaying = archive is not None and archive.replaying
+    if replaying:
+        # השמעה – בלי דפדפן; דפים שנטענו בדפדפן בהקלטה מוגשים מהארכיון
+        pass
+    elif async_crawl and async_playwright_available():
+        crawler = AsyncCrawler(per_host=per_host, global_cap=max_concurrency, blocker=blocker, limiter=limiter,
+                               retry=retry)
+        crawler.start()
+    elif playwright_available():
+        pool = BrowserPool(blocker=blocker)
+        if inner_workers > 1 and async_playwright_available():
+            # מופעל רק אם עמוד פנימי באמת צריך דפדפן
+            inner_crawler = AsyncCrawler(per_host=inner_workers, global_cap=inner_workers, blocker=blocker,
+                                         limiter=limiter, retry=retry)
+    _BROWSER_POOL = pool
+    _INNER_CRAWLER = inner_crawler
+    _ASYNC_CRAWLER = crawler
+    _TIERED_FETCHER = tiered
+    _RATE_LIMITER = limiter
+    _RETRY_POLICY = retry
+    _ARCHIVE = archive
+    if archive is not None:
+        if not replaying:
+            archive.browser = pool is not None or crawler is not None
+        set_archive(archive)
+    completed = False
+    try:
+        wp = WpDiscovery(TARBUTU_BASE, limiter=limiter) if discovery == "wp" else None
+        data = _run_scan(pool, crawler, tiered, blocker, inner_state, journal, wp,
+                         inner_budget_seconds=inner_budget_seconds, max_inner_pages=max_inner_pages,
+                         inner_crawler=inner_crawler)
+        completed = True
+        return data
+    finally:
+        journal.close(completed=completed)
+        _BROWSER_POOL = None
+        _ASYNC_CRAWLER = None
+        _TIERED_FETCHER = None
+        _RATE_LIMITER = None
+        _RETRY_POLICY = None
+        _INNER_CRAWLER = None
+        _ARCHIVE = None
+        set_archive(None)
+        if archive is not None:
+            archive.save()
+        _inner_page_facts.cache_clear()
+        clear_parsed_pages()
+        tiered.memory.save()
+        if inner_state is not None:
+            inner_state.save()
+        if cache is not None:
+            cache.evict()
+        if pool is not None:
+            pool.close()
+        if crawler is not None:
+            crawler.close()
+        if inner_crawler is not None:
+            inner_crawler.close()
+
+
+def _run_scan(pool, crawler, tiered, blocker, inner_state=None, journal=None, wp=None,
+              inner_budget_seconds=DEFAULT_INNER_BUDGET_SECONDS, max_inner_pages=None, inner_crawler=None):
     tarbutu_cruises = []
 
+    # שלב 0: גילוי דפים מוורדפרס (REST / sitemap) – בקשה אחת לכל 100 דפים, עם זמן עדכון לכל דף
+    wp_destinations = []
+    wp_river = []
+    if wp is not None:
+        print("מגלה דפים בתרבותו דרך וורדפרס (REST API / sitemap)...")
+        wp_pages = wp.discover()
+        if wp_pages:
+            tiered.modified_hints = modified_hints(wp_pages, key=_normalize_url_for_dedup)
+            wp_destinations, wp_river = select_wp_destinations(wp_pages)
+            print(f"  {len(wp_pages)} דפים ({wp.stats()['source']}): {len(wp_destinations)} יעדי קרוזים, {len(wp_river)} יעדי שייט נהרות.")
+        else:
+            print("  וורדפרס לא החזיר דפים – גילוי יעדים מהתפריטים.")
+
     # שלב 1: טעינת דף הקרוזים הראשי ואיסוף רשימת היעדים הרשמית (לחיצה על כל יעד = דף עם תאריכי הפלגות)
     print("סורק תרבותו – דף קרוזים (מחפש רשימת יעדים)...")
-    destination_list = []
-    html_t, err_t = fetch_page_playwright(TARBUTU_CRUISES_URL)
+    # יעדי וורדפרס הם הבסיס, ומאוחדים עם הגילוי מהדף – יעד שוורדפרס סיווג אחרת (לא צאצא של דף הקרוזים
+    # ולא ברשימת השמות) עדיין נמצא בתפריט או בכותרות
+    destination_list = list(wp_destinations)
+    dest_urls_so_far = {u for u, _ in destination_list}
+
+    def add_destinations(links):
+        for n, title in links:
+            if n and n not in dest_urls_so_far:
+                dest_urls_so_far.add(n)
+                destination_list.append((n, title))
+
+    html_t, err_t = _fetch_one(TARBUTU_CRUISES_URL, complete=_cruises_page_complete)
+    sources = "וורדפרס + " if wp_destinations else ""
     if err_t:
         print(f"  שגיאה: {err_t}")
-        for extra_url, extra_title in TARBUTU_EXTRA_LIST_URLS:
-            destination_list.append((_normalize_url_for_dedup(extra_url), extra_title))
-        for name in ALL_CRUISE_DESTINATION_NAMES:
-            url = build_destination_url(name)
-            n = _normalize_url_for_dedup(url)
-            if n and not any(n == u for u, _ in destination_list):
-                destination_list.append((n, name))
     else:
         # מקור 1: חילוץ ישיר מתוכן דף הקרוזים – כותרות h2/h3 והקישור התקני הראשון אחריהן (כמו באתר)
-        destination_list = extract_destination_links_from_cruises_page(html_t, TARBUTU_CRUISES_URL)
+        add_destinations(extract_destination_links_from_cruises_page(html_t, TARBUTU_CRUISES_URL))
         # מקור 2: קישורים מהתפריט
-        menu_links = extract_tarbutu_destination_links(html_t, TARBUTU_CRUISES_URL)
-        dest_urls_so_far = {u for u, _ in destination_list}
-        for n, title in menu_links:
-            if n and n not in dest_urls_so_far:
-                dest_urls_so_far.add(n)
-                destination_list.append((n, title))
-        for extra_url, extra_title in TARBUTU_EXTRA_LIST_URLS:
-            n = _normalize_url_for_dedup(extra_url)
-            if n and n not in dest_urls_so_far:
-                dest_urls_so_far.add(n)
-                destination_list.append((n, extra_title))
-        # מקור 3: רשימת שמות היעדים – בונים כתובת לכל אחד אם עדיין חסר
-        for name in ALL_CRUISE_DESTINATION_NAMES:
-            url = build_destination_url(name)
-            n = _normalize_url_for_dedup(url)
-            if n and n not in dest_urls_so_far:
-                dest_urls_so_far.add(n)
-                destination_list.append((n, name))
-        print(f"  נמצאו {len(destination_list)} יעדים (מתוכן הדף + תפריט + רשימה).")
+        add_destinations(extract_tarbutu_destination_links(html_t, TARBUTU_CRUISES_URL))
+        sources += "תוכן הדף + תפריט + "
+    add_destinations((_normalize_url_for_dedup(u), t) for u, t in TARBUTU_EXTRA_LIST_URLS)
+    # מקור 3: רשימת שמות היעדים – בונים כתובת לכל אחד אם עדיין חסר
+    add_destinations((_normalize_url_for_dedup(build_destination_url(name)), name)
+                     for name in ALL_CRUISE_DESTINATION_NAMES)
+    print(f"  נמצאו {len(destination_list)} יעדים ({sources}רשימה).")
 
     # שלב 1b: חילוץ הפלגות ישירות מדף הקרוזים הראשי (למקרה שחלק מופיעים רק שם)
     if html_t:
@@ -1054,11 +1556,11 @@ def main():
     if destination_list:
         print(f"נכנס לכל דף יעד ומוציא את רשימת ההפלגות ({len(destination_list)} יעדים)...")
         seen_cruise_urls = {_normalize_url_for_dedup(c.get("url")) for c in tarbutu_cruises}
-        for dest_url, dest_title in destination_list:
-            html_dest, err = fetch_page_playwright(dest_url, timeout=15000)
+        dest_results = _fetch_stage(journal, "listing", [u for u, _ in destination_list], _parse_listing_page,
+                                    timeout=15000, complete=_has_date_blocks)
+        for (dest_url, dest_title), (cruises_from_dest, err) in zip(destination_list, dest_results):
             if err:
                 continue
-            cruises_from_dest = parse_tarbutu_cruises(html_dest, dest_url)
             for c in cruises_from_dest:
                 c["destination_url"] = dest_url
                 c["destination_title"] = dest_title
@@ -1070,7 +1572,6 @@ def main():
                 print(f"  יעד \"{dest_title}\": {len(cruises_from_dest)} הפלגות (סה\"כ {len(tarbutu_cruises)}).")
             else:
                 print(f"  יעד \"{dest_title}\": אין הפלגות (ייתכן 404 או דף ריק).")
-            time.sleep(0.6)
         # סיכום סריקה – כמה יעדים סורקנו וכמה הפלגות לכל יעד
         by_dest = {}
         for c in tarbutu_cruises:
@@ -1082,17 +1583,22 @@ def main():
     # דף שייט נהרות – גם ממנו רשימת יעדים ואז סריקת כל יעד
     print("סורק תרבותו – שייט נהרות (רשימת יעדים)...")
     river_destinations = []
-    html_river, err_r = fetch_page_playwright(TARBUTU_RIVER_CRUISES_URL)
-    if err_r:
+    html_river, err_r = _fetch_one(TARBUTU_RIVER_CRUISES_URL, complete=_cruises_page_complete)
+    if err_r and not wp_river:
         print(f"  שגיאה: {err_r}")
     else:
-        river_destinations = extract_tarbutu_destination_links(html_river, TARBUTU_RIVER_CRUISES_URL)
+        river_destinations = list(wp_river)
+        river_urls = {u for u, _ in river_destinations}
+        for n, title in (extract_tarbutu_destination_links(html_river, TARBUTU_RIVER_CRUISES_URL) if not err_r else []):
+            if n and n not in river_urls:
+                river_urls.add(n)
+                river_destinations.append((n, title))
         seen_cruise_urls = {_normalize_url_for_dedup(c.get("url")) for c in tarbutu_cruises}
-        for dest_url, dest_title in river_destinations:
-            html_dest, err = fetch_page_playwright(dest_url, timeout=15000)
+        river_results = _fetch_stage(journal, "listing", [u for u, _ in river_destinations], _parse_listing_page,
+                                     timeout=15000, complete=_has_date_blocks)
+        for (dest_url, dest_title), (cruises_from_dest, err) in zip(river_destinations, river_results):
             if err:
                 continue
-            cruises_from_dest = parse_tarbutu_cruises(html_dest, dest_url)
             for c in cruises_from_dest:
                 c["destination_url"] = dest_url
                 c["destination_title"] = dest_title
@@ -1102,47 +1608,56 @@ def main():
                     tarbutu_cruises.append(c)
             if cruises_from_dest:
                 print(f"  יעד \"{dest_title}\": {len(cruises_from_dest)} הפלגות.")
-            time.sleep(0.6)
         print(f"סה\"כ אחרי שייט נהרות: {len(tarbutu_cruises)} קרוזים.")
 
-    # גיבוי: דפים נוספים מקישורים (אם פספסנו יעדים)
-    seed_normalized = {_normalize_url_for_dedup(TARBUTU_CRUISES_URL), _normalize_url_for_dedup(TARBUTU_RIVER_CRUISES_URL)}
-    seed_normalized.update(_normalize_url_for_dedup(u) for u, _ in TARBUTU_EXTRA_LIST_URLS)
-    dest_urls_seen = {u for u, _ in destination_list}
-    dest_urls_seen.update(_normalize_url_for_dedup(u) for u, _ in river_destinations)
-    category_links = set()
-    all_links = set()
+    # גיבוי: דפים נוספים מקישורים (אם פספסנו יעדים) – תור עדיפויות: מקור הקישור (תפריט > כותרת > גוף),
+    # כמה הפלגות חדשות הדף הניב בריצות קודמות ומתי נבדק; עומק מוגבל ותקציב של MAX_LIST_PAGE_CANDIDATES דפים
+    # בהקלטה/השמעה – בלי היסטוריה מריצות קודמות (סדר הגילוי זהה בשתיהן)
+    frontier = CrawlFrontier(FRONTIER_JSON if _ARCHIVE is None else None, max_pages=MAX_LIST_PAGE_CANDIDATES, max_depth=MAX_LIST_DEPTH,
+                             key=_normalize_url_for_dedup)
+    frontier.exclude([TARBUTU_CRUISES_URL, TARBUTU_RIVER_CRUISES_URL])
+    frontier.exclude(u for u, _ in TARBUTU_EXTRA_LIST_URLS)
+    frontier.exclude(u for u, _ in destination_list)
+    frontier.exclude(u for u, _ in river_destinations)
+    frontier.exclude(c.get("url") for c in tarbutu_cruises)
     if html_t:
-        category_links |= extract_tarbutu_category_links(html_t, TARBUTU_CRUISES_URL)
-        all_links |= extract_all_tarbutu_links(html_t, TARBUTU_CRUISES_URL)
+        frontier.add_links(extract_tarbutu_links_by_source(html_t, TARBUTU_CRUISES_URL), depth=1)
     if html_river:
-        category_links |= extract_tarbutu_category_links(html_river, TARBUTU_RIVER_CRUISES_URL)
-        all_links |= extract_all_tarbutu_links(html_river, TARBUTU_RIVER_CRUISES_URL)
-    cruise_urls_normalized = {_normalize_url_for_dedup(c.get("url")) for c in tarbutu_cruises}
-    combined = (category_links | all_links) - seed_normalized - cruise_urls_normalized
-    list_candidates = [u for u in combined if u not in dest_urls_seen][:MAX_LIST_PAGE_CANDIDATES]
-    if list_candidates:
-        print(f"בודק {len(list_candidates)} דפים נוספים...")
-        for url in list_candidates:
-            html_list, err = fetch_page_playwright(url, timeout=15000)
+        frontier.add_links(extract_tarbutu_links_by_source(html_river, TARBUTU_RIVER_CRUISES_URL), depth=1)
+    checked = 0
+    while True:
+        batch = frontier.pop_batch(FRONTIER_BATCH_SIZE)
+        if not batch:
+            break
+        if not checked:
+            print(f"בודק דפים נוספים (לפי עדיפות, עד {MAX_LIST_PAGE_CANDIDATES})...")
+        results = _fetch_stage(journal, "frontier", [u for u, _, _ in batch], _parse_frontier_page,
+                               timeout=15000, complete=_has_date_blocks)
+        for (url, source, depth), (parsed, err) in zip(batch, results):
+            checked += 1
             if err:
+                frontier.record(url, source, 0)
                 continue
-            extra = parse_tarbutu_cruises(html_list, url)
             before = len(tarbutu_cruises)
             seen = {_normalize_url_for_dedup(c.get("url")) for c in tarbutu_cruises}
-            for c in extra:
+            for c in parsed["cruises"]:
+                c = restore_row(c)
                 c["destination_url"] = url
                 c["destination_title"] = "יעד נוסף"
                 n = _normalize_url_for_dedup(c.get("url"))
                 if n and n not in seen:
                     seen.add(n)
                     tarbutu_cruises.append(c)
-            if len(tarbutu_cruises) > before:
-                print(f"  נוספו {len(tarbutu_cruises) - before} קרוזים.")
-            time.sleep(0.5)
+            added = len(tarbutu_cruises) - before
+            frontier.record(url, source, added)
+            frontier.exclude(c.get("url") for c in tarbutu_cruises[before:])
+            frontier.add_links(parsed["links"], depth + 1)
+            if added:
+                print(f"  נוספו {added} קרוזים ({source}, עומק {depth}).")
+    frontier.save()
 
     print("סורק מסעות...")
-    html_m, err_m = fetch_page_playwright(MASSAOT_URL, timeout=35000)
+    html_m, err_m = _fetch_one(MASSAOT_URL, timeout=35000, complete=_massaot_page_complete)
     if err_m:
         print(f"  שגיאה מסעות: {err_m}")
         massaot_cruises = []
@@ -1150,66 +1665,92 @@ def main():
         massaot_cruises = parse_massaot_cruises(html_m, MASSAOT_URL)
         print(f"  נמצאו {len(massaot_cruises)} קרוזים.")
 
-    # סריקה בתוך עמודים – כניסה לכל קישור קרוז, חילוץ טבלת מחירים ותאריכים (כל שורה = קרוז)
-    MAX_INNER_PAGES = 60
-    if sync_playwright and stealth_sync and tarbutu_cruises:
+    # סריקה בתוך עמודים – כניסה לכל קישור קרוז, חילוץ טבלת מחירים ותאריכים (כל שורה = קרוז).
+    # אין תקרה קבועה: כל שלב מקבל תקציב זמן (ואופציונלית תקרת עמודים); מה שלא הספיק נשאר ברמת הכרטיס
+    inner_budget = {"planned": 0, "skipped_budget": 0, "budget_seconds": inner_budget_seconds,
+                    "max_pages": max_inner_pages}
+
+    def _inner_deadline():
+        return time.monotonic() + inner_budget_seconds if inner_budget_seconds else None
+
+    if tarbutu_cruises:
         print("נכנסים לעמודי הקרוזים של תרבותו (טבלאות מחירים ותאריכים – כל שורה = הפלגה)...")
-        tarbutu_expanded = []
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0 Safari/537.36",
-                locale="he-IL",
-            )
-            page = context.new_page()
-            stealth_sync(page)
-            for i, c in enumerate(tarbutu_cruises):
-                if i >= MAX_INNER_PAGES:
-                    tarbutu_expanded.append(c)
-                    continue
-                url = c.get("url")
-                if not url or "action=edit" in url:
-                    tarbutu_expanded.append(c)
-                    continue
-                html_inner, err = _fetch_with_page(page, url, timeout=18000)
-                if err:
-                    tarbutu_expanded.append(c)
+        inner_idx = []
+        reused = {}
+        for i, c in enumerate(tarbutu_cruises[:max_inner_pages]):
+            if not c.get("url") or "action=edit" in c.get("url"):
+                continue
+            if inner_state is not None:
+                rows = inner_state.lookup(_normalize_url_for_dedup(c["url"]), c.get("card_fingerprint"))
+                if rows is not None:
+                    reused[i] = rows
                     continue
-                rows = parse_price_table_from_inner_page(html_inner, c)
-                if len(rows) > 0:
-                    tarbutu_expanded.extend(rows)
-                else:
-                    enrich_cruise_from_inner_page(html_inner, c)
-                    tarbutu_expanded.append(c)
-                if (i + 1) % 10 == 0:
-                    print(f"  סורקנו {i + 1} עמודים, סה\"כ {len(tarbutu_expanded)} הפלגות...")
-                time.sleep(0.7)
-            browser.close()
+            inner_idx.append(i)
+        if reused:
+            print(f"  {len(reused)} עמודים לא השתנו (אותו כרטיס) – משתמשים בשורות מהריצה הקודמת.")
+        inner_by_url = {tarbutu_cruises[i]["url"]: tarbutu_cruises[i] for i in inner_idx}
+
+        def _parse_inner(url, html_inner):
+            # כל שורה בטבלת המחירים = הפלגה; בלי טבלה – הכרטיס עצמו מועשר מהעמוד
+            c = inner_by_url[url]
+            rows = parse_price_table_from_inner_page(html_inner, c)
+            if rows:
+                return rows
+            enrich_cruise_from_inner_page(html_inner, c)
+            return [c]
+
+        inner_budget["planned"] += len(inner_idx)
+        inner_pages = dict(zip(inner_idx, _fetch_stage(
+            journal, "tarbutu_inner", [tarbutu_cruises[i]["url"] for i in inner_idx], _parse_inner,
+            timeout=18000, inner=True, complete=_inner_page_complete, deadline=_inner_deadline())))
+        tarbutu_expanded = []
+        for i, c in enumerate(tarbutu_cruises):
+            if i in reused:
+                tarbutu_expanded.extend(reused[i])
+                continue
+            if i not in inner_pages:
+                tarbutu_expanded.append(c)
+                continue
+            rows, err = inner_pages[i]
+            if err:
+                if err == INNER_BUDGET_ERROR:
+                    inner_budget["skipped_budget"] += 1
+                tarbutu_expanded.append(c)
+                continue
+            tarbutu_expanded.extend(rows)
+            if inner_state is not None:
+                inner_state.store(_normalize_url_for_dedup(c["url"]), c.get("card_fingerprint"), rows)
+            if (i + 1) % 10 == 0:
+                print(f"  סורקנו {i + 1} עמודים, סה\"כ {len(tarbutu_expanded)} הפלגות...")
         tarbutu_cruises = tarbutu_expanded
         print(f"  סיום סריקה פנימית. סה\"כ {len(tarbutu_cruises)} קרוזים (הפלגות).")
 
-    if sync_playwright and stealth_sync and massaot_cruises:
+    if massaot_cruises:
         print("נכנסים לעמודי הקרוזים של מסעות...")
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={"width": 1920, "height": 1080},
-                user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/120.0.0.0 Safari/537.36",
-                locale="he-IL",
-            )
-            page = context.new_page()
-            stealth_sync(page)
-            for i, c in enumerate(massaot_cruises[:MAX_INNER_PAGES]):
-                url = c.get("url")
-                if not url:
-                    continue
-                html_inner, err = _fetch_with_page(page, url, timeout=18000)
-                if err:
-                    continue
-                enrich_cruise_from_inner_page(html_inner, c)
-                time.sleep(0.7)
-            browser.close()
+        massaot_inner = [c for c in massaot_cruises[:max_inner_pages] if c.get("url")]
+        inner_budget["planned"] += len(massaot_inner)
+        # מפתח ביומן – טביעת אצבע של הכרטיס עצמו (אונייה, תאריך, מחיר), לא המיקום שלו ברשימה: כל הכרטיסים
+        # מצביעים על אותו דף, ובהמשך ריצה (--resume) הדף נטען מחדש והסדר יכול להשתנות
+        massaot_keys = []
+        occurrences = {}
+        for c in massaot_inner:
+            fp = card_fingerprint(f"{c.get('ship') or ''} {c.get('date_display') or ''} {c.get('price') or ''} {c['url']}")
+            occurrences[fp] = occurrences.get(fp, 0) + 1
+            massaot_keys.append(f"{fp}|{occurrences[fp]}")
+
+        def _parse_massaot_inner(key, html_inner):
+            # ביומן נשמרים רק שדות ההעשרה – לא הכרטיס כולו
+            return inner_page_enrichment(html_inner)
+
+        massaot_results = _fetch_stage(journal, "massaot_inner", [c["url"] for c in massaot_inner],
+                                       _parse_massaot_inner, keys=massaot_keys, timeout=18000, inner=True,
+                                       complete=_inner_page_complete, deadline=_inner_deadline())
+        for c, (enriched, err) in zip(massaot_inner, massaot_results):
+            if err:
+                if err == INNER_BUDGET_ERROR:
+                    inner_budget["skipped_budget"] += 1
+                continue
+            apply_inner_enrichment(c, enriched)
 
     matches = match_cruises(tarbutu_cruises, massaot_cruises)
     print(f"התאמות (אותה אונייה + תאריך): {len(matches)}")
@@ -1230,6 +1771,27 @@ def main():
         "by_destination": by_destination,
         "massaot_cruises": massaot_cruises,
         "matches": matches,
+        "scan_stats": {
+            "browser_pool": pool.stats() if pool is not None else None,
+            "async_crawl": crawler.stats() if crawler is not None else None,
+            "tiered_fetch": tiered.stats(),
+            "http_cache": tiered.cache.stats() if tiered.cache is not None else None,
+            "resource_blocking": blocker.stats() if blocker is not None else None,
+            "politeness": tiered.limiter.stats() if tiered.limiter is not None else None,
+            "readiness": readiness_stats(),
+            "incremental_inner": inner_state.stats() if inner_state is not None else None,
+            "checkpoint": journal.stats() if journal is not None else None,
+            "retry": tiered.retry.stats() if tiered.retry is not None else None,
+            "wp_discovery": wp.stats() if wp is not None else None,
+            "frontier": frontier.stats(),
+            "inner_pages": inner_budget,
+            "inner_workers": inner_crawler.stats() if inner_crawler is not None else None,
+            "archive": _ARCHIVE.stats() if _ARCHIVE is not None else None,
+            "parser": dict(parser_backend_info(), inner_parse="stream" if _STREAM_INNER_PAGES else "full"),
+            "date_cache": date_cache_stats(),
+            "site_adapters": adapter_stats(),
+            "structured_data": structured_data_stats(),
+        },
     }
     with open(OUTPUT_JSON, "w", encoding="utf-8") as f:
         json.dump(data, f, ensure_ascii=False, indent=2)
@@ -1242,9 +1804,92 @@ def main():
     with open(OUTPUT_MD, "w", encoding="utf-8") as f:
         f.write(md_content)
 
+    ts = tiered.stats()
+    escalated = ts["escalated_incomplete"] + ts["escalated_challenge"] + ts["escalated_error"]
+    print(f"טעינה מדורגת: {ts['http_ok']} דפים ב-HTTP בלבד, {escalated} הוסלמו לדפדפן, {ts['browser_remembered']} ישר לדפדפן (זוכרים מריצה קודמת), {ts['memo_hits']} בקשות חוזרות לאותה כתובת לא נטענו שוב.")
+    if tiered.cache is not None:
+        hs = tiered.cache.stats()
+        print(f"מטמון: {hs['fresh_hits']} דפים טריים מהדיסק, {hs['revalidated_304']} לא השתנו (304), {hs['misses']} נטענו מחדש.")
+    if blocker is not None and blocker.stats()["requests_seen"]:
+        bs = blocker.stats()
+        print(f"חסימת משאבים: {bs['blocked']} מתוך {bs['requests_seen']} בקשות נחסמו (~{bs['estimated_bytes_saved'] // 1024} KB נחסכו).")
+    rs = readiness_stats()
+    if rs["ready"] or rs["timed_out"]:
+        print(f"מוכנות דפים: {rs['ready']} מוכנים מוקדם, {rs['timed_out']} הגיעו לתקרה ({rs['wait_seconds']} שניות המתנה).")
+    if limiter_stats := (tiered.limiter.stats() if tiered.limiter is not None else None):
+        print(f"קצב בקשות: {limiter_stats['throttled']} מתוך {limiter_stats['acquired']} בקשות הואטו ({limiter_stats['wait_seconds']} שניות).")
+    if inner_budget["skipped_budget"]:
+        print(f"עמודים פנימיים: {inner_budget['skipped_budget']} מתוך {inner_budget['planned']} לא נטענו (נגמר תקציב הזמן).")
+    if tiered.retry is not None:
+        rts = tiered.retry.stats()
+        if rts["retries"] or rts["circuit_breaker"]["short_circuited"]:
+            print(f"ניסיונות חוזרים: {rts['retries']} ({rts['recovered']} הצליחו, {rts['gave_up']} נכשלו סופית); "
+                  f"מפסק: {rts['circuit_breaker']['short_circuited']} בקשות נחסמו מיד, אתרים למטה: {', '.join(rts['circuit_breaker']['open_hosts']) or '—'}.")
+    if inner_state is not None:
+        ist = inner_state.stats()
+        print(f"סריקה פנימית מצטברת: {ist['reused']} עמודים לא נטענו (כרטיס זהה), {ist['changed']} השתנו, {ist['new']} חדשים, {ist['expired']} ישנים.")
+    if crawler is not None:
+        cs = crawler.stats()
+        print(f"סריקה אסינכרונית: {cs['pages_fetched']} דפים, עד {cs['peak_in_flight']} במקביל, {cs['errors']} שגיאות.")
+    if _ARCHIVE is not None:
+        ars = _ARCHIVE.stats()
+        if _ARCHIVE.replaying:
+            print(f"השמעה מהארכיון: {ars['replayed']} תשובות, {ars['missing']} כתובות לא הוקלטו, {ars['simulated_latency_seconds']} שניות השהיה מדומה.")
+        else:
+            print(f"הקלטה לארכיון: {ars['recorded']} תשובות.")
+    if pool is not None:
+        ps = pool.stats()
+        print(f"מאגר דפדפן: {ps['browser_launches']} הפעלות, {ps['hits']} hits / {ps['misses']} misses, {ps['pages_recycled']} דפים מוחזרו.")
     print(f"נשמר: {OUTPUT_JSON}, {OUTPUT_HTML}, {OUTPUT_MD}")
     return data
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="סריקת קרוזים תרבותו vs מסעות והשוואת מחירים")
+    parser.add_argument("--async", dest="async_crawl", action="store_true", help="טעינת דפים במקביל (Playwright async)")
+    parser.add_argument("--per-host", type=int, default=DEFAULT_PER_HOST_CONCURRENCY, help="מקסימום דפים במקביל לכל אתר")
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_GLOBAL_CONCURRENCY, help="מקסימום דפים במקביל בסך הכל")
+    parser.add_argument("--browser-only", action="store_true", help="בלי HTTP רגיל – כל דף בדפדפן (כמו פעם)")
+    parser.add_argument("--no-cache", action="store_true", help="בלי מטמון דיסק – כל דף נטען מחדש")
+    parser.add_argument("--no-block", action="store_true", help="הדפדפן טוען גם תמונות, פונטים ומעקב")
+    parser.add_argument("--rate", type=float, default=DEFAULT_RATE_PER_HOST, help="בקשות לשנייה לכל אתר (0 = בלי הגבלה)")
+    parser.add_argument("--ttl-listing-hours", type=float, help="כמה שעות דף רשימה/יעד נחשב טרי במטמון")
+    parser.add_argument("--ttl-inner-hours", type=float, help="כמה שעות עמוד קרוז פנימי נחשב טרי במטמון")
+    parser.add_argument("--max-attempts", type=int, default=DEFAULT_MAX_ATTEMPTS,
+                        help="ניסיונות לכל דף בשגיאה זמנית (timeout, 5xx, ניווט); 1 = בלי ניסיון חוזר")
+    parser.add_argument("--discovery", choices=["wp", "menu"], default="wp",
+                        help="גילוי יעדים: wp = REST API / sitemap של וורדפרס (גיבוי: תפריטים); menu = תפריטים בלבד")
+    parser.add_argument("--inner-workers", type=int, default=DEFAULT_INNER_WORKERS,
+                        help="כמה עמודי קרוז פנימיים נטענים במקביל בדפדפן")
+    parser.add_argument("--inner-budget-minutes", type=float, default=DEFAULT_INNER_BUDGET_SECONDS / 60,
+                        help="תקציב זמן לכל שלב עמודים פנימיים (0 = בלי הגבלה)")
+    parser.add_argument("--max-inner-pages", type=int, help="תקרת עמודים פנימיים לכל אתר (ברירת מחדל: בלי תקרה)")
+    parser.add_argument("--record", metavar="PATH", help="שמירת כל התשובות (HTTP ודפדפן) לארכיון HAR (.har / .har.gz)")
+    parser.add_argument("--replay", metavar="PATH", help="ריצה מארכיון שהוקלט – בלי רשת ובלי דפדפן")
+    parser.add_argument("--replay-latency", help="השהיה מדומה בהשמעה: מילישניות לכל תשובה, או recorded (הזמן שנמדד)")
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default=DEFAULT_PARSER_BACKEND,
+                        help="מנוע פרסור HTML (auto = selectolax/lxml אם מותקנים, אחרת html.parser)")
+    parser.add_argument("--inner-parse", choices=INNER_PARSE_MODES, default="stream",
+                        help="טבלאות מחירים בעמוד פנימי: stream = פרסור זורם שעוצר בסוף אזור התוכן; full = עץ מלא של כל הדף")
+    parser.add_argument("--resume", action="store_true", help="המשך ריצה שנפלה מיומן נקודות הביקורת (בלי לטעון שוב דפים שהושלמו)")
+    parser.add_argument("--full-inner", action="store_true", help="כניסה לכל עמודי הקרוזים גם אם הכרטיס לא השתנה")
+    parser.add_argument("--inner-max-age-days", type=float, default=INNER_PAGE_MAX_AGE_DAYS,
+                        help="אחרי כמה ימים נכנסים שוב לעמוד קרוז גם אם הכרטיס לא השתנה")
+    args = parser.parse_args()
+    ttl = {}
+    if args.ttl_listing_hours is not None:
+        ttl["listing"] = int(args.ttl_listing_hours * 3600)
+    if args.ttl_inner_hours is not None:
+        ttl["inner"] = int(args.ttl_inner_hours * 3600)
+    latency = args.replay_latency
+    if latency and latency != "recorded":
+        latency = float(latency)
+    main(async_crawl=args.async_crawl, per_host=args.per_host, max_concurrency=args.max_concurrency,
+         http_first=not args.browser_only, use_cache=not args.no_cache, cache_ttl=ttl or None,
+         block_resources=not args.no_block, rate_per_host=args.rate,
+         incremental=not args.full_inner, inner_max_age_days=args.inner_max_age_days, resume=args.resume,
+         max_attempts=args.max_attempts, discovery=args.discovery, inner_workers=args.inner_workers,
+         inner_budget_seconds=int(args.inner_budget_minutes * 60), max_inner_pages=args.max_inner_pages,
+         record=args.record, replay=args.replay, replay_latency=latency, parser_backend=args.parser,
+         inner_parse=args.inner_parse)
@@ -0,0 +1,193 @@
+# competitor_research/site_adapters.py
+# מתאמי אתרים: לכל מתחרה (לפי company ב-targets.json) – סלקטורי CSS של כרטיס הפלגה ושל הכותרת, האונייה,
+# התאריך, המחיר והקישור בתוכו. הסלקטורים מוכנים פעם אחת בבניית המתאם (soupsieve / selectolax), והחילוץ
+# נוגע רק בצמתים האלה – במקום regex על כל הטקסט הגלוי של הדף – ומחזיר רשומה לכל הפלגה ולא גוש אחד לכל חברה.
+# כשמתאם לא מוצא כרטיסים (האתר שינה מבנה, אין מתאם לחברה) – הקורא חוזר למסלול ה-regex הקיים.
+# מתאם מופעל רק כשמגדירים אותו: "selectors": {"card": "...", "title": "...", ...} במקור של החברה ב-targets.json.
+
+import json
+import re
+from pathlib import Path
+from urllib.parse import urljoin
+
+import soupsieve
+
+from hebrew_dates import parse_date
+from parsed_page import element_attr, element_text, parsed_page
+
+TARGETS_PATH = Path(__file__).resolve().parent / "targets.json"
+# השדות שמתאם יכול להגדיר (card חובה; link – ברירת מחדל הקישור הראשון בכרטיס)
+SELECTOR_FIELDS = ("card", "title", "ship", "date", "price", "link")
+# מתאמים מובנים לפי company – רק סלקטורים שנבדקו מול ה-markup החי של האתר. אין כאלה כרגע: סלקטורים שלא נבדקו
+# היו מחליפים בשקט את מסלול ה-regex, ולכן מתאם לחברה נוסף רק דרך "selectors" ב-targets.json (או register_adapter)
+DEFAULT_ADAPTERS = {}
+
+_PRICE_NUMBER_PATTERN = re.compile(r"(\d[\d,.]*)")
+# :-soup-contains של soupsieve = :lexbor-contains של selectolax
+_SOUP_CONTAINS = re.compile(r":-soup-contains\(")
+
+
+def plain_price(text):
+    """המספר הראשון בטקסט המחיר (בלי פסיקים) כשהוא בטווח סביר, אחרת None."""
+    for m in _PRICE_NUMBER_PATTERN.finditer(text or ""):
+        raw = m.group(1).replace(",", "").rstrip(".")
+        try:
+            num = float(raw)
+        except ValueError:
+            continue
+        if 100 < num < 500000:
+            return str(int(num))
+    return None
+
+
+class AdapterCard:
+    """כרטיס הפלגה שמתאם מצא: הטקסט של כל שדה (None כשהסלקטור לא מצא), url מוחלט,
+    date – CruiseDate של date_text; price – המספר מ-price_text; text – כל הטקסט של הכרטיס (למסלול ה-regex)."""
+
+    __slots__ = ("node", "title", "ship", "date_text", "price_text", "url", "_text")
+
+    def __init__(self, node, title, ship, date_text, price_text, url):
+        self.node = node
+        self.title = title
+        self.ship = ship
+        self.date_text = date_text
+        self.price_text = price_text
+        self.url = url
+        self._text = None
+
+    @property
+    def text(self):
+        if self._text is None:
+            self._text = element_text(self.node)
+        return self._text
+
+    @property
+    def date(self):
+        return parse_date(self.date_text) if self.date_text else None
+
+    @property
+    def price(self):
+        return plain_price(self.price_text)
+
+    def record(self):
+        """רשומה שאפשר לשמור ב-JSON: title, ship, date_display, date_norm, date_start, price, url."""
+        parsed = self.date
+        return {
+            "title": self.title,
+            "ship": self.ship,
+            "date_display": self.date_text,
+            "date_norm": parsed.norm if parsed else None,
+            "date_start": parsed.isoformat() if parsed else None,
+            "price": self.price,
+            "url": self.url,
+        }
+
+
+class SiteAdapter:
+    """company + סלקטורים (מחרוזות CSS) שמקומפלים בבנייה. cards(page, base_url) – כרטיס לכל התאמה של card
+    (כרטיס שמכיל כרטיס אחר – רק הפנימי); שדה שאין לו סלקטור או שלא נמצא – None.
+    page הוא ParsedPage (או html): כשהטקסט מפורסר ב-selectolax – הסלקטורים רצים על עץ lexbor (C), אחרת
+    soupsieve על העץ של BeautifulSoup. התוצאה זהה."""
+
+    def __init__(self, company, card, title=None, ship=None, date=None, price=None, link="a[href]"):
+        self.company = company
+        self.selectors = {"card": card, "title": title, "ship": ship, "date": date, "price": price, "link": link}
+        self._soup = {field: soupsieve.compile(sel) for field, sel in self.selectors.items() if sel}
+        self._lexbor = {field: _SOUP_CONTAINS.sub(":lexbor-contains(", sel)
+                        for field, sel in self.selectors.items() if sel}
+        self.pages = 0
+        self.cards_found = 0
+
+    def _soup_cards(self, soup):
+        tags = self._soup["card"].select(soup)
+        # כרטיס עוטף (רשימה שגם היא מתאימה לסלקטור) – נשארים רק הכרטיסים הפנימיים
+        nested = {id(parent) for tag in tags for parent in tag.parents}
+        for tag in tags:
+            if id(tag) in nested:
+                continue
+            fields = {}
+            for field, sel in self._soup.items():
+                if field != "card":
+                    fields[field] = sel.select_one(tag)
+            yield tag, fields
+
+    def _lexbor_cards(self, tree):
+        nodes = tree.css(self._lexbor["card"])
+        nested = set()
+        for node in nodes:
+            parent = node.parent
+            while parent is not None:
+                nested.add(parent.mem_id)
+                parent = parent.parent
+        for node in nodes:
+            if node.mem_id in nested:
+                continue
+            fields = {}
+            for field, sel in self._lexbor.items():
+                if field != "card":
+                    fields[field] = node.css_first(sel)
+            yield node, fields
+
+    def cards(self, page, base_url=""):
+        page = parsed_page(page)
+        self.pages += 1
+        if page.backend["text"] == "selectolax":
+            found = self._lexbor_cards(page.lexbor)
+        else:
+            found = self._soup_cards(page.soup)
+        out = []
+        for node, fields in found:
+            texts = {field: (element_text(el) or None) if el is not None else None for field, el in fields.items()}
+            link = fields.get("link")
+            href = element_attr(link, "href") if link is not None else None
+            url = (urljoin(base_url, href) if base_url else href) if href else None
+            out.append(AdapterCard(node, texts.get("title"), texts.get("ship"), texts.get("date"),
+                                   texts.get("price"), url))
+        self.cards_found += len(out)
+        return out
+
+    def stats(self):
+        return {"company": self.company, "pages": self.pages, "cards": self.cards_found}
+
+
+_ADAPTERS = {}
+_TARGETS_LOADED = False
+
+
+def register_adapter(company, **selectors):
+    """רישום (או החלפה) של מתאם לחברה; מחזיר את המתאם."""
+    adapter = SiteAdapter(company, **selectors)
+    _ADAPTERS[company] = adapter
+    return adapter
+
+
+def load_target_selectors(path=TARGETS_PATH):
+    """מתאמים מובנים + "selectors" מ-targets.json (שדה שלא הוגדר – מהמתאם המובנה, אם יש)."""
+    global _TARGETS_LOADED
+    _TARGETS_LOADED = True
+    for company, selectors in DEFAULT_ADAPTERS.items():
+        register_adapter(company, **selectors)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            sources = json.load(f).get("sources", [])
+    except (OSError, ValueError):
+        return
+    for source in sources:
+        overrides = source.get("selectors")
+        if not overrides or not source.get("company"):
+            continue
+        selectors = dict(DEFAULT_ADAPTERS.get(source["company"], {}))
+        selectors.update({k: v for k, v in overrides.items() if k in SELECTOR_FIELDS})
+        if selectors.get("card"):
+            register_adapter(source["company"], **selectors)
+
+
+def adapter_for(company):
+    """המתאם של החברה (לפי company ב-targets.json), או None – ואז משתמשים במסלול ה-regex."""
+    if not _TARGETS_LOADED:
+        load_target_selectors()
+    return _ADAPTERS.get(company)
+
+
+def adapter_stats():
+    return {company: adapter.stats() for company, adapter in _ADAPTERS.items() if adapter.pages}
@@ -0,0 +1,156 @@
+# competitor_research/source_index.py
+# מיפוי בין מיקום ב-HTML הגולמי לבין הטקסט והקישורים שבו – במעבר אחד על הדף.
+# כרטיסי הקרוזים בתרבותו מזוהים לפי מיקום ("X ימים" ב-HTML) וחלון סביבו; במקום לפרסר כל חלון מחדש
+# (BeautifulSoup לכל מופע), הדף עובר טוקניזציה פעם אחת: כל קטע טקסט נשמר עם הטווח שלו ב-HTML וכל <a>
+# עם טווח התגית, וטקסט/קישורים של חלון נשלפים מהאינדקס בחיפוש בינארי. התוצאה כמו get_text / find_all
+# של html.parser על החלון (בלי script/style/הערות), פרט לחלון שמתחיל באמצע תגית – שם נחתך בגבול התגית.
+
+import re
+from bisect import bisect_left, bisect_right
+from html import unescape
+from html.parser import HTMLParser
+
+# תוכן שלא נכנס לטקסט (כמו get_text של BeautifulSoup)
+_SKIP_TEXT_TAGS = ("script", "style")
+
+
+class IndexedLink:
+    """קישור בדף: href, טווח התגית הפותחת (tag_start–tag_end), סוף התוכן (end) וקטעי הטקסט שבתוכו."""
+
+    __slots__ = ("href", "tag_start", "tag_end", "end", "first_segment", "last_segment")
+
+    def __init__(self, href, tag_start, tag_end, first_segment):
+        self.href = href
+        self.tag_start = tag_start
+        self.tag_end = tag_end
+        self.end = None
+        self.first_segment = first_segment
+        self.last_segment = None
+
+
+class _Indexer(HTMLParser):
+    def __init__(self, html):
+        super().__init__(convert_charrefs=True)
+        # getpos() מחזיר (שורה, עמודה) – ממירים למיקום מוחלט ב-HTML
+        self._line_starts = [0] + [m.end() for m in re.finditer("\n", html)]
+        self.starts = []
+        self.ends = []
+        self.texts = []
+        self.links = []
+        self._open_links = []
+        self._skip = 0
+        self._data_start = None
+        self._data = []
+
+    def _offset(self):
+        line, col = self.getpos()
+        return self._line_starts[line - 1] + col
+
+    def _flush(self, end):
+        # קטעי data צמודים (למשל "a < b") הם מחרוזת אחת, כמו ב-BeautifulSoup
+        if self._data_start is None:
+            return
+        self.starts.append(self._data_start)
+        self.ends.append(end)
+        self.texts.append("".join(self._data))
+        self._data_start = None
+        self._data = []
+
+    def handle_data(self, data):
+        if self._skip:
+            return
+        if self._data_start is None:
+            self._data_start = self._offset()
+        self._data.append(data)
+
+    def handle_starttag(self, tag, attrs):
+        offset = self._offset()
+        self._flush(offset)
+        if tag in _SKIP_TEXT_TAGS:
+            self._skip += 1
+        elif tag == "a":
+            # כמו BeautifulSoup: מאפיין כפול – האחרון קובע; href בלי ערך = ""
+            href = None
+            for name, value in attrs:
+                if name == "href":
+                    href = value or ""
+            link = None
+            if href is not None:
+                link = IndexedLink(href, offset, offset + len(self.get_starttag_text() or ""), len(self.texts))
+                self.links.append(link)
+            # גם <a> בלי href נכנס למחסנית – כדי ש-</a> יסגור את התגית הנכונה
+            self._open_links.append(link)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _SKIP_TEXT_TAGS:
+            self.handle_endtag(tag)
+
+    def handle_endtag(self, tag):
+        offset = self._offset()
+        self._flush(offset)
+        if tag in _SKIP_TEXT_TAGS:
+            self._skip = max(0, self._skip - 1)
+        elif tag == "a" and self._open_links:
+            self._close_link(self._open_links.pop(), offset)
+
+    def _close_link(self, link, offset):
+        if link is None:
+            return
+        link.end = offset
+        link.last_segment = len(self.texts)
+
+    def _other(self, *args):
+        self._flush(self._offset())
+
+    handle_comment = handle_decl = handle_pi = unknown_decl = _other
+
+    def finish(self, length):
+        self.close()
+        self._flush(length)
+        while self._open_links:
+            self._close_link(self._open_links.pop(), length)
+
+
+class SourceIndex:
+    """אינדקס של דף: text(start, end) – הטקסט של html[start:end] (קטעים מופרדים ברווח, בלי רווחים בקצוות);
+    links(start, end) – הקישורים שהתגית הפותחת שלהם בתוך החלון, לפי סדר ההופעה;
+    link_text(link, end) – הטקסט של הקישור (כמו a.get_text(strip=True)), חתוך בסוף החלון."""
+
+    def __init__(self, html):
+        self.html = html or ""
+        indexer = _Indexer(self.html)
+        indexer.feed(self.html)
+        indexer.finish(len(self.html))
+        self._starts = indexer.starts
+        self._ends = indexer.ends
+        self._texts = indexer.texts
+        self._links = indexer.links
+        self._link_starts = [link.tag_start for link in indexer.links]
+
+    def _segment_text(self, i, start, end):
+        s, e = self._starts[i], self._ends[i]
+        if s >= start and e <= end:
+            return self._texts[i]
+        return unescape(self.html[max(s, start):min(e, end)])
+
+    def _segments(self, first, last, start, end):
+        for i in range(first, last):
+            text = self._segment_text(i, start, end).strip()
+            if text:
+                yield text
+
+    def text(self, start, end):
+        first = bisect_right(self._ends, start)
+        last = bisect_left(self._starts, end)
+        return " ".join(self._segments(first, last, start, end))
+
+    def links(self, start, end):
+        first = bisect_left(self._link_starts, start)
+        last = bisect_right(self._link_starts, end)
+        return [link for link in self._links[first:last] if link.tag_end <= end]
+
+    def link_text(self, link, end=None):
+        end = len(self.html) if end is None else end
+        last = min(link.last_segment, bisect_left(self._starts, end))
+        return "".join(self._segments(link.first_segment, last, link.tag_end, end))
@@ -0,0 +1,289 @@
+# competitor_research/structured_data.py
+# נתונים מובנים בדף: הרבה אתרי תיירות מטמיעים את ההפלגות כ-JSON-LD (schema.org Product / Trip / Event),
+# כ-microdata (itemscope / itemprop), כתגיות OpenGraph, או כ-JSON של ה-framework (<script type="application/json">).
+# parsed_page מסיר את כל ה-<script> לפני שהמחלצים רואים את העץ – כאן הבלוקים נשלפים מה-HTML הגולמי (regex אחד
+# על תגיות script/meta, בלי עץ), ו-json.loads על בלוק קטן זול בהרבה מהיוריסטיקות של חלונות הטקסט.
+# כל בלוק ממופה לרשומה אחת לכל הפלגה: כותרת, אונייה, תאריך יציאה (CruiseDate) ותאריך חזרה, מחיר ומטבע, קישור.
+# Event / Product (וגם JSON של אתר ו-OpenGraph, שאין להם סוג) מתארים גם וידג'ט אירועים או מוצר מקודם – הם נחשבים
+# הפלגה רק כשיש בהם סימן להפלגה: אונייה, משך (כמה ימים), או offer עם תאריך יציאה.
+# דף בלי נתונים מובנים – structured_records מחזיר [] והקורא ממשיך להיוריסטיקות (parse_tarbutu_cruises וכו').
+
+import json
+import re
+from datetime import date
+from functools import lru_cache
+
+from hebrew_dates import CruiseDate, parse_date
+from parsed_page import element_attr, element_text, parsed_page
+from site_adapters import plain_price
+
+# סוגי schema.org שמתארים הפלגה (או מוצר/אירוע עם תאריך ומחיר)
+CRUISE_TYPES = ("Product", "Trip", "TouristTrip", "BoatTrip", "Event", "Cruise")
+# סוגים כלליים – רק עם סימן להפלגה (_cruise_evidence)
+GENERIC_TYPES = ("Product", "Event")
+# שמות השדות (schema.org וגם מפתחות נפוצים ב-JSON של אתרים) – לפי עדיפות
+TITLE_KEYS = ("name", "title", "headline")
+START_KEYS = ("startDate", "departureDate", "departureTime", "departure_date", "start_date")
+END_KEYS = ("endDate", "returnDate", "arrivalTime", "return_date", "end_date")
+PRICE_KEYS = ("price", "lowPrice", "minPrice", "priceFrom", "price_from")
+CURRENCY_KEYS = ("priceCurrency", "currency")
+URL_KEYS = ("url", "@id")
+SHIP_KEYS = ("ship", "vessel", "shipName", "ship_name")
+DURATION_KEYS = ("duration", "numberOfNights", "nights")
+# כמה דפים שונים נשמרים בזיכרון של structured_records (אותו דף נבדק גם בבדיקת השלמות וגם בפרסור)
+STRUCTURED_CACHE_SIZE = 16
+
+_JSON_SCRIPT_PATTERN = re.compile(
+    r"""<script\b[^>]*\btype\s*=\s*["']?\s*application/(ld\+json|json)\b[^>]*>(.*?)</script\s*>""", re.I | re.S)
+_META_PATTERN = re.compile(r"<meta\b[^>]*>", re.I)
+_ATTR_PATTERN = re.compile(r"""([\w:-]+)\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""")
+_ISO_DATE_PATTERN = re.compile(r"\s*(\d{4})-(\d{1,2})(?:-(\d{1,2}))?")
+# משך או אונייה בכותרת / בתיאור
+_EVIDENCE_PATTERN = re.compile(r"\d+\s*(?:ימים|לילות|nights|days)|אוני|\bship\b", re.I)
+
+_stats = {"pages": 0, "with_data": 0, "records": 0}
+
+
+class StructuredRecord:
+    """הפלגה מנתונים מובנים: kind – json-ld / embedded / microdata / opengraph; ship – שם האונייה (או None);
+    date – CruiseDate או None; date_text – הערך כפי שהופיע; price – ספרות בלבד (או None); currency – למשל USD / ILS."""
+
+    __slots__ = ("kind", "title", "ship", "date", "date_text", "price", "currency", "url")
+
+    def __init__(self, kind, title, date, date_text, price, currency, url, ship=None):
+        self.kind = kind
+        self.title = title
+        self.ship = ship
+        self.date = date
+        self.date_text = date_text
+        self.price = price
+        self.currency = currency
+        self.url = url
+
+
+def _parse_date_value(start, end=None):
+    """CruiseDate מערך תאריך: ISO (2026-06-14, 2026-06-14T10:00+03:00, 2026-06) או טקסט חופשי (parse_date)."""
+    if not start or not isinstance(start, str):
+        return None
+    m = _ISO_DATE_PATTERN.match(start)
+    if not m:
+        return parse_date(start)
+    try:
+        if m.group(3) is None:
+            return CruiseDate(date(int(m.group(1)), int(m.group(2)), 1), "month", None)
+        start_date = date(int(m.group(1)), int(m.group(2)), int(m.group(3)))
+    except ValueError:
+        return None
+    end_date = None
+    if isinstance(end, str):
+        e = _ISO_DATE_PATTERN.match(end)
+        if e and e.group(3) is not None:
+            try:
+                end_date = date(int(e.group(1)), int(e.group(2)), int(e.group(3)))
+            except ValueError:
+                end_date = None
+    return CruiseDate(start_date, "day", end_date if end_date and end_date >= start_date else None)
+
+
+def _price(value):
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return plain_price(str(int(value)))
+    return plain_price(value) if isinstance(value, str) else None
+
+
+def _first(node, keys):
+    for key in keys:
+        value = node.get(key)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _types(node):
+    t = node.get("@type")
+    names = t if isinstance(t, list) else [t]
+    return {n.rsplit("/", 1)[-1] for n in names if isinstance(n, str)}
+
+
+def _offers(node):
+    offers = node.get("offers")
+    if isinstance(offers, dict):
+        # AggregateOffer עם רשימת offers בפנים
+        inner = offers.get("offers")
+        return [offers] + ([o for o in inner if isinstance(o, dict)] if isinstance(inner, list) else [])
+    if isinstance(offers, list):
+        return [o for o in offers if isinstance(o, dict)]
+    return []
+
+
+def _name(value):
+    """ערך טקסט, או name של אובייקט מקונן ({"@type": "Vehicle", "name": ...})."""
+    if isinstance(value, dict):
+        value = value.get("name")
+    return value if isinstance(value, str) and value.strip() else None
+
+
+def _cruise_evidence(node):
+    """האם באובייקט יש סימן להפלגה: אונייה, משך (בשדה, בכותרת / בתיאור, או תאריך חזרה ביום אחר),
+    או offer עם תאריך יציאה."""
+    if _name(_first(node, SHIP_KEYS)) or _first(node, DURATION_KEYS) is not None:
+        return True
+    text = " ".join(v for v in (_name(_first(node, TITLE_KEYS)), _name(node.get("description"))) if v)
+    if _EVIDENCE_PATTERN.search(text):
+        return True
+    parsed = _parse_date_value(_first(node, START_KEYS), _first(node, END_KEYS))
+    if parsed is not None and parsed.end is not None and parsed.end > parsed.start:
+        return True
+    return any(_first(offer, START_KEYS) is not None for offer in _offers(node))
+
+
+def _record(kind, node, parent=None):
+    """StructuredRecord מאובייקט (dict) של הפלגה; מחיר/מטבע גם מה-offers שלו.
+    parent – הרשומה של האובייקט העוטף (הפלגה עם כמה מועדים): כותרת, קישור ומטבע עוברים ממנה כשחסרים."""
+    title = _first(node, TITLE_KEYS)
+    start = _first(node, START_KEYS)
+    parsed = _parse_date_value(start, _first(node, END_KEYS))
+    price = _price(_first(node, PRICE_KEYS))
+    currency = _first(node, CURRENCY_KEYS)
+    for offer in _offers(node):
+        if price is None:
+            price = _price(_first(offer, PRICE_KEYS))
+        if currency is None:
+            currency = _first(offer, CURRENCY_KEYS)
+    if parsed is None and price is None:
+        return None
+    url = _first(node, URL_KEYS)
+    record = StructuredRecord(kind, title if isinstance(title, str) else None, parsed,
+                              start if isinstance(start, str) else None, price,
+                              currency if isinstance(currency, str) else None, url if isinstance(url, str) else None,
+                              _name(_first(node, SHIP_KEYS)))
+    if parent is not None:
+        record.title = record.title or parent.title
+        record.ship = record.ship or parent.ship
+        record.url = record.url or parent.url
+        record.currency = record.currency or parent.currency
+    return record
+
+
+def _json_records(kind, data):
+    """מעבר על כל האובייקטים ב-JSON (כולל @graph, itemListElement, subEvent / subTrip). ב-JSON-LD – רק סוגי
+    CRUISE_TYPES (Event / Product – עם סימן להפלגה); ב-JSON של אתר – אובייקט עם כותרת, תאריך יציאה וסימן
+    להפלגה. מועד בתוך הפלגה שכבר התקבלה (parent) לא צריך סימן משלו."""
+    out = []
+    stack = [(data, None)]
+    while stack:
+        node, parent = stack.pop()
+        if isinstance(node, list):
+            stack.extend((item, parent) for item in reversed(node))
+            continue
+        if not isinstance(node, dict):
+            continue
+        if kind == "json-ld":
+            types = _types(node) & set(CRUISE_TYPES)
+            is_cruise = bool(types) and (parent is not None or not types <= set(GENERIC_TYPES)
+                                         or _cruise_evidence(node))
+        else:
+            is_cruise = (_first(node, TITLE_KEYS) is not None and _first(node, START_KEYS) is not None
+                         and (parent is not None or _cruise_evidence(node)))
+        record = _record(kind, node, parent) if is_cruise else None
+        if record is not None:
+            out.append(record)
+            parent = record
+        stack.extend((value, parent) for value in reversed(list(node.values())) if isinstance(value, (dict, list)))
+    return out
+
+
+def _attrs(tag_text):
+    return {m.group(1).lower(): m.group(2) if m.group(2) is not None else m.group(3) if m.group(3) is not None
+            else m.group(4) for m in _ATTR_PATTERN.finditer(tag_text)}
+
+
+def _script_records(html):
+    out = []
+    for m in _JSON_SCRIPT_PATTERN.finditer(html):
+        body = m.group(2).strip()
+        # עטיפות ישנות: <!-- ... --> / CDATA
+        if body.startswith("<!--"):
+            body = body[4:].rsplit("-->", 1)[0]
+        if body.startswith("//<![CDATA["):
+            body = body[len("//<![CDATA["):].rsplit("//]]>", 1)[0]
+        try:
+            data = json.loads(body)
+        except ValueError:
+            continue
+        out.extend(_json_records("json-ld" if m.group(1).lower() == "ld+json" else "embedded", data))
+    return out
+
+
+def _microdata_records(html):
+    page = parsed_page(html)
+    lexbor = page.backend["text"] == "selectolax"
+    scopes = page.lexbor.css("[itemscope][itemtype]") if lexbor else page.soup.select("[itemscope][itemtype]")
+    out = []
+    for scope in scopes:
+        types = {t.rsplit("/", 1)[-1] for t in (element_attr(scope, "itemtype") or "").split()} & set(CRUISE_TYPES)
+        if not types:
+            continue
+        # הערכים כמו ב-JSON-LD: content / datetime / href, אחרת הטקסט של האלמנט
+        node = {}
+        for key in (TITLE_KEYS + START_KEYS + END_KEYS + PRICE_KEYS + CURRENCY_KEYS + SHIP_KEYS + DURATION_KEYS
+                    + ("description", "url")):
+            css = f'[itemprop="{key}"]'
+            el = scope.css_first(css) if lexbor else scope.select_one(css)
+            if el is None:
+                continue
+            value = element_attr(el, "content") or element_attr(el, "datetime") or element_attr(el, "href")
+            node[key] = value or element_text(el)
+        if types <= set(GENERIC_TYPES) and not _cruise_evidence(node):
+            continue
+        record = _record("microdata", node)
+        if record is not None:
+            out.append(record)
+    return out
+
+
+def _opengraph_record(html):
+    meta = {}
+    for m in _META_PATTERN.finditer(html):
+        attrs = _attrs(m.group(0))
+        prop = attrs.get("property") or attrs.get("name")
+        if prop and "content" in attrs and prop not in meta:
+            meta[prop] = attrs["content"]
+    price = _price(meta.get("product:price:amount") or meta.get("og:price:amount"))
+    parsed = _parse_date_value(meta.get("event:start_time"))
+    if price is None and parsed is None:
+        return None
+    if not _cruise_evidence({"name": meta.get("og:title"), "description": meta.get("og:description")}):
+        return None
+    return StructuredRecord("opengraph", meta.get("og:title"), parsed, meta.get("event:start_time"), price,
+                            meta.get("product:price:currency") or meta.get("og:price:currency"), meta.get("og:url"))
+
+
+@lru_cache(maxsize=STRUCTURED_CACHE_SIZE)
+def _structured_records(html):
+    _stats["pages"] += 1
+    records = []
+    # בדיקות זולות (חיפוש מחרוזת ב-C) לפני כל regex / עץ
+    if "application/" in html:
+        records.extend(_script_records(html))
+    if "itemscope" in html:
+        records.extend(_microdata_records(html))
+    if not records and ("og:" in html or "product:price" in html):
+        og = _opengraph_record(html)
+        if og is not None:
+            records.append(og)
+    if records:
+        _stats["with_data"] += 1
+        _stats["records"] += len(records)
+    return tuple(records)
+
+
+def structured_records(html):
+    """כל הרשומות המובנות בדף (html או ParsedPage), לפי הסדר: JSON-LD ו-JSON מוטמע, microdata, ואם אין – OpenGraph."""
+    return list(_structured_records(parsed_page(html).html))
+
+
+def structured_data_stats():
+    return dict(_stats)
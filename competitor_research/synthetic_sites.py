@@ -0,0 +1,371 @@
+# competitor_research/synthetic_sites.py
+# אתרים מקומיים מדומים לבדיקות עומס: "תרבותו" (דף קרוזים עם תפריט יעדים, שייט נהרות, N דפי יעד עם M כרטיסי
+# הפלגה כל אחד, עמודי קרוז עם טבלת מחירים, REST API של וורדפרס) ו"מסעות" (דף הפלגות אחד).
+# אפשר להגדיר השהיה לכל בקשה, אחוז שגיאות 503 וחלק מדפי היעד שהכרטיסים בהם נבנים ב-JavaScript
+# (ב-HTTP רגיל הדף "לא שלם" – כמו באתר האמיתי, רק דפדפן רואה אותם). התוכן דטרמיניסטי לפי seed.
+#
+# הרצה (load_test.py מפעיל את זה לבד):
+#   python synthetic_sites.py --destinations 240 --cruises 8 --latency-ms 50 --error-rate 0.01
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlparse
+
+DEFAULT_DESTINATIONS = 24
+DEFAULT_CRUISES_PER_DESTINATION = 8
+# כל יעד רביעי הוא יעד שייט נהרות (דף-בן של דף שייט הנהרות)
+RIVER_EVERY = 4
+# כל הפלגה שלישית של תרבותו מופיעה גם במסעות (אותה אונייה ואותו חודש)
+MASSAOT_EVERY = 3
+TARBUTU_PREFIX = "/tarbutu/"
+MASSAOT_PREFIX = "/massaot/"
+CRUISES_SLUG = "cruises"
+RIVER_SLUG = "river-cruises"
+WP_PER_PAGE_MAX = 100
+MODIFIED_GMT = "2026-01-01T00:00:00"
+
+SHIPS = ["MSC World Europa", "MS Amalia Rodrigues", "Cyrano de Bergerac", "Viking Star", "Celebrity Edge",
+         "Norwegian Prima", "Costa Toscana", "MS Miguel Torga"]
+MONTHS = ["ינואר", "פברואר", "מרץ", "אפריל", "מאי", "יוני", "יולי", "אוגוסט", "ספטמבר", "אוקטובר", "נובמבר",
+          "דצמבר"]
+FILLER = "הפלגה מאורגנת עם מדריך דובר עברית, כשר, טיפים ומסים כלולים. "
+# סלקטורי מתאם (site_adapters) לכרטיסי "מסעות" המדומה – load_test רושם אותם; לאתר האמיתי אין מתאם מובנה
+MASSAOT_SELECTORS = {
+    "card": ".trip",
+    "title": "h3",
+    "date": 'p:-soup-contains("ימים"), p:-soup-contains("לילות")',
+    "price": 'p:-soup-contains("מחיר")',
+}
+
+
+def destination_name(i):
+    return f"יעד {i + 1}"
+
+
+def _slug(name):
+    return name.replace(" ", "-")
+
+
+class SyntheticCatalog:
+    """התוכן של שני האתרים: יעדים, הפלגות (עם תאריך, אונייה ומחיר) ו-HTML לכל דף."""
+
+    def __init__(self, destinations=DEFAULT_DESTINATIONS, cruises=DEFAULT_CRUISES_PER_DESTINATION, js_fraction=0.0,
+                 seed=1):
+        self.destinations = max(1, int(destinations))
+        self.cruises = max(1, int(cruises))
+        self.js_fraction = float(js_fraction)
+        rng = random.Random(seed)
+        self._js = {i for i in range(self.destinations) if rng.random() < self.js_fraction}
+        self._by_slug = {_slug(destination_name(i)): i for i in range(self.destinations)}
+
+    def is_river(self, i):
+        return i % RIVER_EVERY == RIVER_EVERY - 1
+
+    def is_js(self, i):
+        return i in self._js
+
+    def cruise(self, i, j):
+        """הפלגה j ביעד i – ערכים קבועים (לא אקראיים) כדי שהתאמות מסעות יהיו צפויות."""
+        year = 2026 + (i + j) % 2
+        return {
+            "ship": SHIPS[(i * 7 + j) % len(SHIPS)],
+            "nights": 5 + (i + j) % 10,
+            "day": 1 + (i * 5 + j * 3) % 28,
+            "month": 1 + (i * 3 + j) % 12,
+            "year": year,
+            "price": 1500 + ((i * 131 + j * 977) % 90) * 100,
+            "departures": 1 + (i + j) % 4,
+        }
+
+    def expected(self):
+        """כמה הפלגות (כרטיסים) יש בסך הכל, וכמה מהן מופיעות גם במסעות."""
+        total = self.destinations * self.cruises
+        return {"destinations": self.destinations, "cruises": total,
+                "massaot_cruises": len(self._massaot_cruises()), "js_destinations": len(self._js)}
+
+    def _date_line(self, c, j):
+        month = MONTHS[c["month"] - 1]
+        if j % 3 == 0:
+            return f"{c['nights']} ימים - {c['day']} ב{month} {c['year']}"
+        if j % 3 == 1:
+            return f"{c['nights']} לילות - {month} {c['year']}"
+        return f"{c['nights']} ימים - {c['day']}/{c['month']}/{c['year'] % 100}"
+
+    def _page(self, title, body, base):
+        nav = "".join(f'<li><a href="{base}{p}/">{t}</a></li>'
+                      for p, t in ((CRUISES_SLUG, "קרוזים"), (RIVER_SLUG, "שייט נהרות"), ("about", "אודות")))
+        return (f'<!DOCTYPE html><html lang="he" dir="rtl"><head><meta charset="utf-8"><title>{title}</title>'
+                f'</head><body><header><nav class="main-menu"><ul>{nav}</ul></nav></header>{body}'
+                f'<footer><a href="{base}about/">אודות</a> <a href="{base}author/admin/">admin</a></footer>'
+                f'</body></html>')
+
+    def _menu_page(self, base, river):
+        items = [i for i in range(self.destinations) if self.is_river(i) == river]
+        menu = "".join(f'<li><a href="{base}{quote(_slug(destination_name(i)))}/">{destination_name(i)}</a></li>'
+                       for i in items)
+        headings = "".join(
+            f'<h2><a href="{base}{quote(_slug(destination_name(i)))}/">{destination_name(i)}</a></h2>'
+            f'<p>{FILLER}</p>' for i in items)
+        title = "שייט נהרות" if river else "קרוזים"
+        body = f'<div class="sub-menu"><ul>{menu}</ul></div><main><h1>{title}</h1>{headings}</main>'
+        return self._page(title, body, base)
+
+    def _cards(self, i, base):
+        name = destination_name(i)
+        cards = []
+        for j in range(self.cruises):
+            c = self.cruise(i, j)
+            cards.append(
+                f'<div class="cruise-card"><h3><a href="{base}cruise-{i + 1}-{j + 1}/">'
+                f'קרוז {name} באוניה {c["ship"]} {c["year"]}</a></h3>'
+                f'<p class="date">{self._date_line(c, j)}</p>'
+                f'<p class="price">החל מ- {c["price"]:,} $</p><p>{FILLER * 2}</p></div>')
+        return "".join(cards)
+
+    def _listing_page(self, i, base):
+        name = destination_name(i)
+        cards = self._cards(i, base)
+        if self.is_js(i):
+            # הכרטיסים נבנים בדפדפן; ב-JSON עם \\u – בלי טקסט עברי גלוי ב-HTML הגולמי
+            script = f'document.getElementById("cards").innerHTML = {json.dumps(cards)};'
+            cards = f'<div id="cards"></div><script>{script}</script>'
+        # פתיח ותוכן נלווה ארוכים כמו באתר – התפריט והפוטר רחוקים מהכרטיסים
+        body = (f'<main class="content"><h1>{name}</h1><p class="intro">{FILLER * 12}</p>{cards}'
+                f'<section class="related"><p>{FILLER * 60}</p></section></main>')
+        return self._page(name, body, base)
+
+    def _inner_page(self, i, j, base):
+        c = self.cruise(i, j)
+        rows = []
+        for k in range(c["departures"]):
+            month = (c["month"] + k - 1) % 12 + 1
+            rows.append(f'<tr><td>{c["day"]}/{month}/{c["year"] % 100}</td><td>{c["price"] + k * 150:,} $</td>'
+                        f'<td>{c["price"] + 900 + k * 150:,} $</td></tr>')
+        table = ('<table class="prices"><tr><th>תאריך יציאה</th><th>חדר פנימי</th><th>חדר עם מרפסת</th></tr>'
+                 + "".join(rows) + '</table>')
+        title = f'קרוז {destination_name(i)} באוניה {c["ship"]} {c["year"]}'
+        body = (f'<main class="entry"><h1>{title}</h1><p>{FILLER * 3}</p>{table}'
+                f'<p>יציאה: {c["day"]} ב{MONTHS[c["month"] - 1]} {c["year"]}</p></main>')
+        return self._page(title, body, base)
+
+    def _massaot_cruises(self):
+        out = []
+        for i in range(self.destinations):
+            for j in range(self.cruises):
+                if (i * self.cruises + j) % MASSAOT_EVERY == 0:
+                    out.append(self.cruise(i, j))
+        return out
+
+    def _massaot_page(self, base):
+        trips = []
+        for n, c in enumerate(self._massaot_cruises()):
+            price = c["price"] + 200 - (n % 5) * 100
+            trips.append(f'<div class="trip"><h3>שייט באוניה {c["ship"]}</h3>'
+                         f'<p>{c["nights"]} ימים - {MONTHS[c["month"] - 1]} {c["year"]}</p>'
+                         f'<p>מחיר {price:,} $ לאדם</p><p>{FILLER}</p></div>')
+        return (f'<!DOCTYPE html><html lang="he" dir="rtl"><head><meta charset="utf-8"><title>מסעות</title></head>'
+                f'<body><header><nav><a href="{base}">בית</a></nav></header>{"".join(trips)}</body></html>')
+
+    def wp_pages(self, base):
+        """רשימת דפי וורדפרס (כמו wp-json/wp/v2/pages)."""
+        items = [
+            {"id": 1, "link": f"{base}{CRUISES_SLUG}/", "title": {"rendered": "קרוזים"}, "parent": 0},
+            {"id": 2, "link": f"{base}{RIVER_SLUG}/", "title": {"rendered": "שייט נהרות"}, "parent": 0},
+            {"id": 3, "link": f"{base}about/", "title": {"rendered": "אודות"}, "parent": 0},
+        ]
+        for i in range(self.destinations):
+            items.append({"id": 100 + i, "link": f"{base}{quote(_slug(destination_name(i))).lower()}/",
+                          "title": {"rendered": destination_name(i)}, "parent": 2 if self.is_river(i) else 1})
+        for item in items:
+            item["modified_gmt"] = MODIFIED_GMT
+        return items
+
+    def tarbutu(self, path, base):
+        """(status, content_type, body, kind) לנתיב בתוך אתר תרבותו (בלי הקידומת)."""
+        slug = unquote(path).strip("/")
+        if slug == CRUISES_SLUG:
+            return 200, "text/html", self._menu_page(base, river=False), "main"
+        if slug == RIVER_SLUG:
+            return 200, "text/html", self._menu_page(base, river=True), "main"
+        if slug == "about":
+            return 200, "text/html", self._page("אודות", "<main><p>אודות</p></main>", base), "other"
+        if slug.startswith("cruise-"):
+            try:
+                i, j = (int(x) - 1 for x in slug[len("cruise-"):].split("-"))
+            except ValueError:
+                i = j = -1
+            if 0 <= i < self.destinations and 0 <= j < self.cruises:
+                return 200, "text/html", self._inner_page(i, j, base), "inner"
+        i = self._by_slug.get(slug)
+        if i is not None:
+            return 200, "text/html", self._listing_page(i, base), "listing"
+        return 404, "text/html", self._page("לא נמצא", "<main>404</main>", base), "not_found"
+
+    def massaot(self, path, base):
+        if path.strip("/") == "":
+            return 200, "text/html", self._massaot_page(base), "massaot"
+        return 404, "text/html", "<html><body>404</body></html>", "not_found"
+
+
+class SyntheticSites:
+    """שני שרתי HTTP מקומיים (פורט נפרד לכל אתר – host נפרד להגבלות לכל אתר).
+    latency_ms (+ עד jitter_ms) – השהיה לכל בקשה; error_rate – חלק הבקשות שמקבלות 503;
+    wp_api=False – אין REST API (הסורק חוזר לתפריטים)."""
+
+    def __init__(self, catalog=None, latency_ms=0, jitter_ms=0, error_rate=0.0, wp_api=True, seed=1,
+                 host="127.0.0.1"):
+        self.catalog = catalog or SyntheticCatalog(seed=seed)
+        self.latency_ms = float(latency_ms)
+        self.jitter_ms = float(jitter_ms)
+        self.error_rate = float(error_rate)
+        self.wp_api = wp_api
+        self.host = host
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._servers = {}
+        self._threads = []
+        self._stats = {"requests": 0, "errors_injected": 0, "bytes": 0, "by_kind": {}}
+
+    def _base(self, site):
+        port = self._servers[site].server_address[1]
+        prefix = TARBUTU_PREFIX if site == "tarbutu" else MASSAOT_PREFIX
+        return f"http://{self.host}:{port}{prefix}"
+
+    def urls(self):
+        """הכתובות שהסורק צריך (בסיס, דף קרוזים, שייט נהרות, מסעות) ושמות היעדים."""
+        base = self._base("tarbutu")
+        return {
+            "tarbutu_base": base,
+            "tarbutu_cruises": f"{base}{CRUISES_SLUG}/",
+            "tarbutu_river": f"{base}{RIVER_SLUG}/",
+            "massaot": self._base("massaot"),
+            "destination_names": [destination_name(i) for i in range(self.catalog.destinations)],
+            "expected": self.catalog.expected(),
+        }
+
+    def _respond(self, site, raw_path):
+        """(status, headers, body bytes, kind) לבקשה."""
+        parsed = urlparse(raw_path)
+        if parsed.path == "/__stats":
+            return 200, {"Content-Type": "application/json"}, json.dumps(self.stats()).encode("utf-8"), None
+        with self._lock:
+            fail = self._rng.random() < self.error_rate
+            wait = self.latency_ms + self._rng.uniform(0, self.jitter_ms)
+        if wait > 0:
+            time.sleep(wait / 1000.0)
+        if fail:
+            return 503, {"Content-Type": "text/html"}, b"<html><body>Service Unavailable</body></html>", "error"
+        prefix = TARBUTU_PREFIX if site == "tarbutu" else MASSAOT_PREFIX
+        if not parsed.path.startswith(prefix):
+            return 404, {"Content-Type": "text/html"}, b"<html><body>404</body></html>", "not_found"
+        path = parsed.path[len(prefix):]
+        base = self._base(site)
+        if site == "tarbutu" and path.startswith("wp-json/wp/v2/pages"):
+            return self._wp_api(parse_qs(parsed.query), base)
+        if site == "tarbutu":
+            status, ctype, body, kind = self.catalog.tarbutu(path, base)
+        else:
+            status, ctype, body, kind = self.catalog.massaot(path, base)
+        return status, {"Content-Type": f"{ctype}; charset=utf-8"}, body.encode("utf-8"), kind
+
+    def _wp_api(self, query, base):
+        if not self.wp_api:
+            return 404, {"Content-Type": "application/json"}, b'{"code":"rest_no_route"}', "api"
+        per_page = min(WP_PER_PAGE_MAX, int((query.get("per_page") or ["10"])[0]))
+        page = int((query.get("page") or ["1"])[0])
+        items = self.catalog.wp_pages(base)
+        total_pages = max(1, -(-len(items) // per_page))
+        if page > total_pages:
+            body = b'{"code":"rest_post_invalid_page_number"}'
+            return 400, {"Content-Type": "application/json"}, body, "api"
+        chunk = items[(page - 1) * per_page:page * per_page]
+        headers = {"Content-Type": "application/json; charset=utf-8", "X-WP-Total": str(len(items)),
+                   "X-WP-TotalPages": str(total_pages)}
+        return 200, headers, json.dumps(chunk, ensure_ascii=False).encode("utf-8"), "api"
+
+    def _count(self, kind, size, injected):
+        with self._lock:
+            self._stats["requests"] += 1
+            self._stats["bytes"] += size
+            if injected:
+                self._stats["errors_injected"] += 1
+            by_kind = self._stats["by_kind"]
+            by_kind[kind] = by_kind.get(kind, 0) + 1
+
+    def _handler(self, site):
+        sites = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                status, headers, body, kind = sites._respond(site, self.path)
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                if kind is not None:
+                    sites._count(kind, len(body), kind == "error")
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self, tarbutu_port=0, massaot_port=0):
+        for site, port in (("tarbutu", tarbutu_port), ("massaot", massaot_port)):
+            server = ThreadingHTTPServer((self.host, port), self._handler(site))
+            server.daemon_threads = True
+            self._servers[site] = server
+            thread = threading.Thread(target=server.serve_forever, name=f"synthetic-{site}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        for server in self._servers.values():
+            server.shutdown()
+            server.server_close()
+        self._servers = {}
+        self._threads = []
+
+    def stats(self):
+        with self._lock:
+            out = dict(self._stats)
+            out["by_kind"] = dict(out["by_kind"])
+        return out
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="אתרי תרבותו ומסעות מדומים לבדיקות עומס")
+    parser.add_argument("--destinations", type=int, default=DEFAULT_DESTINATIONS, help="מספר דפי יעד")
+    parser.add_argument("--cruises", type=int, default=DEFAULT_CRUISES_PER_DESTINATION, help="הפלגות לכל יעד")
+    parser.add_argument("--latency-ms", type=float, default=0, help="השהיה לכל בקשה (מילישניות)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="השהיה אקראית נוספת עד (מילישניות)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="חלק הבקשות שמחזירות 503 (0–1)")
+    parser.add_argument("--js-fraction", type=float, default=0.0, help="חלק דפי היעד שהכרטיסים בהם נבנים ב-JS")
+    parser.add_argument("--no-wp-api", action="store_true", help="בלי REST API של וורדפרס")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--tarbutu-port", type=int, default=0)
+    parser.add_argument("--massaot-port", type=int, default=0)
+    args = parser.parse_args()
+    sites = SyntheticSites(
+        SyntheticCatalog(args.destinations, args.cruises, js_fraction=args.js_fraction, seed=args.seed),
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        wp_api=not args.no_wp_api, seed=args.seed,
+    ).start(args.tarbutu_port, args.massaot_port)
+    # שורה ראשונה: הכתובות (JSON) – load_test.py קורא אותה
+    print(json.dumps(sites.urls(), ensure_ascii=False), flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sites.stop()
@@ -0,0 +1,86 @@
+# competitor_research/text_rules.py
+# מנוע חילוץ מבוסס תבניות: טבלת כללים הצהרתית {שדה: [תבניות לפי עדיפות]} שמקומפלת פעם אחת בטעינה.
+# לכל שדה – ההתאמה של התבנית הראשונה ברשימה שנמצאת בטקסט (כמו re.search לפי הסדר), ושדה מפסיק לחפש
+# בתבנית הראשונה שמתאימה. שדה חדש = עוד שורה בטבלה.
+# כל תבנית נשמרת כביטוי נפרד ולא כחלופה אחת גדולה: ב-re של פייתון (backtracking) חיפוש בביטוי מקומפל
+# עם קידומת קבועה ("טיול", "מחיר", ספרה) רץ בסריקה מהירה ב-C, ואילו חלופה משולבת מנסה כל חלופה בכל מיקום –
+# נמדד כפי 2 איטי יותר על דפי הקרוזים.
+# תבנית שמתחילה במילה קבועה ("טיול\s*מובטח") לא נסרקת בעצמה: כל המילים האלה נמצאות במעבר אחד של
+# KeywordScanner, והתבנית נבדקת רק במיקומים שלהן (re.match). תבנית בלי קידומת קבועה – re.search רגיל.
+
+import re
+
+from keyword_scanner import KeywordScanner
+
+_REGEX_META = set("\\.^$*+?{}[]|()")
+
+
+def literal_prefix(pattern):
+    """המילה הקבועה שכל התאמה של התבנית מתחילה בה ("" אם אין – למשל חלופה ברמה העליונה או תו מיוחד בהתחלה)."""
+    depth = 0
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == "\\":
+            i += 2
+            continue
+        if ch == "[":
+            # דילוג על מחלקת תווים (כולל ] ראשון)
+            i = pattern.find("]", i + 2)
+            if i < 0:
+                return ""
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return ""
+        i += 1
+    prefix = []
+    for ch in pattern:
+        if ch in _REGEX_META:
+            # תו לפני ? / * / {} הוא אופציונלי
+            if ch in "?*{" and prefix:
+                prefix.pop()
+            break
+        prefix.append(ch)
+    return "".join(prefix)
+
+
+class TextRules:
+    """rules – {שדה: [תבניות]} (הסדר ברשימה = עדיפות).
+    matches(text, field) – ההתאמה הראשונה של כל תבנית בשדה, לפי הסדר (גנרטור – מחפש רק כשצריך);
+    scan(text) -> {שדה: [Match או None לכל תבנית]}; first(text) -> {שדה: ההתאמה הראשונה, או None}."""
+
+    def __init__(self, rules, flags=re.IGNORECASE):
+        ignore_case = bool(flags & re.IGNORECASE)
+        self.rules = {}
+        for field, patterns in rules.items():
+            compiled = []
+            for p in patterns:
+                prefix = literal_prefix(p)
+                compiled.append((re.compile(p, flags), prefix.lower() if ignore_case else prefix))
+            self.rules[field] = compiled
+        self._scanner = KeywordScanner([prefix for rules in self.rules.values() for _, prefix in rules],
+                                       ignore_case=ignore_case)
+
+    def _matches(self, text, field, positions):
+        for rx, prefix in self.rules[field]:
+            if not prefix:
+                yield rx.search(text)
+                continue
+            yield next((m for m in (rx.match(text, offset) for offset in positions.get(prefix, ())) if m), None)
+
+    def matches(self, text, field):
+        text = text or ""
+        return self._matches(text, field, self._scanner.positions(text))
+
+    def scan(self, text):
+        text = text or ""
+        positions = self._scanner.positions(text)
+        return {field: list(self._matches(text, field, positions)) for field in self.rules}
+
+    def first(self, text):
+        text = text or ""
+        positions = self._scanner.positions(text)
+        return {field: next((m for m in self._matches(text, field, positions) if m), None) for field in self.rules}
@@ -0,0 +1,181 @@
+# competitor_research/wp_discovery.py
+# גילוי דפים באתר וורדפרס בלי לרנדר תפריטים: קודם REST API (wp-json/wp/v2 – 100 דפים לבקשה, עם paging),
+# ואם הוא חסום – sitemap (wp-sitemap.xml / sitemap_index.xml / sitemap.xml, כולל תת-מפות).
+# לכל דף מתקבל גם זמן עדכון (modified / lastmod) – כך יודעים בלי לטעון אותו אם השתנה מאז הריצה הקודמת.
+
+import xml.etree.ElementTree as ET
+from datetime import datetime, timezone
+from html import unescape
+from urllib.parse import urljoin
+
+from http_fetch import get_session
+
+WP_API_PATH = "wp-json/wp/v2/"
+# סוגי תוכן שנקראים מה-REST API (דפי יעד הם pages)
+DEFAULT_WP_TYPES = ("pages",)
+WP_PER_PAGE = 100
+# תקרות: עמודי API לכל סוג, ומפות אתר (כולל תת-מפות)
+MAX_API_PAGES = 30
+MAX_SITEMAPS = 40
+SITEMAP_PATHS = ("wp-sitemap.xml", "sitemap_index.xml", "sitemap.xml")
+# תת-מפות שאין בהן דפי תוכן
+SKIP_SITEMAP_MARKERS = ("users", "author")
+DEFAULT_TIMEOUT = 20
+
+
+def _parse_time(value):
+    """זמן ISO (modified_gmt / lastmod) -> epoch שניות, או None."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        dt = datetime.fromisoformat(value)
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+def _local(tag):
+    """שם תגית XML בלי namespace."""
+    return tag.rsplit("}", 1)[-1]
+
+
+class WpDiscovery:
+    """discover() מחזיר רשימת דפים: {"url", "modified" (epoch או None), "title", "id", "parent", "type"}.
+    REST קודם (יש בו כותרת והורה), sitemap כגיבוי. limiter (HostRateLimiter) – קצב בקשות."""
+
+    def __init__(self, base_url, types=DEFAULT_WP_TYPES, timeout=DEFAULT_TIMEOUT, limiter=None):
+        self.base_url = base_url.rstrip("/") + "/"
+        self.types = tuple(types)
+        self.timeout = timeout
+        self.limiter = limiter
+        self._stats = {"source": None, "requests": 0, "pages": 0, "errors": 0}
+
+    def _get(self, url, params=None):
+        session = get_session()
+        if session is None:
+            return None
+        if self.limiter is not None:
+            self.limiter.acquire(url)
+        self._stats["requests"] += 1
+        try:
+            r = session.get(url, params=params, timeout=self.timeout)
+        except Exception:
+            self._stats["errors"] += 1
+            return None
+        if r.status_code >= 400:
+            # 400 אחרי העמוד האחרון (rest_post_invalid_page_number) – סוף רגיל, לא שגיאה
+            if r.status_code != 400:
+                self._stats["errors"] += 1
+            return None
+        return r
+
+    def discover(self):
+        pages = self._from_rest()
+        if pages:
+            self._stats["source"] = "rest"
+        else:
+            pages = self._from_sitemap()
+            if pages:
+                self._stats["source"] = "sitemap"
+        self._stats["pages"] = len(pages)
+        return pages
+
+    def _from_rest(self):
+        pages = []
+        for wp_type in self.types:
+            endpoint = urljoin(self.base_url, WP_API_PATH + wp_type)
+            total_pages = 1
+            page_no = 1
+            while page_no <= min(total_pages, MAX_API_PAGES):
+                r = self._get(endpoint, params={
+                    "per_page": WP_PER_PAGE,
+                    "page": page_no,
+                    "_fields": "id,link,modified_gmt,title,parent",
+                })
+                if r is None:
+                    break
+                try:
+                    items = r.json()
+                except ValueError:
+                    break
+                if not isinstance(items, list) or not items:
+                    break
+                try:
+                    total_pages = int(r.headers.get("X-WP-TotalPages") or 1)
+                except ValueError:
+                    total_pages = 1
+                for item in items:
+                    link = item.get("link")
+                    if not link:
+                        continue
+                    title = item.get("title")
+                    if isinstance(title, dict):
+                        title = title.get("rendered")
+                    pages.append({
+                        "url": link,
+                        # modified_gmt בלי אזור זמן – UTC
+                        "modified": _parse_time(item.get("modified_gmt")),
+                        "title": unescape(title or "").strip(),
+                        "id": item.get("id"),
+                        "parent": item.get("parent") or None,
+                        "type": wp_type,
+                    })
+                page_no += 1
+        return pages
+
+    def _from_sitemap(self):
+        pages = []
+        seen_maps = set()
+        queue = [urljoin(self.base_url, p) for p in SITEMAP_PATHS]
+        found_root = False
+        while queue and len(seen_maps) < MAX_SITEMAPS:
+            sitemap_url = queue.pop(0)
+            if sitemap_url in seen_maps:
+                continue
+            seen_maps.add(sitemap_url)
+            r = self._get(sitemap_url)
+            if r is None:
+                continue
+            try:
+                root = ET.fromstring(r.content)
+            except ET.ParseError:
+                continue
+            kind = _local(root.tag)
+            if kind not in ("sitemapindex", "urlset"):
+                continue
+            if not found_root:
+                # מפת השורש הראשונה שנמצאה מספיקה – שאר נתיבי ברירת המחדל לא נבדקים
+                found_root = True
+                queue = []
+            for node in root:
+                loc = modified = None
+                for child in node:
+                    name = _local(child.tag)
+                    if name == "loc":
+                        loc = (child.text or "").strip()
+                    elif name == "lastmod":
+                        modified = _parse_time(child.text)
+                if not loc:
+                    continue
+                if kind == "sitemapindex":
+                    if not any(m in loc.lower() for m in SKIP_SITEMAP_MARKERS):
+                        queue.append(loc)
+                else:
+                    pages.append({"url": loc, "modified": modified, "title": "", "id": None, "parent": None,
+                                  "type": "sitemap"})
+        return pages
+
+    def stats(self):
+        return dict(self._stats)
+
+
+def modified_hints(pages, key=None):
+    """מפתח כתובת -> זמן עדכון (epoch), לדפים שיש להם זמן עדכון."""
+    key = key or (lambda u: u)
+    return {key(p["url"]): p["modified"] for p in pages if p.get("modified")}
+